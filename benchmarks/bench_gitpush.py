@@ -0,0 +1,289 @@
+"""
+End-to-end benchmarks for gitpush against local bare remotes.
+
+Every measurement builds a fresh synthetic repository (untimed), then times one
+`python -m gitpush.cli ...` invocation on it. Results are written as JSON, and
+two result files can be compared to gate regressions.
+
+    python benchmarks/bench_gitpush.py run --profiles small,long-history --repeat 5 -o after.json
+    python benchmarks/bench_gitpush.py compare before.json after.json --threshold 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# files in the tree, commits of history, extra refs
+PROFILES = {
+    "small": {"files": 50, "commits": 20, "refs": 10},
+    "large-tree": {"files": 20000, "commits": 20, "refs": 10},
+    "long-history": {"files": 50, "commits": 20000, "refs": 10},
+    "many-refs": {"files": 50, "commits": 20, "refs": 50000},
+}
+
+CONFLICT_FILES = 200
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1", "PYTHONIOENCODING": "utf-8",
+}
+
+STUB_GH = r'''#!{python}
+"""Minimal stand-in for the GitHub CLI: 'repo create' makes a local bare remote."""
+import os, subprocess, sys
+args = sys.argv[1:]
+if args[:1] == ["--version"]:
+    print("gh version 0.0.0-bench")
+elif args[:2] == ["auth", "status"]:
+    pass
+elif args[:2] == ["repo", "create"]:
+    remote = os.path.join(os.environ["BENCH_GH_REMOTES"], args[2] + ".git")
+    subprocess.run(["git", "init", "-q", "--bare", remote], check=True)
+    subprocess.run(["git", "remote", "add", "origin", remote], check=True)
+    if "--push" in args:
+        subprocess.run(["git", "push", "-q", "-u", "origin", "HEAD"], check=True)
+    print("https://github.example/bench/" + args[2], file=sys.stderr)
+else:
+    sys.exit("unsupported stub gh call: " + " ".join(args))
+'''
+
+
+def git(*args, cwd, stdin=None):
+    return subprocess.run(["git", *args], cwd=cwd, input=stdin, check=True, capture_output=True,
+                          env=dict(os.environ, **GIT_ENV)).stdout
+
+
+def fast_import_stream(files: int, commits: int) -> bytes:
+    """A fast-import stream: one commit adding `files` files, then `commits - 1` one-file edits"""
+    out = []
+    stamp = 1700000000
+    for n in range(commits):
+        out.append(b"commit refs/heads/main\n")
+        out.append(f"committer bench <bench@example.com> {stamp + n} +0000\n".encode())
+        message = f"commit {n}\n".encode()
+        out.append(b"data %d\n%s" % (len(message), message))
+        if n:
+            targets = [f"src/file{n % files:05d}.txt"]
+        else:
+            targets = [f"src/file{i:05d}.txt" for i in range(files)]
+        for path in targets:
+            content = f"{path} revision {n}\n".encode() * 4
+            out.append(b"M 100644 inline %s\ndata %d\n%s\n" % (path.encode(), len(content), content))
+    return b"".join(out)
+
+
+def build_template(root: str, profile: dict) -> str:
+    """Create a bare remote plus a tracking clone; returns the template directory"""
+    template = os.path.join(root, "template")
+    remote = os.path.join(template, "remote.git")
+    git("init", "-q", "--bare", "-b", "main", remote, cwd=root)
+    git("fast-import", "--quiet", cwd=remote, stdin=fast_import_stream(profile["files"], profile["commits"]))
+    head = git("rev-parse", "main", cwd=remote).decode().strip()
+    updates = "".join(f"create refs/heads/bench/ref{i:06d} {head}\n" for i in range(profile["refs"]))
+    git("update-ref", "--stdin", cwd=remote, stdin=updates.encode())
+    git("pack-refs", "--all", cwd=remote)
+    git("clone", "-q", remote, "work", cwd=template)
+    return template
+
+
+def prepare(template: str, run_root: str, scenario: str) -> str:
+    """Copy the template and put the working clone into the state the scenario starts from"""
+    shutil.copytree(template, run_root, symlinks=True)
+    work = os.path.join(run_root, "work")
+    git("remote", "set-url", "origin", os.path.join(run_root, "remote.git"), cwd=work)
+
+    def remote_commit(paths, text):
+        # Publish a commit on the remote, then move the local branch back behind it
+        for path in paths:
+            with open(os.path.join(work, path), "a", encoding="utf-8") as f:
+                f.write(text)
+        git("commit", "-qam", "remote change", cwd=work)
+        git("push", "-q", "origin", "HEAD:main", cwd=work)
+        git("reset", "-q", "--hard", "HEAD~1", cwd=work)
+        git("update-ref", "refs/remotes/origin/main", "HEAD", cwd=work)
+
+    if scenario == "clean-push":
+        with open(os.path.join(work, "new.txt"), "w", encoding="utf-8") as f:
+            f.write("change\n")
+    elif scenario == "behind-pull":
+        remote_commit(["src/file00000.txt"], "upstream\n")
+    elif scenario == "diverged-rebase":
+        remote_commit(["src/file00000.txt"], "upstream\n")
+        with open(os.path.join(work, "local.txt"), "w", encoding="utf-8") as f:
+            f.write("local\n")
+        git("add", "local.txt", cwd=work)
+        git("commit", "-qm", "local change", cwd=work)
+    elif scenario == "conflicts":
+        paths = [f"src/file{i:05d}.txt" for i in range(min(CONFLICT_FILES, len(os.listdir(os.path.join(work, "src")))))]
+        remote_commit(paths, "upstream side\n")
+        for path in paths:
+            with open(os.path.join(work, path), "a", encoding="utf-8") as f:
+                f.write("local side\n")
+        git("commit", "-qam", "conflicting change", cwd=work)
+    elif scenario == "tags":
+        head = git("rev-parse", "HEAD", cwd=work).decode().strip()
+        git("update-ref", "--stdin", cwd=work,
+            stdin="".join(f"create refs/tags/v0.{i} {head}\n" for i in range(100)).encode())
+    elif scenario == "new-repo":
+        shutil.rmtree(os.path.join(work, ".git"))
+    return work
+
+
+SCENARIOS = {
+    # name: (gitpush arguments, expected exit code)
+    "clean-push": (["bench: clean push"], 0),
+    "behind-pull": (["bench: behind"], 0),
+    "diverged-rebase": (["bench: diverged"], 0),
+    "conflicts": (["bench: conflicts"], 1),
+    "tags": (["--tags"], 0),
+    "new-repo": (["bench: bootstrap", "--new-repo", "bench-repo"], 0),
+}
+
+
+def time_run(work: str, args, bin_dir: str, remotes_dir: str, profile_path: str):
+    env = dict(os.environ, **GIT_ENV)
+    env["PYTHONPATH"] = PACKAGE_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["PATH"] = bin_dir + os.pathsep + env["PATH"]
+    env["BENCH_GH_REMOTES"] = remotes_dir
+    env["GITPUSH_CACHE_DIR"] = os.path.join(os.path.dirname(bin_dir), "cache")
+    cmd = [sys.executable, "-m", "gitpush.cli", *args, "--profile", profile_path]
+    start = time.perf_counter()
+    process = subprocess.run(cmd, cwd=work, env=env, capture_output=True, text=True, errors="replace")
+    elapsed = time.perf_counter() - start
+    phases = {}
+    try:
+        with open(profile_path, encoding="utf-8") as f:
+            for event in json.load(f)["traceEvents"]:
+                phases[event["name"]] = phases.get(event["name"], 0) + event["dur"] / 1e6
+    except (OSError, ValueError):
+        pass
+    return elapsed, process, phases
+
+
+def run_benchmarks(args) -> int:
+    profiles = args.profiles.split(",")
+    scenarios = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    for name in profiles:
+        if name not in PROFILES:
+            sys.exit(f"unknown profile {name!r} (choose from {', '.join(PROFILES)})")
+    for name in scenarios:
+        if name not in SCENARIOS:
+            sys.exit(f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+
+    results = {}
+    root = tempfile.mkdtemp(prefix="gitpush-bench-")
+    try:
+        bin_dir = os.path.join(root, "bin")
+        os.makedirs(bin_dir)
+        gh = os.path.join(bin_dir, "gh")
+        with open(gh, "w", encoding="utf-8") as f:
+            f.write(STUB_GH.replace("{python}", sys.executable))
+        os.chmod(gh, 0o755)
+
+        for profile_name in profiles:
+            profile_root = os.path.join(root, profile_name)
+            os.makedirs(profile_root)
+            print(f"building {profile_name} fixture {PROFILES[profile_name]}...", file=sys.stderr)
+            template = build_template(profile_root, PROFILES[profile_name])
+
+            for scenario in scenarios:
+                cli_args, expected_exit = SCENARIOS[scenario]
+                runs, phase_runs = [], []
+                for i in range(args.repeat):
+                    run_root = os.path.join(profile_root, f"{scenario}-{i}")
+                    work = prepare(template, run_root, scenario)
+                    remotes_dir = os.path.join(run_root, "gh-remotes")
+                    os.makedirs(remotes_dir)
+                    elapsed, process, phases = time_run(work, cli_args, bin_dir, remotes_dir,
+                                                        os.path.join(run_root, "trace.json"))
+                    if process.returncode != expected_exit:
+                        print(process.stdout + process.stderr, file=sys.stderr)
+                        sys.exit(f"{profile_name}/{scenario}: exit {process.returncode}, expected {expected_exit}")
+                    runs.append(elapsed)
+                    phase_runs.append(phases)
+                    shutil.rmtree(run_root, ignore_errors=True)
+
+                key = f"{profile_name}/{scenario}"
+                results[key] = {
+                    "runs": runs,
+                    "median": statistics.median(runs),
+                    "min": min(runs),
+                    "phases": {name: statistics.median(p.get(name, 0.0) for p in phase_runs)
+                               for name in sorted({n for p in phase_runs for n in p})},
+                }
+                print(f"{key:<32} median {results[key]['median'] * 1000:8.1f} ms   "
+                      f"min {results[key]['min'] * 1000:8.1f} ms", file=sys.stderr)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<32} {'baseline ms':>12} {'candidate ms':>13} {'change':>8}")
+    for key in sorted(set(baseline) & set(candidate)):
+        old, new = baseline[key]["median"], candidate[key]["median"]
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<32} {old * 1000:>12.1f} {new * 1000:>13.1f} {change:>+7.1f}%{flag}")
+    for key in sorted(set(baseline) ^ set(candidate)):
+        print(f"{key:<32} only in {'baseline' if key in baseline else 'candidate'}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark gitpush end to end against local bare remotes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the benchmarks and write JSON results.")
+    run_parser.add_argument("--profiles", default="small", help=f"Comma-separated fixture profiles ({', '.join(PROFILES)}).")
+    run_parser.add_argument("--scenarios", help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)}).")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario (default: 3).")
+    run_parser.add_argument("-o", "--output", help="Write results to this file instead of stdout.")
+
+    compare_parser = sub.add_parser("compare", help="Compare two result files; exit 1 on regressions.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent (default: 10).")
+
+    args = parser.parse_args()
+    return run_benchmarks(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Import-time budget for the common push path.
+
+Runs `python -X importtime -c "import gitpush.cli"` a few times and fails if
+importing the CLI takes longer than the budget, or if it drags in modules that
+only the installer, repository creation or workspace mode need.
+
+    python benchmarks/import_time.py --budget-ms 60
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay off the `gitpush "message"` path
+FORBIDDEN = (
+    "json", "tempfile", "platform", "urllib", "urllib.request", "http", "http.client", "ssl", "email",
+    "concurrent.futures",
+    "gitpush.installer", "gitpush.lfs", "gitpush.newrepo", "gitpush.workspace",
+)
+
+
+def measure(module: str):
+    """Return (cumulative microseconds for `module`, set of imported module names)"""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+    cumulative, imported = None, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # header line
+        imported.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(cumulative_us)
+    return cumulative, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import-time budget of gitpush.cli.")
+    parser.add_argument("--budget-ms", type=float, default=60.0, help="Maximum import time in milliseconds (default: 60).")
+    parser.add_argument("--runs", type=int, default=5, help="Measurements to take; the fastest one counts (default: 5).")
+    args = parser.parse_args()
+
+    timings, imported = [], set()
+    for _ in range(args.runs):
+        cumulative, modules = measure("gitpush.cli")
+        timings.append(cumulative)
+        imported |= modules
+
+    best_ms = min(timings) / 1000
+    leaked = sorted(name for name in FORBIDDEN if name in imported)
+    print(f"import gitpush.cli: {best_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if leaked:
+        print(f"FAIL: imported on the push path: {', '.join(leaked)}")
+    if best_ms > args.budget_ms:
+        print("FAIL: import-time budget exceeded")
+    return 1 if leaked or best_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
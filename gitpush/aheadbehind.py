@@ -0,0 +1,103 @@
+"""
+Persistent ahead/behind counts, keyed by the (local tip, remote tip) pair.
+
+Counting with `git rev-list --left-right --count` walks history, which takes
+seconds on very long histories even when neither tip has moved since the last
+run. Results are kept in `<git dir>/gitpush/ahead-behind.json`, most recently
+used last, and the least recently used entries are dropped beyond MAX_ENTRIES.
+
+When only one tip moved forward a little since a cached pair, the counts are
+updated from that pair instead of recounted: with N the commits that are new
+on the moving side, the side that moved gains the commits of N the other tip
+does not reach, and the other side loses those it does.
+"""
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+from gitpush import cache, trace
+from gitpush.refs import common_dir
+
+CACHE_FILE = os.path.join("gitpush", "ahead-behind.json")
+MAX_ENTRIES = 256
+INCREMENTAL_LIMIT = 1000   # beyond this many new commits, count from scratch
+
+
+def _load(path: str) -> List[list]:
+    entries = cache.read_json(path, [])
+    if not isinstance(entries, list):
+        return []
+    return [e for e in entries if isinstance(e, list) and len(e) == 4]
+
+
+def _full(local_tip: str, remote_tip: str) -> Optional[Tuple[int, int]]:
+    result = trace.run(["git", "rev-list", "--left-right", "--count", f"{remote_tip}...{local_tip}", "--"],
+                       capture_output=True, text=True)
+    behind_ahead = result.stdout.split()
+    if result.returncode != 0 or len(behind_ahead) != 2:
+        return None
+    return int(behind_ahead[0]), int(behind_ahead[1])
+
+
+def _forward(old_tip: str, new_tip: str, other_tip: str) -> Optional[Tuple[int, int]]:
+    """
+    (new, shared): the number of commits new_tip has beyond old_tip, and how many of those
+    other_tip already reaches. None unless new_tip is a small fast-forward of old_tip.
+    """
+    check = trace.run(["git", "merge-base", "--is-ancestor", old_tip, new_tip], capture_output=True)
+    if check.returncode != 0:
+        return None
+    listing = trace.run(["git", "rev-list", f"--max-count={INCREMENTAL_LIMIT + 1}", new_tip, f"^{old_tip}", "--"],
+                        capture_output=True, text=True)
+    new = len(listing.stdout.split())
+    if listing.returncode != 0 or new > INCREMENTAL_LIMIT:
+        return None
+    outside = trace.run(["git", "rev-list", "--count", new_tip, f"^{old_tip}", f"^{other_tip}", "--"],
+                        capture_output=True, text=True)
+    if outside.returncode != 0 or not outside.stdout.strip().isdigit():
+        return None
+    return new, new - int(outside.stdout)
+
+
+def _incremental(entries: List[list], local_tip: str, remote_tip: str) -> Optional[Tuple[int, int]]:
+    """Update the most recent entry that shares one tip with the requested pair"""
+    local_base = next((e for e in reversed(entries) if e[1] == remote_tip), None)
+    if local_base is not None:
+        step = _forward(local_base[0], local_tip, remote_tip)
+        if step is not None:
+            new, shared = step
+            return local_base[2] - shared, local_base[3] + new - shared
+    remote_base = next((e for e in reversed(entries) if e[0] == local_tip), None)
+    if remote_base is not None:
+        step = _forward(remote_base[1], remote_tip, local_tip)
+        if step is not None:
+            new, shared = step
+            return remote_base[2] + new - shared, remote_base[3] - shared
+    return None
+
+
+def counts(git_dir: Optional[str], local_tip: str, remote_tip: str) -> Optional[Tuple[int, int]]:
+    """(behind, ahead) of local_tip against remote_tip (object ids), or None if git cannot tell"""
+    if local_tip == remote_tip:
+        return 0, 0
+    if git_dir is None:
+        return _full(local_tip, remote_tip)
+
+    start = time.perf_counter()
+    path = os.path.join(common_dir(git_dir), CACHE_FILE)
+    entries = _load(path)
+    hit = next((e for e in entries if e[0] == local_tip and e[1] == remote_tip), None)
+    if hit is not None:
+        entries.remove(hit)
+        result, how = (hit[2], hit[3]), "cached"
+    else:
+        result, how = _incremental(entries, local_tip, remote_tip), "incremental"
+        if result is None or min(result) < 0:
+            result, how = _full(local_tip, remote_tip), "full"
+        if result is None:
+            return None
+    entries.append([local_tip, remote_tip, result[0], result[1]])
+    cache.write_json(path, entries[-MAX_ENTRIES:])
+    trace.record("ahead/behind", start, time.perf_counter(), how=how)
+    return result
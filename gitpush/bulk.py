@@ -0,0 +1,230 @@
+"""
+Bulk repository creation from a manifest (--new-repo-manifest).
+
+The manifest is CSV with a header row: `name` plus optional `visibility`
+(public/private), `description` and `source` (directory to push, relative to
+the manifest, default: the repository name). Lines starting with '#' are
+skipped. Each repository is created by a `gitpush --new-repo` child process
+started in its source directory; creations start no faster than a token bucket
+allows, and when gh reports rate limiting the whole scheduler pauses with
+exponential backoff before that repository is retried. Results are written to
+`<manifest>.results.json` after every repository, and a rerun skips the
+repositories recorded there as created.
+"""
+
+import csv
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional
+
+from gitpush import trace
+
+DEFAULT_RATE = 20.0          # repositories per minute
+DEFAULT_BURST = 3
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 60.0          # seconds; GitHub asks clients to wait at least a minute after a secondary rate limit
+BACKOFF_MAX = 15 * 60.0
+RATE_LIMIT_MARKERS = (
+    "secondary rate limit", "rate limit exceeded", "api rate limit", "abuse detection",
+    "was submitted too quickly", "http 429",
+)
+_URL = re.compile(r"https://\S+")
+
+
+class RepoSpec(NamedTuple):
+    name: str
+    private: bool
+    description: str
+    source: str
+
+
+class CreateResult(NamedTuple):
+    spec: RepoSpec
+    ok: bool
+    output: str
+    url: Optional[str]
+    attempts: int
+    duration: float
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `burst`; pause() holds everyone back after a rate-limit answer"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(min(wait, 5.0))
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+def read_manifest(path: str) -> List[RepoSpec]:
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if line.strip() and not line.lstrip().startswith("#"))
+        if not rows.fieldnames or "name" not in [h.strip().lower() for h in rows.fieldnames]:
+            raise ValueError("the manifest needs a header row with at least a 'name' column")
+        specs = []
+        for index, row in enumerate(rows, 1):
+            if None in row:
+                # csv.DictReader files surplus fields under None
+                raise ValueError(f"entry {index} has {len(row[None])} more fields than the header")
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items()}
+            if not row.get("name"):
+                continue
+            visibility = (row.get("visibility") or "public").lower()
+            if visibility not in ("public", "private"):
+                raise ValueError(f"{row['name']}: visibility must be 'public' or 'private', not {visibility!r}")
+            source = os.path.expanduser(row.get("source") or row["name"])
+            specs.append(RepoSpec(row["name"], visibility == "private", row.get("description", ""),
+                                  os.path.normpath(os.path.join(base, source))))
+    return specs
+
+
+def results_path(manifest: str) -> str:
+    return manifest + ".results.json"
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        if not isinstance(results, dict):
+            return {}
+        # An entry that is not an object cannot say the repository was created
+        return {name: entry for name, entry in results.items() if isinstance(entry, dict)}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_results(path: str, results: Dict[str, dict]):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_rate_limited(output: str) -> bool:
+    output = output.lower()
+    return any(marker in output for marker in RATE_LIMIT_MARKERS)
+
+
+def _error_line(output: str) -> str:
+    """The last '❌' line of a child's output (the hint lines after it are not the error)"""
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    errors = [line for line in lines if line.startswith("❌")]
+    return (errors or lines or ["unknown error"])[-1]
+
+
+def create_one(spec: RepoSpec, bucket: TokenBucket, cli_args: List[str]) -> CreateResult:
+    """Create one repository, waiting for the scheduler before each attempt. `cli_args` go last (may end with '--', message)."""
+    start = time.monotonic()
+    if not os.path.isdir(spec.source):
+        return CreateResult(spec, False, f"❌ Source directory not found: {spec.source}\n", None, 0, 0.0)
+
+    cmd = [sys.executable, "-m", "gitpush.cli", "--no-daemon", "--new-repo", spec.name]
+    if spec.private:
+        cmd.append("--private")
+    if spec.description:
+        cmd.extend(["--description", spec.description])
+    cmd.extend(cli_args)
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+
+    output = ""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        bucket.acquire()
+        try:
+            # stdin is closed: gh install and login prompts were handled before the workers started
+            process = trace.run(cmd, phase=f"create {spec.name}", cwd=spec.source, env=env,
+                                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding="utf-8", errors="replace")
+        except OSError as e:
+            return CreateResult(spec, False, f"❌ Could not run gitpush: {str(e)}\n", None, attempt, time.monotonic() - start)
+        output = process.stdout
+        if process.returncode == 0:
+            urls = _URL.findall(output)
+            return CreateResult(spec, True, output, urls[-1] if urls else None, attempt, time.monotonic() - start)
+        if not is_rate_limited(output) or attempt == MAX_ATTEMPTS:
+            break
+        wait = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(1.0, 1.25)
+        print(f"⏳ {spec.name}: GitHub rate limit hit; pausing all creations for {wait:.0f}s "
+              f"(attempt {attempt}/{MAX_ATTEMPTS})...", flush=True)
+        bucket.pause(wait)
+    return CreateResult(spec, False, output, None, attempt, time.monotonic() - start)
+
+
+def create_from_manifest(manifest: str, cli_args: List[str], jobs: int = 4, rate_per_minute: float = DEFAULT_RATE) -> bool:
+    """Create every repository in the manifest that is not already recorded as created. Returns False if any failed."""
+    try:
+        specs = read_manifest(manifest)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"❌ Could not read manifest {manifest}: {str(e)}", file=sys.stderr)
+        return False
+
+    results_file = results_path(manifest)
+    results = load_results(results_file)
+    done = [s for s in specs if results.get(s.name, {}).get("status") == "created"]
+    todo = [s for s in specs if s not in done]
+    if done:
+        print(f"⏭  Skipping {len(done)} repositories already created (see {results_file}).")
+    if not todo:
+        print("✅ Nothing left to create.")
+        return True
+
+    jobs = max(1, min(jobs, len(todo)))
+    bucket = TokenBucket(max(rate_per_minute, 0.1) / 60.0, min(DEFAULT_BURST, jobs))
+    print(f"🏗  Creating {len(todo)} repositories with {jobs} parallel jobs, at most {rate_per_minute:g} per minute...")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(create_one, spec, bucket, cli_args) for spec in todo]
+        # Only this thread prints and writes the results file
+        for future in as_completed(futures):
+            result = future.result()
+            icon = "✅" if result.ok else "❌"
+            print(f"\n{icon} ── {result.spec.name} ({result.spec.source}) ──")
+            print(result.output.rstrip() or "(no output)")
+            if not result.ok:
+                failed.append(result.spec.name)
+            results[result.spec.name] = {
+                "status": "created" if result.ok else "failed",
+                "url": result.url,
+                "attempts": result.attempts,
+                "seconds": round(result.duration, 1),
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "error": None if result.ok else _error_line(result.output),
+            }
+            try:
+                save_results(results_file, results)
+            except OSError as e:
+                print(f"⚠️ Could not write {results_file}: {str(e)}", file=sys.stderr)
+
+    print(f"\n📋 {len(todo) - len(failed)} created, {len(failed)} failed, {len(done)} skipped. Results: {results_file}")
+    if failed:
+        print("➡️  Fix the failures and run the same command again; created repositories are skipped.")
+    return not failed
@@ -0,0 +1,69 @@
+"""
+Small on-disk JSON caches kept under the user cache directory.
+
+`--no-cache` calls `disable()`, after which reads miss and writes are dropped.
+"""
+
+import os
+import sys
+from typing import Any
+
+_enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def user_cache_dir() -> str:
+    """Per-user cache directory for gitpush (GITPUSH_CACHE_DIR overrides it)"""
+    override = os.environ.get("GITPUSH_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "gitpush", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/gitpush")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "gitpush")
+
+
+def cache_path(name: str) -> str:
+    return os.path.join(user_cache_dir(), name)
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """Load a cache file, treating a missing or corrupt file as empty"""
+    if not _enabled:
+        return default
+    import json
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: str, data: Any):
+    """Atomically replace a cache file. Failures are ignored: a cache must never break a push."""
+    if not _enabled:
+        return
+    import json
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
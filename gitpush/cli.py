@@ -1,1178 +1,137 @@
-# import os
-# import argparse
-# import sys
-# import subprocess
-# import shutil
-# import platform
-# import json
-# import tempfile
-# import urllib.request
-# from typing import Optional
-
-# # --- Installation Orchestrator and Helpers (Your Code, Integrated) ---
-
-# def check_gh_installed() -> bool:
-#     """Check if GitHub CLI is installed with proper verification"""
-#     if shutil.which("gh"):
-#         try:
-#             # Verify gh is actually working
-#             subprocess.run(["gh", "--version"], check=True, capture_output=True)
-#             return True
-#         except (subprocess.CalledProcessError, FileNotFoundError):
-#             # Found but not working - might be a PATH issue or broken install
-#             return False
-#     return False
-
-# def install_gh_cli() -> bool:
-#     """Main installation function with comprehensive error handling"""
-#     system = platform.system()
-#     machine = platform.machine().lower()
-    
-#     print("\n🔧 Installing GitHub CLI...")
-#     print(f"📋 System: {system}, Architecture: {machine}")
-    
-#     try:
-#         if system == "Windows":
-#             return install_gh_cli_windows()
-#         elif system == "Darwin":
-#             return install_gh_cli_mac()
-#         elif system == "Linux":
-#             return install_gh_cli_linux()
-#         else:
-#             print(f"❌ Unsupported OS: {system}")
-#             return False
-#     except Exception as e:
-#         print(f"❌ Installation failed: {str(e)}")
-#         return False
-
-# def install_gh_cli_windows() -> bool:
-#     """Windows installation with multiple fallback methods and PATH management"""
-#     methods = [
-#         try_winget_install,
-#         try_scoop_install,
-#         try_choco_install,
-#         try_direct_msi_install,
-#         try_direct_zip_install
-#     ]
-    
-#     for method in methods:
-#         if method():
-#             if verify_gh_installation():
-#                 return True
-#         print("   ⚠️ Trying next installation method...")
-    
-#     print("❌ All Windows installation methods failed.")
-#     return False
-
-# def try_winget_install() -> bool:
-#     """Attempt installation via winget"""
-#     if not shutil.which("winget"):
-#         return False
-    
-#     print("\n   🔄 Attempting winget installation...")
-#     try:
-#         subprocess.run(
-#             ["winget", "install", "--id", "GitHub.cli", "--silent", "--accept-package-agreements", "--accept-source-agreements"],
-#             check=True,
-#             capture_output=True
-#         )
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         print(f"   ⚠️ winget failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-#         return False
-
-# def try_scoop_install() -> bool:
-#     """Attempt installation via scoop"""
-#     if not shutil.which("scoop"):
-#         return False
-    
-#     print("\n   🔄 Attempting scoop installation...")
-#     try:
-#         subprocess.run(["scoop", "install", "gh"], check=True, capture_output=True)
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         print(f"   ⚠️ scoop failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-#         return False
-
-# def try_choco_install() -> bool:
-#     """Attempt installation via chocolatey"""
-#     if not shutil.which("choco"):
-#         return False
-    
-#     print("\n   🔄 Attempting chocolatey installation...")
-#     try:
-#         subprocess.run(["choco", "install", "gh", "-y"], check=True, capture_output=True)
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         print(f"   ⚠️ chocolatey failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-#         return False
-
-# def try_direct_msi_install() -> bool:
-#     """Direct MSI installation with proper PATH handling"""
-#     print("\n   🔄 Attempting direct MSI installation...")
-#     temp_dir = ""
-#     try:
-#         release_info = get_github_release_info()
-#         if not release_info: return False
-        
-#         msi_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('_windows_amd64.msi')), None)
-#         if not msi_asset:
-#             print("   ❌ Could not find Windows MSI installer.")
-#             return False
-            
-#         temp_dir = tempfile.mkdtemp()
-#         msi_path = os.path.join(temp_dir, msi_asset['name'])
-#         print(f"   ⬇️ Downloading {msi_asset['name']}...")
-#         if not download_file(msi_asset['browser_download_url'], msi_path): return False
-        
-#         print("   🛠 Installing (this may require administrator privileges)...")
-#         subprocess.run(["msiexec", "/i", msi_path, "/quiet", "/norestart"], check=True)
-        
-#         shutil.rmtree(temp_dir, ignore_errors=True)
-        
-#         program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
-#         gh_path = os.path.join(program_files, "GitHub CLI", "gh.exe")
-#         if os.path.exists(gh_path): add_to_path(os.path.dirname(gh_path))
-        
-#         return True
-#     except Exception as e:
-#         print(f"   ❌ MSI installation failed: {str(e)}")
-#         if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
-#         return False
-
-# def try_direct_zip_install() -> bool:
-#     """Fallback ZIP installation for Windows"""
-#     print("\n   🔄 Attempting direct ZIP installation...")
-#     temp_dir = ""
-#     try:
-#         release_info = get_github_release_info()
-#         if not release_info: return False
-        
-#         zip_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('windows_amd64.zip')), None)
-#         if not zip_asset:
-#             print("   ❌ Could not find Windows ZIP package.")
-#             return False
-            
-#         temp_dir = tempfile.mkdtemp()
-#         zip_path = os.path.join(temp_dir, zip_asset['name'])
-#         print(f"   ⬇️ Downloading {zip_asset['name']}...")
-#         if not download_file(zip_asset['browser_download_url'], zip_path): return False
-        
-#         print("   📦 Extracting...")
-#         shutil.unpack_archive(zip_path, temp_dir)
-        
-#         bin_dir = next((root for root, _, files in os.walk(temp_dir) if "gh.exe" in files), None)
-#         if not bin_dir:
-#             print("   ❌ Could not find gh.exe in extracted files.")
-#             shutil.rmtree(temp_dir, ignore_errors=True)
-#             return False
-        
-#         install_dir = os.path.join(os.environ.get("LOCALAPPDATA", ""), "GitHubCLI")
-#         os.makedirs(install_dir, exist_ok=True)
-        
-#         shutil.copytree(bin_dir, install_dir, dirs_exist_ok=True)
-#         add_to_path(install_dir)
-        
-#         shutil.rmtree(temp_dir, ignore_errors=True)
-#         return True
-#     except Exception as e:
-#         print(f"   ❌ ZIP installation failed: {str(e)}")
-#         if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
-#         return False
-
-# def install_gh_cli_mac() -> bool:
-#     """macOS installation with multiple methods"""
-#     if shutil.which("brew"):
-#         print("\n   🔄 Attempting Homebrew installation...")
-#         try:
-#             subprocess.run(["brew", "install", "gh"], check=True, capture_output=True)
-#             if verify_gh_installation(): return True
-#         except subprocess.CalledProcessError as e:
-#             print(f"   ⚠️ Homebrew failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-    
-#     print("❌ All macOS installation methods failed.")
-#     return False
-
-# def install_gh_cli_linux() -> bool:
-#     """Linux installation with distro detection and multiple methods"""
-#     package_managers = [
-#         ("apt-get", "sudo apt-get update && sudo apt-get install -y gh"),
-#         ("apt", "sudo apt update && sudo apt install -y gh"),
-#         ("dnf", "sudo dnf install -y gh"),
-#         ("yum", "sudo yum install -y gh"),
-#         ("pacman", "sudo pacman -S --noconfirm github-cli"),
-#         ("zypper", "sudo zypper install -y gh"),
-#     ]
-#     for pm, command in package_managers:
-#         if shutil.which(pm):
-#             print(f"\n   🔄 Attempting installation via {pm}...")
-#             try:
-#                 subprocess.run(command, shell=True, check=True, capture_output=True)
-#                 if verify_gh_installation(): return True
-#             except subprocess.CalledProcessError as e:
-#                 print(f"   ⚠️ {pm} failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-
-#     print("❌ All Linux package manager installations failed.")
-#     return False
-
-# def get_github_release_info() -> Optional[dict]:
-#     """Get latest release info from GitHub API"""
-#     try:
-#         with urllib.request.urlopen("https://api.github.com/repos/cli/cli/releases/latest") as response:
-#             return json.loads(response.read().decode())
-#     except Exception as e:
-#         print(f"   ❌ Failed to get release info from GitHub API: {str(e)}")
-#         return None
-
-# def download_file(url: str, path: str) -> bool:
-#     """Download a file with progress reporting"""
-#     try:
-#         def reporthook(count, block_size, total_size):
-#             if total_size > 0:
-#                 percent = int(count * block_size * 100 / total_size)
-#                 sys.stdout.write(f"\r      Downloading... {percent}%")
-#                 sys.stdout.flush()
-            
-#         urllib.request.urlretrieve(url, path, reporthook=reporthook)
-#         sys.stdout.write("\r      Downloading... 100%\n")
-#         sys.stdout.flush()
-#         return True
-#     except Exception as e:
-#         print(f"\n   ❌ Download failed: {str(e)}")
-#         return False
-
-# def add_to_path(directory: str):
-#     """Add directory to PATH for the current session and try to make it permanent."""
-#     print(f"   ✅ Adding {directory} to PATH...")
-#     os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ['PATH']}"
-    
-#     if platform.system() == "Windows":
-#         try:
-#             # This makes the PATH change permanent for the current user
-#             subprocess.run(
-#                 f'setx PATH "%PATH%;{directory}"',
-#                 shell=True, check=True, capture_output=True
-#             )
-#         except Exception as e:
-#             print(f"   ⚠️ Could not make PATH change permanent: {e}")
-#             print("      You may need to add it manually.")
-#     else: # macOS and Linux
-#         # Suggest adding to shell profile
-#         profile_file = ""
-#         shell = os.environ.get("SHELL", "")
-#         if "bash" in shell: profile_file = "~/.bashrc"
-#         elif "zsh" in shell: profile_file = "~/.zshrc"
-#         else: profile_file = "~/.profile"
-#         print(f"   To make this change permanent, add the following to your {profile_file}:")
-#         print(f'   export PATH="{directory}:$PATH"')
-
-# def verify_gh_installation() -> bool:
-#     """Verify gh is properly installed and in PATH"""
-#     if not shutil.which("gh"):
-#         return False
-#     try:
-#         result = subprocess.run(["gh", "--version"], check=True, capture_output=True, text=True)
-#         print(f"✅ GitHub CLI successfully installed: {result.stdout.splitlines()[0]}")
-#         return True
-#     except (subprocess.CalledProcessError, FileNotFoundError):
-#         return False
-
-# def check_and_install_gh() -> bool:
-#     """Main function to check and install GitHub CLI, WITH USER PROMPT."""
-#     if check_gh_installed():
-#         return True
-    
-#     # --- ADDED USER PROMPT ---
-#     print("\n❓ GitHub CLI (gh) is required for this feature but is not installed.", file=sys.stderr)
-#     try:
-#         answer = input("   Would you like this tool to attempt an automatic installation? (y/n): ").lower().strip()
-#         if answer != 'y':
-#             print("\n❌ Installation cancelled by user. Please install gh manually from https://cli.github.com/")
-#             return False
-#     except (EOFError, KeyboardInterrupt):
-#         print("\n❌ Installation cancelled by user.")
-#         return False
-    
-#     if not install_gh_cli():
-#         print("\n❌ Failed to install GitHub CLI automatically. Please try manual installation:")
-#         print("   Visit https://github.com/cli/cli#installation for instructions.")
-#         return False
-    
-#     # After installation, a PATH refresh might be needed
-#     if not check_gh_installed():
-#         print("\n‼️ IMPORTANT: Installation completed, but GitHub CLI is not yet available in this terminal session.")
-#         print("   Please open a NEW terminal and run your command again.")
-#         return False
-    
-#     return True
-
-
-# # --- Core Tool Functions ---
-
-# def gh_authenticated():
-#     """Check if user is authenticated with GitHub CLI"""
-#     try:
-#         result = subprocess.run(["gh", "auth", "status"], capture_output=True, text=True, check=True)
-#         return "Logged in to github.com" in result.stderr
-#     except (subprocess.CalledProcessError, FileNotFoundError):
-#         return False
-
-
-# def is_local_ahead() -> bool:
-#     try:
-#         result = subprocess.run(
-#             ["git", "rev-list", "--left-right", "--count", "origin/main...HEAD"],
-#             capture_output=True, text=True, check=True
-#         )
-#         behind_ahead = result.stdout.strip().split()
-#         if len(behind_ahead) == 2:
-#             behind, ahead = map(int, behind_ahead)
-#             return ahead > 0
-#         return False
-#     except subprocess.CalledProcessError:
-#         return False
-
-
-# def authenticate_with_gh():
-#     """Authenticate user with GitHub CLI"""
-#     print("\n🔑 GitHub authentication required.")
-#     print("The tool will use the GitHub CLI (gh) to open a browser for secure login.")
-    
-#     try:
-#         subprocess.run(["gh", "auth", "login", "--web", "-h", "github.com"], check=True)
-#         return True
-#     except subprocess.CalledProcessError:
-#         print("❌ Authentication failed. Please try running 'gh auth login' manually.", file=sys.stderr)
-#         return False
-
-# def initialize_git_repository():
-#     """Initialize git repository if not already initialized"""
-#     if os.path.exists(".git"):
-#         return False
-        
-#     print("🛠 Initializing git repository")
-#     try:
-#         subprocess.run(["git", "init"], check=True, capture_output=True)
-#         subprocess.run(["git", "branch", "-M", "main"], check=True, capture_output=True)
-        
-#         if not os.path.exists(".gitignore"):
-#             with open(".gitignore", "w") as f:
-#                 f.write("""# Python
-# __pycache__/
-# *.py[cod]
-# *.so
-# .Python
-# env/
-# venv/
-# .env
-
-# # IDE
-# .vscode/
-# .idea/
-# *.swp
-# *.swo
-
-# # System
-# .DS_Store
-# Thumbs.db
-
-# # Project specific
-# *.log
-# *.tmp
-# *.bak
-# """)
-#             print("📁 Created .gitignore file")
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         print(f"❌ Failed to initialize Git repository: {e.stderr.decode(errors='ignore').strip()}", file=sys.stderr)
-#         return False
-
-# def create_initial_commit(commit_message="Initial commit"):
-#     """Create initial commit if no commits exist"""
-#     try:
-#         result = subprocess.run(["git", "rev-list", "--count", "HEAD"], capture_output=True, text=True)
-#         commit_count = int(result.stdout.strip()) if result.stdout.strip().isdigit() else 0
-        
-#         if commit_count == 0:
-#             print("📦 Creating initial commit")
-#             subprocess.run(["git", "add", "."], check=True)
-#             subprocess.run(["git", "commit", "-m", commit_message], check=True)
-#             return True
-#         return False
-#     except subprocess.CalledProcessError as e:
-#         error_output = e.stderr.decode(errors='ignore').strip()
-#         if "nothing to commit" in error_output:
-#              print(f"❌ Failed to create initial commit: No files found to commit.", file=sys.stderr)
-#              print("➡️  Add some files to your project directory before creating a repository.", file=sys.stderr)
-#         else:
-#              print(f"❌ Failed to create initial commit: {error_output}", file=sys.stderr)
-#         return False
-
-# def create_with_gh_cli(repo_name, private=False, description="", commit_message="Initial commit"):
-#     """Create and push to new repository using GitHub CLI"""
-#     try:
-#         if not os.path.exists(".git"):
-#             if not initialize_git_repository():
-#                 return False
-        
-#         if not create_initial_commit(commit_message):
-#             if subprocess.run(["git", "status"], capture_output=True).returncode != 0:
-#                  return False
-#             print("ℹ️ Using existing commits")
-
-#         private_flag = "--private" if private else "--public"
-#         cmd = ["gh", "repo", "create", repo_name, private_flag, "--source=.", "--remote=origin", "--push"]
-#         if description: cmd.extend(["--description", description])
-        
-#         print("🚀 Creating repository and pushing code...")
-#         process = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-#         repo_url = process.stderr.strip()
-#         print(f"✅ Successfully created repository: {repo_url}")
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         error_message = e.stderr.strip()
-#         if "already exists" in error_message:
-#             print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
-#             print("➡️  Please choose a different repository name.", file=sys.stderr)
-#         else:
-#             print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
-#         return False
-#     except Exception as e:
-#         print(f"❌ An unexpected error occurred: {str(e)}", file=sys.stderr)
-#         return False
-
-# def standard_git_push(commit_message, branch, remote, force=False, tags=False):
-#     """Handle standard git push operations"""
-#     try:
-#         subprocess.run(["git", "add", "."], check=True)
-        
-#         if commit_message:
-#             print(f"📦 Committing with message: '{commit_message}'")
-#             subprocess.run(["git", "commit", "-m", commit_message, "--allow-empty-message"], check=True)
-#         else:
-#             print("ℹ️ No commit message provided. Pushing only staged changes.")
-        
-#         if is_local_ahead():
-#             push_cmd = ["git", "push"]
-#         else:
-#             push_cmd = ["git", "push", "origin", "main"]
-
-#         if force:
-#             push_cmd.append("--force-with-lease")
-#             print("⚠️ Using safe force push (--force-with-lease).")
-#         if tags:
-#             push_cmd.append("--tags")
-#         if remote and branch:
-#             push_cmd.extend([remote, branch])
-        
-#         print(f"🚀 Executing: {' '.join(push_cmd)}")
-#         subprocess.run(push_cmd, check=True)
-#         print("✅ Successfully pushed changes.")
-#         return True
-
-#     except subprocess.CalledProcessError as e:
-#         error_output = e.stderr.decode(errors='ignore').strip() if e.stderr else str(e)
-
-#         if "nothing to commit" in error_output:
-#             print("ℹ️ No changes to commit. Nothing to do.")
-#             return True
-
-#         if "non-fast-forward" in error_output.lower():
-#             print("\n❗ Detected non-fast-forward issue. Attempting rebase...")
-#             if attempt_rebase(remote, branch):
-#                 print("🔁 Retrying push after rebase...")
-#                 return standard_git_push(commit_message, branch, remote, force, tags)
-#             else:
-#                 print("❌ Rebase failed. Please resolve conflicts manually and re-run the push.")
-#                 return False
-
-#         print(f"❌ Push failed: {error_output}", file=sys.stderr)
-#         return False
-
-
-
-# def has_incoming_changes(remote: str = "origin", branch: str = "main") -> bool:
-#     try:
-#         subprocess.run(["git", "fetch", remote], check=True, capture_output=True)
-
-#         result = subprocess.run(
-#             ["git", "rev-list", "--left-right", "--count", f"{remote}/{branch}...{branch}"],
-#             check=True, capture_output=True, text=True
-#         )
-#         behind_ahead = result.stdout.strip().split()
-#         if len(behind_ahead) == 2:
-#             behind, ahead = map(int, behind_ahead)
-#             return behind > 0
-#         return False
-#     except subprocess.CalledProcessError:
-#         return False
-
-
-# def pull_and_check_conflicts(remote: str = "origin", branch: str = "main") -> bool:
-#     print("🔄 Pulling latest changes before pushing...")
-
-#     try:
-#         result = subprocess.run(["git", "pull", remote, branch], capture_output=True, text=True)
-
-#         if "CONFLICT" in result.stdout or "CONFLICT" in result.stderr:
-#             print("❗ Merge conflicts detected.")
-#             return True
-#         else:
-#             print("✅ Pulled successfully. No conflicts.")
-#             return False
-#     except subprocess.CalledProcessError as e:
-#         print(f"❌ Pull failed: {e.stderr or str(e)}", file=sys.stderr)
-#         return True
-
-
-
-# def show_merge_conflict_details():
-#     print("\n🔍 Merge Conflict Report:\n")
-
-#     try:
-#         result = subprocess.run(["git", "diff", "--name-only", "--diff-filter=U"], capture_output=True, text=True, check=True)
-#         conflicted_files = result.stdout.strip().splitlines()
-
-#         if not conflicted_files:
-#             print("✅ No merge conflicts found.")
-#             return
-
-#         for file in conflicted_files:
-#             print(f"📄 File: {file}")
-#             try:
-#                 with open(file, 'r', encoding='utf-8') as f:
-#                     lines = f.readlines()
-#                     for i, line in enumerate(lines):
-#                         if line.startswith("<<<<<<<") or line.startswith("=======") or line.startswith(">>>>>>>"):
-#                             marker = line.strip()
-#                             print(f"   ⚠️  Conflict Marker ({marker}) at line {i + 1}")
-#             except Exception as e:
-#                 print(f"   ❌ Could not read file {file}: {str(e)}")
-
-#     except subprocess.CalledProcessError as e:
-#         print(f"❌ Could not retrieve conflicted files: {str(e)}")
-
-
-# def attempt_rebase(remote: str, branch: str) -> bool:
-#     print("🔁 Attempting: git pull --rebase")
-#     try:
-#         subprocess.run(["git", "pull", "--rebase", remote, branch], check=True)
-#         print("✅ Rebase completed successfully.")
-#         return True
-#     except subprocess.CalledProcessError as e:
-#         print(f"❌ Rebase failed: {e.stderr.decode(errors='ignore') if e.stderr else str(e)}")
-#         show_merge_conflict_details()
-#         return False
-
-
-# def get_git_sync_status(remote: str = "origin", branch: str = "main") -> tuple[str, int, int]:
-#     """
-#     Returns a tuple (status, behind, ahead) where status is one of:
-#     'ahead', 'behind', 'diverged', 'synced'
-#     """
-#     try:
-#         subprocess.run(["git", "fetch", remote], check=True, capture_output=True)
-#         result = subprocess.run(
-#             ["git", "rev-list", "--left-right", "--count", f"{remote}/{branch}...{branch}"],
-#             capture_output=True, text=True, check=True
-#         )
-#         behind_str, ahead_str = result.stdout.strip().split()
-#         behind, ahead = int(behind_str), int(ahead_str)
-
-#         if behind > 0 and ahead > 0:
-#             return "diverged", behind, ahead
-#         elif ahead > 0:
-#             return "ahead", behind, ahead
-#         elif behind > 0:
-#             return "behind", behind, ahead
-#         else:
-#             return "synced", behind, ahead
-#     except subprocess.CalledProcessError:
-#         return "unknown", 0, 0
-
-
-# # --- Main Entry Point ---
-
-# def run():
-#     parser = argparse.ArgumentParser(
-#         description="🚀 Supercharged Git push tool with GitHub repo creation",
-#         formatter_class=argparse.RawDescriptionHelpFormatter,
-#         epilog="""Examples:
-#   Standard push:         gitpush "My new feature"
-#   Create new repo:       gitpush "Initial commit" --new-repo my-awesome-project
-#   Private repository:    gitpush "Initial commit" --new-repo my-secret-project --private
-#   Force push (safe):     gitpush "Rebased feature" --force
-#   Initialize only:       gitpush --init
-# """
-#     )
-#     parser.add_argument("commit", nargs="?", help="Commit message (optional if just pushing staged changes).")
-#     parser.add_argument("branch", nargs="?", default=None, help="Branch name (defaults to current branch).")
-#     parser.add_argument("remote", nargs="?", default="origin", help="Remote name (default: origin).")
-#     parser.add_argument("--force", action="store_true", help="Force push with --force-with-lease.")
-#     parser.add_argument("--tags", action="store_true", help="Push all tags.")
-#     parser.add_argument("--init", action="store_true", help="Initialize a new Git repository and exit.")
-#     parser.add_argument("--new-repo", metavar="REPO_NAME", help="Create a new GitHub repository with the given name.")
-#     parser.add_argument("--private", action="store_true", help="Make the new repository private.")
-#     parser.add_argument("--description", help="Description for the new repository.")
-
-#     args = parser.parse_args()
-    
-#     target_branch = args.branch
-#     if not target_branch:
-#         try:
-#             branch_result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True, check=True)
-#             target_branch = branch_result.stdout.strip()
-#         except subprocess.CalledProcessError:
-#             target_branch = "main"
-
-#     if args.new_repo:
-#         # *** THIS IS THE MAIN FIX: Calling your orchestrator function ***
-#         if not check_and_install_gh():
-#             sys.exit(1)
-        
-#         if not gh_authenticated():
-#             if not authenticate_with_gh():
-#                 sys.exit(1)
-        
-#         if not create_with_gh_cli(
-#             args.new_repo,
-#             private=args.private,
-#             description=args.description or "",
-#             commit_message=args.commit or "Initial commit"
-#         ):
-#             sys.exit(1)
-
-#     elif args.init:
-#         if initialize_git_repository():
-#              print("✅ Git repository initialized successfully.")
-    
-#     else:
-#         sync_status, behind, ahead = get_git_sync_status(args.remote, target_branch)
-#         print(f"\n📊 Git status: {sync_status.upper()} (Behind: {behind}, Ahead: {ahead})")
-
-#         if sync_status == "behind":
-#             print("🔄 Your branch is behind remote. Pulling latest changes...")
-#             if pull_and_check_conflicts(args.remote, target_branch):
-#                 show_merge_conflict_details()
-#                 print("\n❌ Resolve conflicts before pushing.")
-#                 sys.exit(1)
-
-#         elif sync_status == "diverged":
-#             print("⚠️ Your branch has diverged from remote. Rebase recommended.")
-#             if attempt_rebase(args.remote, target_branch):
-#                 print("✅ Rebase done. Proceeding to push...")
-#             else:
-#                 print("❌ Rebase failed. Please resolve manually.")
-#                 sys.exit(1)
-
-
-
-#         if not standard_git_push(
-#             args.commit,
-#             target_branch,
-#             args.remote,
-#             args.force,
-#             args.tags
-#         ):
-#             sys.exit(1)
-
-# if __name__ == "__main__":
-#     run()
-    
-    
-    
-    
-# New code
-
-import os
+import atexit
+import importlib
 import argparse
 import sys
 import subprocess
-import shutil
-import platform
-import json
-import tempfile
-import urllib.request
-from typing import Optional
-
-# --- Installation Orchestrator and Helpers (Your Code, Integrated) ---
-
-def check_gh_installed() -> bool:
-    """Check if GitHub CLI is installed with proper verification"""
-    if shutil.which("gh"):
-        try:
-            # Verify gh is actually working
-            subprocess.run(["gh", "--version"], check=True, capture_output=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Found but not working - might be a PATH issue or broken install
-            return False
-    return False
-
-def install_gh_cli() -> bool:
-    """Main installation function with comprehensive error handling"""
-    system = platform.system()
-    machine = platform.machine().lower()
-    
-    print("\n🔧 Installing GitHub CLI...")
-    print(f"📋 System: {system}, Architecture: {machine}")
-    
-    try:
-        if system == "Windows":
-            return install_gh_cli_windows()
-        elif system == "Darwin":
-            return install_gh_cli_mac()
-        elif system == "Linux":
-            return install_gh_cli_linux()
-        else:
-            print(f"❌ Unsupported OS: {system}")
-            return False
-    except Exception as e:
-        print(f"❌ Installation failed: {str(e)}")
-        return False
-
-def install_gh_cli_windows() -> bool:
-    """Windows installation with multiple fallback methods and PATH management"""
-    methods = [
-        try_winget_install,
-        try_scoop_install,
-        try_choco_install,
-        try_direct_msi_install,
-        try_direct_zip_install
-    ]
-    
-    for method in methods:
-        if method():
-            if verify_gh_installation():
-                return True
-        print("   ⚠️ Trying next installation method...")
-    
-    print("❌ All Windows installation methods failed.")
-    return False
-
-def try_winget_install() -> bool:
-    """Attempt installation via winget"""
-    if not shutil.which("winget"):
-        return False
-    
-    print("\n   🔄 Attempting winget installation...")
-    try:
-        subprocess.run(
-            ["winget", "install", "--id", "GitHub.cli", "--silent", "--accept-package-agreements", "--accept-source-agreements"],
-            check=True,
-            capture_output=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"   ⚠️ winget failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-        return False
-
-def try_scoop_install() -> bool:
-    """Attempt installation via scoop"""
-    if not shutil.which("scoop"):
-        return False
-    
-    print("\n   🔄 Attempting scoop installation...")
-    try:
-        subprocess.run(["scoop", "install", "gh"], check=True, capture_output=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"   ⚠️ scoop failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-        return False
-
-def try_choco_install() -> bool:
-    """Attempt installation via chocolatey"""
-    if not shutil.which("choco"):
-        return False
-    
-    print("\n   🔄 Attempting chocolatey installation...")
-    try:
-        subprocess.run(["choco", "install", "gh", "-y"], check=True, capture_output=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"   ⚠️ chocolatey failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-        return False
-
-def try_direct_msi_install() -> bool:
-    """Direct MSI installation with proper PATH handling"""
-    print("\n   🔄 Attempting direct MSI installation...")
-    temp_dir = ""
-    try:
-        release_info = get_github_release_info()
-        if not release_info: return False
-        
-        msi_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('_windows_amd64.msi')), None)
-        if not msi_asset:
-            print("   ❌ Could not find Windows MSI installer.")
-            return False
-            
-        temp_dir = tempfile.mkdtemp()
-        msi_path = os.path.join(temp_dir, msi_asset['name'])
-        print(f"   ⬇️ Downloading {msi_asset['name']}...")
-        if not download_file(msi_asset['browser_download_url'], msi_path): return False
-        
-        print("   🛠 Installing (this may require administrator privileges)...")
-        subprocess.run(["msiexec", "/i", msi_path, "/quiet", "/norestart"], check=True)
-        
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        
-        program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
-        gh_path = os.path.join(program_files, "GitHub CLI", "gh.exe")
-        if os.path.exists(gh_path): add_to_path(os.path.dirname(gh_path))
-        
-        return True
-    except Exception as e:
-        print(f"   ❌ MSI installation failed: {str(e)}")
-        if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
-        return False
-
-def try_direct_zip_install() -> bool:
-    """Fallback ZIP installation for Windows"""
-    print("\n   🔄 Attempting direct ZIP installation...")
-    temp_dir = ""
-    try:
-        release_info = get_github_release_info()
-        if not release_info: return False
-        
-        zip_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('windows_amd64.zip')), None)
-        if not zip_asset:
-            print("   ❌ Could not find Windows ZIP package.")
-            return False
-            
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, zip_asset['name'])
-        print(f"   ⬇️ Downloading {zip_asset['name']}...")
-        if not download_file(zip_asset['browser_download_url'], zip_path): return False
-        
-        print("   📦 Extracting...")
-        shutil.unpack_archive(zip_path, temp_dir)
-        
-        bin_dir = next((root for root, _, files in os.walk(temp_dir) if "gh.exe" in files), None)
-        if not bin_dir:
-            print("   ❌ Could not find gh.exe in extracted files.")
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            return False
-        
-        install_dir = os.path.join(os.environ.get("LOCALAPPDATA", ""), "GitHubCLI")
-        os.makedirs(install_dir, exist_ok=True)
-        
-        shutil.copytree(bin_dir, install_dir, dirs_exist_ok=True)
-        add_to_path(install_dir)
-        
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        return True
-    except Exception as e:
-        print(f"   ❌ ZIP installation failed: {str(e)}")
-        if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
-        return False
-
-def install_gh_cli_mac() -> bool:
-    """macOS installation with multiple methods"""
-    if shutil.which("brew"):
-        print("\n   🔄 Attempting Homebrew installation...")
-        try:
-            subprocess.run(["brew", "install", "gh"], check=True, capture_output=True)
-            if verify_gh_installation(): return True
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️ Homebrew failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-    
-    print("❌ All macOS installation methods failed.")
-    return False
-
-def install_gh_cli_linux() -> bool:
-    """Linux installation with distro detection and multiple methods"""
-    package_managers = [
-        ("apt-get", "sudo apt-get update && sudo apt-get install -y gh"),
-        ("apt", "sudo apt update && sudo apt install -y gh"),
-        ("dnf", "sudo dnf install -y gh"),
-        ("yum", "sudo yum install -y gh"),
-        ("pacman", "sudo pacman -S --noconfirm github-cli"),
-        ("zypper", "sudo zypper install -y gh"),
-    ]
-    for pm, command in package_managers:
-        if shutil.which(pm):
-            print(f"\n   🔄 Attempting installation via {pm}...")
-            try:
-                subprocess.run(command, shell=True, check=True, capture_output=True)
-                if verify_gh_installation(): return True
-            except subprocess.CalledProcessError as e:
-                print(f"   ⚠️ {pm} failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
-
-    print("❌ All Linux package manager installations failed.")
-    return False
-
-def get_github_release_info() -> Optional[dict]:
-    """Get latest release info from GitHub API"""
-    try:
-        with urllib.request.urlopen("https://api.github.com/repos/cli/cli/releases/latest") as response:
-            return json.loads(response.read().decode())
-    except Exception as e:
-        print(f"   ❌ Failed to get release info from GitHub API: {str(e)}")
-        return None
-
-def download_file(url: str, path: str) -> bool:
-    """Download a file with progress reporting"""
-    try:
-        def reporthook(count, block_size, total_size):
-            if total_size > 0:
-                percent = int(count * block_size * 100 / total_size)
-                sys.stdout.write(f"\r      Downloading... {percent}%")
-                sys.stdout.flush()
-            
-        urllib.request.urlretrieve(url, path, reporthook=reporthook)
-        sys.stdout.write("\r      Downloading... 100%\n")
-        sys.stdout.flush()
-        return True
-    except Exception as e:
-        print(f"\n   ❌ Download failed: {str(e)}")
-        return False
-
-def add_to_path(directory: str):
-    """Add directory to PATH for the current session and try to make it permanent."""
-    print(f"   ✅ Adding {directory} to PATH...")
-    os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ['PATH']}"
-    
-    if platform.system() == "Windows":
-        try:
-            # This makes the PATH change permanent for the current user
-            subprocess.run(
-                f'setx PATH "%PATH%;{directory}"',
-                shell=True, check=True, capture_output=True
-            )
-        except Exception as e:
-            print(f"   ⚠️ Could not make PATH change permanent: {e}")
-            print("      You may need to add it manually.")
-    else: # macOS and Linux
-        # Suggest adding to shell profile
-        profile_file = ""
-        shell = os.environ.get("SHELL", "")
-        if "bash" in shell: profile_file = "~/.bashrc"
-        elif "zsh" in shell: profile_file = "~/.zshrc"
-        else: profile_file = "~/.profile"
-        print(f"   To make this change permanent, add the following to your {profile_file}:")
-        print(f'   export PATH="{directory}:$PATH"')
-
-def verify_gh_installation() -> bool:
-    """Verify gh is properly installed and in PATH"""
-    if not shutil.which("gh"):
-        return False
-    try:
-        result = subprocess.run(["gh", "--version"], check=True, capture_output=True, text=True)
-        print(f"✅ GitHub CLI successfully installed: {result.stdout.splitlines()[0]}")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
-
-def check_and_install_gh() -> bool:
-    """Main function to check and install GitHub CLI, WITH USER PROMPT."""
-    if check_gh_installed():
-        return True
-    
-    # --- ADDED USER PROMPT ---
-    print("\n❓ GitHub CLI (gh) is required for this feature but is not installed.", file=sys.stderr)
-    try:
-        answer = input("   Would you like this tool to attempt an automatic installation? (y/n): ").lower().strip()
-        if answer != 'y':
-            print("\n❌ Installation cancelled by user. Please install gh manually from https://cli.github.com/")
-            return False
-    except (EOFError, KeyboardInterrupt):
-        print("\n❌ Installation cancelled by user.")
-        return False
-    
-    if not install_gh_cli():
-        print("\n❌ Failed to install GitHub CLI automatically. Please try manual installation:")
-        print("   Visit https://github.com/cli/cli#installation for instructions.")
-        return False
-    
-    # After installation, a PATH refresh might be needed
-    if not check_gh_installed():
-        print("\n‼️ IMPORTANT: Installation completed, but GitHub CLI is not yet available in this terminal session.")
-        print("   Please open a NEW terminal and run your command again.")
-        return False
-    
-    return True
+from typing import List, Optional, Sequence
+
+from gitpush import cache, retry, trace
+from gitpush.guard import check_push_size, size_limit
+from gitpush.refs import current_branch, find_git_dir
+from gitpush.staging import (commit_pathspecs, read_pathspecs, stage_changes, stage_pathspecs, staged_in_scope,
+                             staging_mode, unmatched_pathspecs)
+from gitpush.state import RepoState
+
+# Installer and repository-creation helpers live in their own modules and are only
+# imported when a command needs them; they stay reachable as gitpush.cli.<name>.
+_LAZY_ATTRIBUTES = {
+    "gitpush.installer": (
+        "check_gh_installed", "install_gh_cli", "install_gh_cli_windows", "try_winget_install",
+        "try_scoop_install", "try_choco_install", "try_direct_msi_install", "try_direct_zip_install",
+        "try_direct_tarball_install", "download_asset", "install_gh_cli_mac", "install_gh_cli_linux", "get_github_release_info", "download_file",
+        "add_to_path", "verify_gh_installation", "check_and_install_gh",
+    ),
+    "gitpush.newrepo": (
+        "gh_authenticated", "authenticate_with_gh", "initialize_git_repository",
+        "create_initial_commit", "create_with_gh_cli", "prepare_first_push", "api_authenticated", "create_with_api",
+    ),
+}
+
+
+def __getattr__(name):
+    for module, names in _LAZY_ATTRIBUTES.items():
+        if name in names:
+            return getattr(importlib.import_module(module), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # --- Core Tool Functions ---
 
-def gh_authenticated() -> bool:
-    """
-    Check if user is authenticated with github.com using the recommended gh command.
-    This is the most reliable way to check, as it uses the exit code, not text parsing.
-    """
-    # `gh auth status -h github.com` exits with 0 if logged in to that host, 1 otherwise.
-    try:
-        subprocess.run(
-            ["gh", "auth", "status", "-h", "github.com"],
-            check=True,
-            capture_output=True  # Suppress command output from user's terminal
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # CalledProcessError means exit code != 0 (not logged in).
-        # FileNotFoundError means 'gh' is not installed.
-        return False
-
-
-def is_local_ahead() -> bool:
-    try:
-        result = subprocess.run(
-            ["git", "rev-list", "--left-right", "--count", "origin/main...HEAD"],
-            capture_output=True, text=True, check=True
-        )
-        behind_ahead = result.stdout.strip().split()
-        if len(behind_ahead) == 2:
-            behind, ahead = map(int, behind_ahead)
-            return ahead > 0
-        return False
-    except subprocess.CalledProcessError:
-        return False
-
-
-def authenticate_with_gh() -> bool:
-    """
-    Authenticate user with GitHub CLI, ensuring correct permissions for creating repos.
-    """
-    print("\n🔑 GitHub authentication required.")
-    print("The tool will use the GitHub CLI (gh) to open a browser for secure login.")
-    print("You may be asked to grant permissions for this tool to create repositories.")
-    
+def standard_git_push(commit_message, branch, remote, force=False, tags=False, state: Optional[RepoState] = None, staging="all",
+                      max_object_size: Optional[str] = None, mirrors: Sequence[str] = (), mirror_policy="best-effort",
+                      pathspecs: Sequence[str] = ()):
+    """Handle standard git push operations. With `pathspecs`, only changes matching them are staged and committed."""
+    # On a detached HEAD there is no branch to push; git explains what to do instead
+    branch = branch or current_branch()
+    target = branch or "HEAD"
     try:
-        # We explicitly request the 'repo' scope to ensure we can create repositories.
-        # `gh` is smart and will just verify if the scope already exists on the token.
-        subprocess.run(
-            ["gh", "auth", "login", "--web", "-h", "github.com", "-s", "repo"], 
-            check=True
-        )
-        return True
-    except subprocess.CalledProcessError:
-        print("❌ Authentication failed. Please try running 'gh auth login -s repo' manually.", file=sys.stderr)
-        return False
-
-def initialize_git_repository():
-    """Initialize git repository if not already initialized"""
-    if os.path.exists(".git"):
-        return False
-        
-    print("🛠 Initializing git repository")
-    try:
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "branch", "-M", "main"], check=True, capture_output=True)
-        
-        if not os.path.exists(".gitignore"):
-            with open(".gitignore", "w") as f:
-                f.write("""# Python
-__pycache__/
-*.py[cod]
-*.so
-.Python
-env/
-venv/
-.env
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-
-# System
-.DS_Store
-Thumbs.db
-
-# Project specific
-*.log
-*.tmp
-*.bak
-""")
-            print("📁 Created .gitignore file")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to initialize Git repository: {e.stderr.decode(errors='ignore').strip()}", file=sys.stderr)
-        return False
-
-def create_initial_commit(commit_message="Initial commit"):
-    """Create initial commit if no commits exist"""
-    try:
-        result = subprocess.run(["git", "rev-list", "--count", "HEAD"], capture_output=True, text=True)
-        commit_count = int(result.stdout.strip()) if result.stdout.strip().isdigit() else 0
-        
-        if commit_count == 0:
-            print("📦 Creating initial commit")
-            subprocess.run(["git", "add", "."], check=True)
-            subprocess.run(["git", "commit", "-m", commit_message], check=True)
-            return True
-        return False
-    except subprocess.CalledProcessError as e:
-        error_output = e.stderr.decode(errors='ignore').strip()
-        if "nothing to commit" in error_output:
-             print(f"❌ Failed to create initial commit: No files found to commit.", file=sys.stderr)
-             print("➡️  Add some files to your project directory before creating a repository.", file=sys.stderr)
-        else:
-             print(f"❌ Failed to create initial commit: {error_output}", file=sys.stderr)
-        return False
+        # With a snapshot we already know whether there is anything to stage or commit
+        has_changes = state is None or state.dirty
+
+        if has_changes and pathspecs:
+            unmatched = unmatched_pathspecs(pathspecs)
+            for pathspec in unmatched:
+                print(f"⚠️ Pathspec '{pathspec}' matched no changes; leaving it out.", file=sys.stderr)
+            if unmatched:
+                pathspecs = [p for p in pathspecs if p not in unmatched]
+                has_changes = bool(pathspecs)
+
+        if has_changes:
+            staged = stage_changes(state) if staging == "changed" and state is not None else None
+            if staged is not None:
+                print(f"📂 Staged {staged.staged} changed paths ({staged.examined} reported by git status).")
+            elif pathspecs:
+                stage_pathspecs(pathspecs)
+            else:
+                trace.run(["git", "add", "."], check=True)
 
-def create_with_gh_cli(repo_name, private=False, description="", commit_message="Initial commit"):
-    """Create and push to new repository using GitHub CLI"""
-    try:
-        if not os.path.exists(".git"):
-            if not initialize_git_repository():
-                return False
-        
-        if not create_initial_commit(commit_message):
-            if subprocess.run(["git", "status"], capture_output=True).returncode != 0:
-                 return False
-            print("ℹ️ Using existing commits")
-
-        private_flag = "--private" if private else "--public"
-        cmd = ["gh", "repo", "create", repo_name, private_flag, "--source=.", "--remote=origin", "--push"]
-        if description: cmd.extend(["--description", description])
-        
-        print("🚀 Creating repository and pushing code...")
-        process = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-        repo_url = process.stderr.strip()
-        print(f"✅ Successfully created repository: {repo_url}")
-        return True
-    except subprocess.CalledProcessError as e:
-        error_message = e.stderr.strip()
-        if "already exists" in error_message:
-            print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
-            print("➡️  Please choose a different repository name.", file=sys.stderr)
-        else:
-            print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"❌ An unexpected error occurred: {str(e)}", file=sys.stderr)
-        return False
+        scope = f" in scope ({', '.join(pathspecs)})" if pathspecs else ""
+        if commit_message and has_changes and pathspecs:
+            # Changes staged outside the pathspecs stay out of the commit
+            touched = staged_in_scope(pathspecs)
+            has_changes = bool(touched)
+            if touched:
+                print(f"📂 {len(touched)} files changed{scope}.")
 
-def standard_git_push(commit_message, branch, remote, force=False, tags=False):
-    """Handle standard git push operations"""
-    try:
-        subprocess.run(["git", "add", "."], check=True)
-        
-        if commit_message:
+        if commit_message and has_changes:
             print(f"📦 Committing with message: '{commit_message}'")
-            subprocess.run(["git", "commit", "-m", commit_message, "--allow-empty-message"], check=True)
+            if pathspecs:
+                commit_pathspecs(commit_message, pathspecs)
+            else:
+                trace.run(["git", "commit", "-m", commit_message, "--allow-empty-message"], check=True)
+            if state is not None:
+                state.record_commit()
+        elif commit_message:
+            print(f"ℹ️ No changes to commit{scope}.")
         else:
             print("ℹ️ No commit message provided. Pushing only staged changes.")
+
+        if mirrors:
+            from gitpush.mirror import push_to_remotes
+
+            # The mirrors may lag behind `remote`, so there is no up-to-date shortcut here
+            if force:
+                print("⚠️ Using safe force push (--force-with-lease).")
+            return push_to_remotes([remote, *mirrors], target,
+                                   force, tags, mirror_policy, size_limit(max_object_size))
+
+        if state is not None and branch and not (force or tags):
+            behind_ahead = state.ahead_behind(remote, branch)
+            if behind_ahead is not None and behind_ahead[1] == 0:
+                print("✅ Everything up-to-date. Nothing to push.")
+                return True
         
-        if is_local_ahead():
-            push_cmd = ["git", "push"]
-        else:
-            push_cmd = ["git", "push", "origin", "main"]
+        push_cmd = ["git", "push", remote, target]
 
         if force:
             push_cmd.append("--force-with-lease")
             print("⚠️ Using safe force push (--force-with-lease).")
         if tags:
             push_cmd.append("--tags")
-        if remote and branch:
-            push_cmd.extend([remote, branch])
+
+        # Objects reachable from what we push but not from the remote's tracking refs would be uploaded
+        revs = [target] + (["--tags"] if tags else [])
+        if not check_push_size(revs, [f"--remotes={remote}"], size_limit(max_object_size)):
+            return False
         
-        print(f"🚀 Executing: {' '.join(push_cmd)}")
-        subprocess.run(push_cmd, check=True)
+        # Transient network errors are retried inside retry.run(); a rejected push is rebased
+        # and only the push is repeated, never the staging and commit above
+        rebases = 0
+        while True:
+            print(f"🚀 Executing: {' '.join(push_cmd)}")
+            try:
+                retry.run([*push_cmd[:2], "--progress", *push_cmd[2:]], check=True, progress=True)
+                break
+            except subprocess.CalledProcessError as e:
+                if force or retry.classify(e.stderr) != "rejected" or rebases >= max(1, retry.policy().retries):
+                    raise
+            rebases += 1
+            print("\n❗ Detected non-fast-forward issue. Attempting rebase...")
+            if not branch or not attempt_rebase(remote, branch):
+                print("❌ Rebase failed. Please resolve conflicts manually and re-run the push.")
+                return False
+            print("🔁 Retrying push after rebase...")
+
         print("✅ Successfully pushed changes.")
         return True
 
@@ -1183,107 +142,92 @@ def standard_git_push(commit_message, branch, remote, force=False, tags=False):
             print("ℹ️ No changes to commit. Nothing to do.")
             return True
 
-        if "non-fast-forward" in error_output.lower():
-            print("\n❗ Detected non-fast-forward issue. Attempting rebase...")
-            if attempt_rebase(remote, branch):
-                print("🔁 Retrying push after rebase...")
-                return standard_git_push(commit_message, branch, remote, force, tags)
-            else:
-                print("❌ Rebase failed. Please resolve conflicts manually and re-run the push.")
-                return False
-
         print(f"❌ Push failed: {error_output}", file=sys.stderr)
         return False
 
 
 
-def has_incoming_changes(remote: str = "origin", branch: str = "main") -> bool:
-    try:
-        subprocess.run(["git", "fetch", remote], check=True, capture_output=True)
-
-        result = subprocess.run(
-            ["git", "rev-list", "--left-right", "--count", f"{remote}/{branch}...{branch}"],
-            check=True, capture_output=True, text=True
-        )
-        behind_ahead = result.stdout.strip().split()
-        if len(behind_ahead) == 2:
-            behind, ahead = map(int, behind_ahead)
-            return behind > 0
-        return False
-    except subprocess.CalledProcessError:
-        return False
+def has_incoming_changes(remote: str = "origin", branch: str = "main", state: Optional[RepoState] = None) -> bool:
+    sync_status, behind, ahead = get_git_sync_status(remote, branch, state)
+    return behind > 0
 
 
 def pull_and_check_conflicts(remote: str = "origin", branch: str = "main") -> bool:
     print("🔄 Pulling latest changes before pushing...")
 
-    try:
-        result = subprocess.run(["git", "pull", remote, branch], capture_output=True, text=True)
+    # Only stdout is captured: stderr is relayed live, with the progress meters redrawn in place
+    result = retry.run(["git", "pull", "--progress", remote, branch], stdout=subprocess.PIPE, text=True, progress=True)
 
-        if "CONFLICT" in result.stdout or "CONFLICT" in result.stderr:
-            print("❗ Merge conflicts detected.")
-            return True
-        else:
-            print("✅ Pulled successfully. No conflicts.")
-            return False
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Pull failed: {e.stderr or str(e)}", file=sys.stderr)
+    if "CONFLICT" in result.stdout or "CONFLICT" in result.stderr:
+        print("❗ Merge conflicts detected.")
         return True
+    elif result.returncode != 0:
+        print(f"❌ Pull failed (exit {result.returncode}).", file=sys.stderr)
+        return True
+    else:
+        print("✅ Pulled successfully. No conflicts.")
+        return False
+
 
 
+def show_merge_conflict_details(as_json: bool = False) -> int:
+    """Print a report of conflicted files and their conflict hunks. Returns the number of conflicted files."""
+    from gitpush.conflicts import conflicted_files, format_report, scan_conflicts
 
-def show_merge_conflict_details():
-    print("\n🔍 Merge Conflict Report:\n")
+    if not as_json:
+        print("\n🔍 Merge Conflict Report:\n")
 
     try:
-        result = subprocess.run(["git", "diff", "--name-only", "--diff-filter=U"], capture_output=True, text=True, check=True)
-        conflicted_files = result.stdout.strip().splitlines()
+        paths = conflicted_files()
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Could not retrieve conflicted files: {str(e)}", file=sys.stderr)
+        return 0
 
-        if not conflicted_files:
-            print("✅ No merge conflicts found.")
-            return
+    with trace.span("conflict scan", files=len(paths)):
+        reports = scan_conflicts(paths)
 
-        for file in conflicted_files:
-            print(f"📄 File: {file}")
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    for i, line in enumerate(lines):
-                        if line.startswith("<<<<<<<") or line.startswith("=======") or line.startswith(">>>>>>>"):
-                            marker = line.strip()
-                            print(f"   ⚠️  Conflict Marker ({marker}) at line {i + 1}")
-            except Exception as e:
-                print(f"   ❌ Could not read file {file}: {str(e)}")
+    if as_json:
+        import json
 
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Could not retrieve conflicted files: {str(e)}")
+        print(json.dumps({"conflicted_files": len(reports), "files": [r.as_dict() for r in reports]}, indent=2))
+    elif not reports:
+        print("✅ No merge conflicts found.")
+    else:
+        print(format_report(reports))
+    return len(reports)
 
 
 def attempt_rebase(remote: str, branch: str) -> bool:
     print("🔁 Attempting: git pull --rebase")
     try:
-        subprocess.run(["git", "pull", "--rebase", remote, branch], check=True)
+        retry.run(["git", "pull", "--rebase", "--progress", remote, branch], check=True, progress=True)
         print("✅ Rebase completed successfully.")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ Rebase failed: {e.stderr.decode(errors='ignore') if e.stderr else str(e)}")
+        # git's own messages were already relayed while it ran
+        print(f"❌ Rebase failed (exit {e.returncode}).", file=sys.stderr)
         show_merge_conflict_details()
         return False
 
 
-def get_git_sync_status(remote: str = "origin", branch: str = "main") -> tuple[str, int, int]:
+def get_git_sync_status(remote: str = "origin", branch: str = "main", state: Optional[RepoState] = None) -> tuple[str, int, int]:
     """
     Returns a tuple (status, behind, ahead) where status is one of:
-    'ahead', 'behind', 'diverged', 'synced'
+    'ahead', 'behind', 'diverged', 'synced' ('unknown' if it cannot be determined).
+    A snapshot already fetched from `remote` is reused; otherwise `branch` is fetched from it first.
+    A failed fetch is not repeated: the status is 'unknown' and the error is in `state.fetch_error`.
     """
-    try:
-        subprocess.run(["git", "fetch", remote], check=True, capture_output=True)
-        result = subprocess.run(
-            ["git", "rev-list", "--left-right", "--count", f"{remote}/{branch}...{branch}"],
-            capture_output=True, text=True, check=True
-        )
-        behind_str, ahead_str = result.stdout.strip().split()
-        behind, ahead = int(behind_str), int(ahead_str)
+    if state is None:
+        state = RepoState.load(fetch_from=remote, branch=branch)
+    elif (state.fetch_attempt is None or state.fetch_attempt[0] != remote
+          or state.fetch_attempt[1] not in (None, branch)):
+        state.refresh(fetch_from=remote, branch=branch)
+
+    behind_ahead = state.ahead_behind(remote, branch) if state and state.fetched_from == remote else None
+    if behind_ahead is None:
+        return "unknown", 0, 0
+    else:
+        behind, ahead = behind_ahead
 
         if behind > 0 and ahead > 0:
             return "diverged", behind, ahead
@@ -1293,13 +237,183 @@ def get_git_sync_status(remote: str = "origin", branch: str = "main") -> tuple[s
             return "behind", behind, ahead
         else:
             return "synced", behind, ahead
+
+
+def sync_and_push(commit_message, branch, remote, force=False, tags=False, staging=None, max_object_size=None,
+                  mirrors: Sequence[str] = (), mirror_policy="best-effort", maintenance=None, pathspecs: Sequence[str] = ()) -> bool:
+    """Bring the branch in sync with the remote (pull or rebase as needed), then push to it and any mirrors"""
+    from gitpush.maintenance import after_push, before_push, maintenance_mode
+
+    # Cheap object-store check first, so a foreground repack already speeds up the status and rev-list calls
+    git_dir = find_git_dir()
+    before_push(git_dir, maintenance_mode(maintenance, git_dir))
+
+    state = RepoState.load(fetch_from=remote, branch=branch, pathspecs=pathspecs)
+    if state is None:
+        print("❌ Not a git repository. Run 'gitpush --init' first.", file=sys.stderr)
+        return False
+    branch = branch or state.branch
+    if not branch:
+        print("❌ HEAD is detached. Check out a branch, or name the branch to push to.", file=sys.stderr)
+        return False
+
+    sync_status, behind, ahead = get_git_sync_status(remote, branch, state)
+    if state.fetch_error is not None:
+        # Without the remote's tip, "up to date" or "ahead" would only describe a stale tracking ref
+        print(f"❌ Could not fetch from {remote}:\n{state.fetch_error}", file=sys.stderr)
+        return False
+    print(f"\n📊 Git status: {sync_status.upper()} (Behind: {behind}, Ahead: {ahead})")
+
+    if sync_status == "behind":
+        print("🔄 Your branch is behind remote. Pulling latest changes...")
+        if pull_and_check_conflicts(remote, branch):
+            show_merge_conflict_details()
+            print("\n❌ Resolve conflicts before pushing.")
+            return False
+        state.refresh()
+
+    elif sync_status == "diverged":
+        print("⚠️ Your branch has diverged from remote. Rebase recommended.")
+        if attempt_rebase(remote, branch):
+            print("✅ Rebase done. Proceeding to push...")
+            state.refresh()
+        else:
+            print("❌ Rebase failed. Please resolve manually.")
+            return False
+
+    pushed = standard_git_push(commit_message, branch, remote, force, tags, state, staging_mode(staging), max_object_size,
+                               mirrors, mirror_policy, pathspecs)
+    if pushed:
+        after_push(git_dir)
+    return pushed
+
+
+def plan_push(commit_message, branch, remote, force=False, tags=False, staging=None, max_object_size=None,
+              mirrors: Sequence[str] = (), as_json=False, pathspecs: Sequence[str] = ()) -> bool:
+    """
+    Print the steps sync_and_push would take and estimate the upload, without pulling, committing
+    or pushing (only the fetch of the sync check runs). Returns False if the push would be blocked.
+    """
+    import shlex
+    from gitpush.guard import find_large_objects, format_size
+    from gitpush.plan import estimate_uncommitted, estimate_upload
+    from gitpush.refs import work_tree_root
+
+    state = RepoState.load(fetch_from=remote, branch=branch, pathspecs=pathspecs)
+    if state is None:
+        print("❌ Not a git repository. Run 'gitpush --init' first.", file=sys.stderr)
+        return False
+    branch = branch or state.branch
+    if not branch:
+        print("❌ HEAD is detached. Check out a branch, or name the branch to push to.", file=sys.stderr)
+        return False
+    sync_status, behind, ahead = get_git_sync_status(remote, branch, state)
+    if state.fetch_error is not None:
+        print(f"❌ Could not fetch from {remote}:\n{state.fetch_error}", file=sys.stderr)
+        return False
+
+    steps = []
+    if sync_status == "behind":
+        steps.append(f"git pull {remote} {branch}")
+    elif sync_status == "diverged":
+        steps.append(f"git pull --rebase {remote} {branch}")
+    will_commit = bool(commit_message and state.dirty)
+    if will_commit:
+        if staging_mode(staging) == "changed":
+            steps.append(f"git add ({len(state.unstaged_paths)} changed paths)")
+        elif pathspecs:
+            steps.append(f"git add --all -- {' '.join(shlex.quote(p) for p in pathspecs)}")
+        else:
+            steps.append("git add .")
+        steps.append(f"git commit -m {shlex.quote(commit_message)}"
+                     + (f" -- {' '.join(shlex.quote(p) for p in pathspecs)}" if pathspecs else ""))
+
+    will_push = will_commit or force or tags or bool(mirrors) or sync_status == "unknown" or ahead > 0
+    if will_push:
+        from gitpush.mirror import push_command
+
+        for target in [remote, *mirrors]:
+            steps.append(" ".join(shlex.quote(word) for word in push_command(target, branch, force, tags, False)))
+
+    revs = [branch] + (["--tags"] if tags else [])
+    exclude = [f"--remotes={remote}"]
+    try:
+        committed = estimate_upload(revs, exclude) if will_push else None
+        limit = size_limit(max_object_size)
+        large = find_large_objects(revs, exclude, limit) if will_push and limit > 0 else []
     except subprocess.CalledProcessError:
-        return "unknown", 0, 0
+        committed, large = None, []   # no commits yet, or the branch does not exist locally
+    root = work_tree_root()
+    pending = estimate_uncommitted(root, state.unstaged_paths, state.staged > 0, pathspecs) if will_commit and root else None
+
+    if as_json:
+        import json
+
+        print(json.dumps({
+            "status": sync_status, "behind": behind, "ahead": ahead, "steps": steps,
+            "commits": committed.commits if committed else None,
+            "objects": committed.objects if committed else None,
+            "pack_bytes": committed.size if committed else None,
+            "raw_bytes": committed.raw_size if committed else None,
+            "uncommitted_files": pending.files if pending else 0,
+            "uncommitted_pack_bytes": pending.size if pending else 0,
+            "uncommitted_raw_bytes": pending.raw_size if pending else 0,
+            "blocked_by": [{"path": obj.path, "bytes": obj.size} for obj in large],
+        }, indent=2))
+        return not large
+
+    print("📋 Push plan (dry run: nothing is pulled, committed or pushed)")
+    print(f"📊 Git status: {sync_status.upper()} (Behind: {behind}, Ahead: {ahead})")
+    if not steps:
+        print("✅ Everything up-to-date. Nothing to push.")
+        return True
+    for number, step in enumerate(steps, 1):
+        print(f"   {number}. {step}")
+    if committed is not None:
+        print(f"📦 Estimated upload: {committed.commits} commits, {committed.objects} objects, "
+              f"~{format_size(committed.size)} compressed ({format_size(committed.raw_size)} uncompressed)")
+    if pending is not None:
+        print(f"   plus the new commit: {pending.files} files, ~{format_size(pending.size)} compressed "
+              f"({format_size(pending.raw_size)} uncompressed)")
+    for obj in large:
+        print(f"❌ Would be blocked: {obj.path} is {format_size(obj.size)} (limit {format_size(limit)})")
+    return not large
 
 
 # --- Main Entry Point ---
 
-def run():
+def _ensure_gh(gh_cache_ttl: Optional[float]) -> bool:
+    """Make sure gh is installed and logged in, offering to install it and running the login flow if needed"""
+    from gitpush.ghstatus import check_gh_installed, default_ttl
+    from gitpush.newrepo import authenticate_with_gh, gh_authenticated
+
+    gh_cache_ttl = gh_cache_ttl if gh_cache_ttl is not None else default_ttl()
+
+    # Check for gh CLI and prompt for installation if missing
+    if not check_gh_installed(gh_cache_ttl):
+        from gitpush.installer import check_and_install_gh
+
+        if not check_and_install_gh():
+            return False
+
+    # Check for authentication status reliably.
+    # If not authenticated, run the login flow.
+    return gh_authenticated(gh_cache_ttl) or authenticate_with_gh()
+
+
+def _remote_list(args) -> List[str]:
+    """--remotes, else the remote argument, split on commas: the primary remote first, then any mirrors"""
+    remotes = (r.strip() for r in (args.remotes or args.remote).split(","))
+    return list(dict.fromkeys(r for r in remotes if r)) or ["origin"]
+
+
+def run(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        from gitpush.daemon import serve_command
+
+        sys.exit(serve_command(argv[1:]))
+
     parser = argparse.ArgumentParser(
         description="🚀 Supercharged Git push tool with GitHub repo creation",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1307,82 +421,182 @@ def run():
   Standard push:         gitpush "My new feature"
   Create new repo:       gitpush "Initial commit" --new-repo my-awesome-project
   Private repository:    gitpush "Initial commit" --new-repo my-secret-project --private
+  Without gh:            GH_TOKEN=... gitpush "Initial commit" --new-repo my-project --api
   Force push (safe):     gitpush "Rebased feature" --force
   Initialize only:       gitpush --init
+  Push to mirrors:       gitpush "Release" main --remotes origin,mirror-a,mirror-b
+  Push many repos:       gitpush "Nightly sync" --workspace ~/checkouts --jobs 16
+  Auto-push changes:     gitpush "Regenerate docs" --watch --debounce 5 --min-push-interval 120
+  Timing breakdown:      gitpush "Fix" --profile gitpush-trace.json
+  Daemon for bots:       gitpush serve    (later runs are forwarded to it; commit message "serve": gitpush -- serve)
 """
     )
     parser.add_argument("commit", nargs="?", help="Commit message (optional if just pushing staged changes).")
     parser.add_argument("branch", nargs="?", default=None, help="Branch name (defaults to current branch).")
-    parser.add_argument("remote", nargs="?", default="origin", help="Remote name (default: origin).")
+    parser.add_argument("remote", nargs="?", default="origin", help="Remote name, or a comma-separated list of remotes (default: origin).")
     parser.add_argument("--force", action="store_true", help="Force push with --force-with-lease.")
+    parser.add_argument("--plan", "--dry-run", dest="plan", action="store_true", help="Show the pull/commit/push steps and estimate the upload size without changing anything.")
     parser.add_argument("--tags", action="store_true", help="Push all tags.")
     parser.add_argument("--init", action="store_true", help="Initialize a new Git repository and exit.")
     parser.add_argument("--new-repo", metavar="REPO_NAME", help="Create a new GitHub repository with the given name.")
+    parser.add_argument("--new-repo-manifest", metavar="FILE", help="Create every repository listed in a CSV manifest (name,visibility,description,source), resuming from FILE.results.json.")
+    parser.add_argument("--create-rate", type=float, default=20.0, metavar="PER_MINUTE", help="With --new-repo-manifest, start at most this many creations per minute (default: 20).")
     parser.add_argument("--private", action="store_true", help="Make the new repository private.")
     parser.add_argument("--description", help="Description for the new repository.")
+    parser.add_argument("--lfs-threshold", metavar="SIZE", help="With --init or --new-repo, track files larger than SIZE (default: 10M; 'off' disables) and known binary formats such as model weights with Git LFS before the first commit.")
+    parser.add_argument("--api", action="store_true", help="Create repositories through the GitHub REST API instead of running gh (token from $GH_TOKEN, $GITHUB_TOKEN or gh's login).")
+    parser.add_argument("--stage", choices=("all", "changed"), help="'changed' stages only the paths git status reports instead of 'git add .' (default: the repo's gitpush.staging setting, else 'all').")
+    parser.add_argument("--path", action="append", default=[], metavar="PATHSPEC", help="Only stage and commit changes matching PATHSPEC (repeatable), e.g. one subproject of a monorepo.")
+    parser.add_argument("--paths-from", metavar="FILE", help="Read more --path pathspecs from FILE, one per line ('-' for stdin).")
+    parser.add_argument("--max-object-size", metavar="SIZE", help="Refuse to push files larger than SIZE, e.g. 50M (default: the repo's gitpush.maxObjectSize, else 100M; 'off' disables).")
+    parser.add_argument("--remotes", metavar="A,B,C", help="Push to all of these remotes at once; the first one is the one pulled from and rebased onto.")
+    parser.add_argument("--mirror-policy", choices=("best-effort", "all-or-nothing"), default="best-effort", help="With several remotes: push everywhere possible, or dry-run all first and push nowhere if any would reject (default: best-effort).")
+    parser.add_argument("--maintenance", choices=("background", "foreground", "off"), help="When loose objects or packs pile up or the commit-graph is missing, repack and write the commit-graph in the background, before the push, or never (default: the repo's gitpush.maintenance setting, else background).")
+    parser.add_argument("--retries", type=int, metavar="N", help="Retry transient network failures of fetch, pull and push up to N times with backoff (default: 2, or $GITPUSH_RETRIES).")
+    parser.add_argument("--watch", action="store_true", help="Keep running: commit and push whenever files change (uses the commit message, default 'wip').")
+    parser.add_argument("--debounce", type=float, default=2.0, metavar="SECONDS", help="With --watch, wait this long after the last change before pushing (default: 2).")
+    parser.add_argument("--min-push-interval", type=float, default=30.0, metavar="SECONDS", help="With --watch, push at most once per this many seconds (default: 30).")
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll the working tree instead of using inotify.")
+    parser.add_argument("--workspace", metavar="DIR_OR_MANIFEST", help="Push every repository under DIR (or listed in a manifest file) in parallel.")
+    parser.add_argument("--jobs", type=int, default=8, help="Maximum number of repositories pushed at once in --workspace mode (default: 8).")
+    parser.add_argument("--conflicts", action="store_true", help="Report merge conflicts in the working tree and exit (non-zero if any).")
+    parser.add_argument("--json", action="store_true", help="With --conflicts or --plan, print the report as JSON.")
+    parser.add_argument("--profile", metavar="FILE", help="Write a Chrome trace of every git/gh call to FILE and print a timing summary.")
+    parser.add_argument("--gh-cache-ttl", type=float, metavar="SECONDS", help="How long successful gh install/auth checks are reused (default: 600, or $GITPUSH_GH_CACHE_TTL).")
+    parser.add_argument("--offline", action="store_true", help="Install gh from cached GitHub release information without contacting the API.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write any gitpush caches.")
+    parser.add_argument("--no-daemon", action="store_true", help="Run in this process even if a 'gitpush serve' daemon is running (or set $GITPUSH_NO_DAEMON).")
+
+    args = parser.parse_args(argv)
+
+    # Repository creation may prompt (gh install, gh auth login), so only the non-interactive commands are forwarded
+    # --watch never finishes, so it would hold the daemon's lock on the repository forever
+    # --paths-from - reads our stdin, which the daemon does not see
+    if not (args.no_daemon or args.new_repo or args.new_repo_manifest or args.init or args.watch
+            or args.paths_from == "-"):
+        from gitpush.daemon import forward
+
+        forwarded = forward(argv)
+        if forwarded is not None:
+            sys.exit(forwarded)
+
+    if args.profile:
+        atexit.register(trace.write_profile, args.profile)
+    if args.no_cache:
+        cache.disable()
+    if args.retries is not None:
+        retry.configure(args.retries)
+    if args.offline:
+        from gitpush.releases import go_offline
+
+        go_offline()
 
-    args = parser.parse_args()
-    
-    target_branch = args.branch
-    if not target_branch:
-        try:
-            branch_result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True, check=True)
-            target_branch = branch_result.stdout.strip()
-        except subprocess.CalledProcessError:
-            target_branch = "main"
-
-    if args.new_repo:
-        # Check for gh CLI and prompt for installation if missing
-        if not check_and_install_gh():
+    try:
+        pathspecs = read_pathspecs(args.path, args.paths_from)
+    except OSError as e:
+        print(f"❌ Cannot read --paths-from file: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.conflicts:
+        if show_merge_conflict_details(as_json=args.json):
+            sys.exit(1)
+
+    elif args.workspace:
+        from gitpush.workspace import run_workspace
+
+        child_args = []
+        if args.force: child_args.append("--force")
+        if args.plan: child_args.extend(["--plan"] + (["--json"] if args.json else []))
+        if args.tags: child_args.append("--tags")
+        if args.stage: child_args.extend(["--stage", args.stage])
+        for pathspec in pathspecs: child_args.extend(["--path", pathspec])
+        if args.max_object_size: child_args.extend(["--max-object-size", args.max_object_size])
+        if args.retries is not None: child_args.extend(["--retries", str(args.retries)])
+        if args.maintenance: child_args.extend(["--maintenance", args.maintenance])
+        if args.remotes: child_args.extend(["--remotes", args.remotes, "--mirror-policy", args.mirror_policy])
+        if args.commit is not None:
+            child_args.extend(["--", args.commit])
+            if args.branch: child_args.extend([args.branch, args.remote])
+
+        if not run_workspace(args.workspace, child_args, jobs=args.jobs):
+            sys.exit(1)
+
+    elif args.watch:
+        from gitpush.watch import watch_and_push
+
+        remotes = _remote_list(args)
+
+        def push(state):
+            return standard_git_push(args.commit or "wip", args.branch or state.branch, remotes[0],
+                                     args.force, args.tags, state, staging_mode(args.stage), args.max_object_size,
+                                     remotes[1:], args.mirror_policy, pathspecs)
+
+        if not watch_and_push(push, args.debounce, args.min_push_interval, args.poll, pathspecs):
+            sys.exit(1)
+
+    elif args.new_repo_manifest:
+        from gitpush.bulk import create_from_manifest
+        from gitpush.newrepo import api_authenticated
+
+        if not (api_authenticated() if args.api else _ensure_gh(args.gh_cache_ttl)):
+            sys.exit(1)
+
+        # The children reuse the gh checks made above through the status cache
+        child_args = ["--api"] if args.api else []
+        if args.max_object_size: child_args.extend(["--max-object-size", args.max_object_size])
+        if args.lfs_threshold: child_args.extend(["--lfs-threshold", args.lfs_threshold])
+        if args.commit is not None: child_args.extend(["--", args.commit])
+
+        if not create_from_manifest(args.new_repo_manifest, child_args, jobs=args.jobs, rate_per_minute=args.create_rate):
+            sys.exit(1)
+
+    elif args.new_repo:
+        from gitpush.newrepo import api_authenticated, create_with_api, create_with_gh_cli
+
+        if not (api_authenticated() if args.api else _ensure_gh(args.gh_cache_ttl)):
             sys.exit(1)
         
-        # Check for authentication status reliably.
-        if not gh_authenticated():
-            # If not authenticated, run the login flow.
-            if not authenticate_with_gh():
-                sys.exit(1)
-        
-        if not create_with_gh_cli(
+        if not (create_with_api if args.api else create_with_gh_cli)(
             args.new_repo,
             private=args.private,
             description=args.description or "",
-            commit_message=args.commit or "Initial commit"
+            commit_message=args.commit or "Initial commit",
+            max_object_size=args.max_object_size,
+            lfs_threshold=args.lfs_threshold
         ):
             sys.exit(1)
 
     elif args.init:
+        from gitpush.newrepo import initialize_git_repository
+
         if initialize_git_repository():
+             from gitpush.lfs import route_large_files
+
+             route_large_files(args.lfs_threshold)
              print("✅ Git repository initialized successfully.")
     
-    else:
-        sync_status, behind, ahead = get_git_sync_status(args.remote, target_branch)
-        print(f"\n📊 Git status: {sync_status.upper()} (Behind: {behind}, Ahead: {ahead})")
-
-        if sync_status == "behind":
-            print("🔄 Your branch is behind remote. Pulling latest changes...")
-            if pull_and_check_conflicts(args.remote, target_branch):
-                show_merge_conflict_details()
-                print("\n❌ Resolve conflicts before pushing.")
-                sys.exit(1)
-
-        elif sync_status == "diverged":
-            print("⚠️ Your branch has diverged from remote. Rebase recommended.")
-            if attempt_rebase(args.remote, target_branch):
-                print("✅ Rebase done. Proceeding to push...")
-            else:
-                print("❌ Rebase failed. Please resolve manually.")
-                sys.exit(1)
-
-
+    elif args.plan:
+        remotes = _remote_list(args)
+        if not plan_push(args.commit, args.branch, remotes[0], args.force, args.tags, args.stage,
+                         args.max_object_size, remotes[1:], as_json=args.json, pathspecs=pathspecs):
+            sys.exit(1)
 
-        if not standard_git_push(
+    else:
+        remotes = _remote_list(args)
+        if not sync_and_push(
             args.commit,
-            target_branch,
-            args.remote,
+            args.branch,
+            remotes[0],
             args.force,
-            args.tags
+            args.tags,
+            args.stage,
+            args.max_object_size,
+            remotes[1:],
+            args.mirror_policy,
+            args.maintenance,
+            pathspecs
         ):
             sys.exit(1)
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
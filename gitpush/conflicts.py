@@ -0,0 +1,168 @@
+"""
+Merge-conflict scanner.
+
+Conflicted files are memory-mapped and searched as bytes, so huge generated
+files and non-UTF-8 content are handled without decoding or reading them into
+memory line by line. Each conflict is reported as a hunk (start, optional base,
+middle and end marker lines) and files are scanned on a thread pool.
+"""
+
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from gitpush import trace
+from gitpush.refs import work_tree_root
+
+MARKER_LEN = 7
+BINARY_SNIFF_BYTES = 8000  # same heuristic git uses: a NUL byte in the first 8000 bytes
+_COUNT_CHUNK = 16 * 1024 * 1024
+
+
+class ConflictHunk(NamedTuple):
+    start: int                 # line of "<<<<<<<"
+    base: Optional[int]        # line of "|||||||" (diff3/zdiff3 style only)
+    middle: Optional[int]      # line of "======="
+    end: Optional[int]         # line of ">>>>>>>", None if the hunk is not terminated
+
+    @property
+    def line_count(self) -> Optional[int]:
+        return None if self.end is None else self.end - self.start + 1
+
+    def as_dict(self) -> dict:
+        return dict(self._asdict(), lines=self.line_count)
+
+
+class FileReport(NamedTuple):
+    path: str
+    kind: str                  # "text", "binary", "missing" or "unreadable"
+    size: int
+    hunks: List[ConflictHunk]
+    error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {"path": self.path, "kind": self.kind, "size": self.size,
+                "hunks": [h.as_dict() for h in self.hunks], "error": self.error}
+
+
+def conflicted_files() -> List[str]:
+    result = trace.run(["git", "diff", "--name-only", "--diff-filter=U", "-z"], capture_output=True, check=True)
+    return [p for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def _count_newlines(buf, start: int, end: int) -> int:
+    count = 0
+    while start < end:
+        stop = min(end, start + _COUNT_CHUNK)
+        count += buf[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def _is_marker(buf, pos: int, marker: bytes) -> bool:
+    """A marker counts only at the start of a line, followed by a space or the end of the line"""
+    if pos > 0 and buf[pos - 1:pos] != b"\n":
+        return False
+    after = buf[pos + MARKER_LEN:pos + MARKER_LEN + 1]
+    if marker == b"=======":
+        return after in (b"", b"\n", b"\r")
+    return after in (b"", b" ", b"\n", b"\r")
+
+
+def _find_marker(buf, marker: bytes, pos: int, limit: int) -> int:
+    while True:
+        pos = buf.find(marker, pos, limit)
+        if pos == -1 or _is_marker(buf, pos, marker):
+            return pos
+        pos += 1
+
+
+def find_hunks(buf) -> List[ConflictHunk]:
+    """Locate conflict hunks in a bytes-like buffer (bytes or mmap)"""
+    hunks = []
+    size = len(buf)
+    line, line_pos = 1, 0   # line number at byte offset line_pos
+
+    def line_of(pos: int) -> int:
+        nonlocal line, line_pos
+        line += _count_newlines(buf, line_pos, pos)
+        line_pos = pos
+        return line
+
+    pos = 0
+    while True:
+        start = _find_marker(buf, b"<<<<<<<", pos, size)
+        if start == -1:
+            return hunks
+        end = _find_marker(buf, b">>>>>>>", start + MARKER_LEN, size)
+        limit = size if end == -1 else end
+        # A new "<<<<<<<" before the closing marker means this hunk was never terminated
+        next_start = _find_marker(buf, b"<<<<<<<", start + MARKER_LEN, limit)
+        if next_start != -1:
+            limit, end = next_start, -1
+        middle = _find_marker(buf, b"=======", start + MARKER_LEN, limit)
+        base = _find_marker(buf, b"|||||||", start + MARKER_LEN, limit if middle == -1 else middle)
+
+        hunks.append(ConflictHunk(
+            line_of(start),
+            None if base == -1 else line_of(base),
+            None if middle == -1 else line_of(middle),
+            None if end == -1 else line_of(end),
+        ))
+        pos = limit if end == -1 else end + MARKER_LEN
+
+
+def scan_file(path: str, root: str = ".") -> FileReport:
+    """Scan one conflicted file; `path` is relative to the working tree `root`"""
+    try:
+        with open(os.path.join(root, path), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return FileReport(path, "text", 0, [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                if b"\0" in buf[:BINARY_SNIFF_BYTES]:
+                    # Git does not write markers into binary files; the whole file is the conflict
+                    return FileReport(path, "binary", size, [])
+                return FileReport(path, "text", size, find_hunks(buf))
+    except FileNotFoundError:
+        # modify/delete conflicts leave no file in the working tree
+        return FileReport(path, "missing", 0, [])
+    except (OSError, ValueError) as e:
+        return FileReport(path, "unreadable", 0, [], str(e))
+
+
+def scan_conflicts(paths: List[str], jobs: Optional[int] = None) -> List[FileReport]:
+    """Scan repository-relative paths on a thread pool, returning reports in the order of `paths`"""
+    root = work_tree_root() or "."
+    if len(paths) <= 1:
+        return [scan_file(p, root) for p in paths]
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(lambda p: scan_file(p, root), paths))
+
+
+def format_report(reports: List[FileReport]) -> str:
+    lines = []
+    for report in reports:
+        lines.append(f"📄 File: {report.path}")
+        if report.kind == "binary":
+            lines.append(f"   ⚠️  Binary conflict ({report.size} bytes): pick a side with "
+                         f"'git checkout --ours/--theirs -- {report.path}'")
+        elif report.kind == "missing":
+            lines.append("   ⚠️  Deleted on one side and modified on the other")
+        elif report.kind == "unreadable":
+            lines.append(f"   ❌ Could not read file: {report.error}")
+        elif not report.hunks:
+            lines.append("   ℹ️  No conflict markers left (mark it resolved with 'git add')")
+        for n, hunk in enumerate(report.hunks, 1):
+            if hunk.end is None:
+                lines.append(f"   ⚠️  Conflict {n}: starts at line {hunk.start} but is not terminated")
+                continue
+            ours_end = (hunk.base or hunk.middle or hunk.end) - 1
+            detail = f"ours {hunk.start + 1}-{ours_end}" if ours_end > hunk.start else "ours empty"
+            if hunk.middle is not None:
+                theirs = f"theirs {hunk.middle + 1}-{hunk.end - 1}" if hunk.end - 1 > hunk.middle else "theirs empty"
+                detail += f", {theirs}"
+            lines.append(f"   ⚠️  Conflict {n}: lines {hunk.start}-{hunk.end} ({hunk.line_count} lines; {detail})")
+    return "\n".join(lines)
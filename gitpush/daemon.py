@@ -0,0 +1,354 @@
+"""
+`gitpush serve`: a long-running daemon for bots that push many times an hour.
+
+The daemon listens on a Unix domain socket (mode 0600, in the user cache
+directory or at $GITPUSH_SOCKET). Each request is a JSON line carrying the
+argv, working directory and environment of a `gitpush` invocation. It runs in
+a child forked from the daemon, so interpreter startup, imports and the gh
+checks are already done, and its stdout, stderr and exit code are streamed
+back. Requests for the same repository are queued; different repositories
+run concurrently, up to --jobs at a time. Repository state (git status, refs)
+is still read fresh by every job, since it changes between pushes.
+
+When the socket exists, `gitpush` forwards non-interactive commands to the
+daemon and only falls back to running in-process if it cannot connect.
+"""
+
+import codecs
+import os
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from gitpush import cache, trace
+
+SOCKET_NAME = "daemon.sock"
+CONNECT_TIMEOUT = 2.0
+# Modules a job may need, imported once in the daemon so forked children start warm
+PRELOAD = (
+    "gitpush.aheadbehind", "gitpush.conflicts", "gitpush.guard", "gitpush.maintenance", "gitpush.mirror",
+    "gitpush.plan", "gitpush.progress", "gitpush.retry", "gitpush.staging",
+    "gitpush.workspace", "gitpush.newrepo", "gitpush.ghstatus", "json",
+)
+
+serving = False   # True inside the daemon and its job children, so they never forward to themselves
+
+
+def socket_path() -> str:
+    return os.environ.get("GITPUSH_SOCKET") or cache.cache_path(SOCKET_NAME)
+
+
+def _send(conn, message: dict):
+    import json
+
+    conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _connect(path: str):
+    import socket
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        return None
+    client.settimeout(None)
+    return client
+
+
+def _messages(conn):
+    """Yield the JSON messages of a newline-delimited stream until the peer closes it"""
+    import json
+
+    buffer = b""
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            return
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line.decode("utf-8"))
+
+
+def request(message: dict, path: Optional[str] = None) -> Optional[int]:
+    """
+    Send one request to the daemon, copying the job's output to our stdout/stderr.
+    Returns the exit code, or None if no daemon is listening.
+    """
+    path = path or socket_path()
+    if serving or not hasattr(os, "fork") or not os.path.exists(path):
+        return None
+    client = _connect(path)
+    if client is None:
+        return None
+    with client:
+        _send(client, message)
+        for reply in _messages(client):
+            if "stdout" in reply:
+                sys.stdout.write(reply["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in reply:
+                sys.stderr.write(reply["stderr"])
+                sys.stderr.flush()
+            elif "exit" in reply:
+                return reply["exit"]
+    print("❌ The gitpush daemon closed the connection before the job finished.", file=sys.stderr)
+    return 1
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run `gitpush argv` in the daemon as if it had been started here (None: run it locally)"""
+    if os.environ.get("GITPUSH_NO_DAEMON"):
+        return None
+    return request({"op": "run", "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)})
+
+
+# --- Daemon side ---
+
+class _Daemon:
+    def __init__(self, path: str, jobs: int):
+        self.path = path
+        self.slots = threading.BoundedSemaphore(max(1, jobs))
+        self.repo_locks = {}
+        self.lock = threading.Lock()
+        # Jobs are forked from handler threads; one at a time, so no child is forked while
+        # another job's pipes are being set up
+        self.fork_lock = threading.Lock()
+        self.started = time.time()
+        self.served = 0
+        self.active = {}   # repository -> pid of the running job
+        self.listener = None
+
+    def repo_lock(self, repo: str):
+        with self.lock:
+            return self.repo_locks.setdefault(repo, threading.Lock())
+
+    def status(self) -> dict:
+        with self.lock:
+            return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                    "served": self.served, "active": dict(self.active), "socket": self.path}
+
+    def handle(self, conn):
+        with conn:
+            try:
+                message = next(_messages(conn), None)
+                if not message:
+                    return
+                op = message.get("op")
+                if op == "status":
+                    _send(conn, {"status": self.status()})
+                    _send(conn, {"exit": 0})
+                elif op == "stop":
+                    _send(conn, {"exit": 0})
+                    self.stop()
+                elif op == "run":
+                    self.run_job(conn, message)
+                else:
+                    _send(conn, {"stderr": f"❌ Unknown request: {op!r}\n"})
+                    _send(conn, {"exit": 2})
+            except (OSError, ValueError):
+                pass   # the client went away or sent garbage; nothing to answer
+
+    def run_job(self, conn, message: dict):
+        from gitpush.refs import work_tree_root
+
+        cwd = message.get("cwd") or "/"
+        repo = work_tree_root(cwd) or os.path.abspath(cwd)
+        # Same repository: one job at a time, in arrival order as far as the lock allows
+        with self.repo_lock(repo), self.slots:
+            with self.lock:
+                self.served += 1
+            code = self.fork_job(conn, repo, message)
+        _send(conn, {"exit": code})
+
+    def fork_job(self, conn, repo: str, message: dict) -> int:
+        import selectors
+
+        with self.fork_lock:
+            out_read, out_write = os.pipe()
+            err_read, err_write = os.pipe()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                _run_child(message, out_write, err_write)   # never returns
+            os.close(out_write)
+            os.close(err_write)
+        with self.lock:
+            self.active[repo] = pid
+
+        selector = selectors.DefaultSelector()
+        selector.register(out_read, selectors.EVENT_READ, "stdout")
+        selector.register(err_read, selectors.EVENT_READ, "stderr")
+        # Incremental decoders, so a character split across two reads is not mangled
+        decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in ("stdout", "stderr")}
+        client_gone = False
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, 65536)
+                if not data:
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                text = decoders[key.data].decode(data, final=not data)
+                if text and not client_gone:
+                    try:
+                        _send(conn, {key.data: text})
+                    except OSError:
+                        client_gone = True   # let the job finish; a half-done push is worse
+        selector.close()
+
+        _, status = os.waitpid(pid, 0)
+        with self.lock:
+            self.active.pop(repo, None)
+        return os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status >> 8
+
+    def stop(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            try:
+                listener.shutdown(2)   # wakes up the accept() in serve_forever
+            except OSError:
+                pass
+            listener.close()
+
+    def serve_forever(self):
+        import socket
+
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self.listener.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen(64)
+        print(f"🛰  gitpush daemon {os.getpid()} listening on {self.path}", flush=True)
+        workers = []
+        try:
+            while self.listener is not None:
+                try:
+                    conn, _ = self.listener.accept()
+                except OSError:
+                    break   # stop() closed the listener
+                workers = [w for w in workers if w.is_alive()]
+                worker = threading.Thread(target=self.handle, args=(conn,))
+                worker.start()
+                workers.append(worker)
+        finally:
+            self.stop()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        # Jobs already running are allowed to finish
+        for worker in workers:
+            worker.join()
+        print("🛰  gitpush daemon stopped.", flush=True)
+
+
+def _max_fd() -> int:
+    try:
+        return os.sysconf("SC_OPEN_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 256
+
+
+def _run_child(message: dict, out_fd: int, err_fd: int):
+    """Forked job: become the requested `gitpush` invocation and exit with its status"""
+    import atexit
+
+    code = 1
+    try:
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        # Drop everything else inherited from the daemon: the listener, other clients' sockets and the
+        # pipes of jobs running in other threads (a write end kept open here would never let them see EOF)
+        os.closerange(3, _max_fd())
+        sys.stdout.reconfigure(line_buffering=True)
+        sys.stderr.reconfigure(line_buffering=True)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)   # jobs are non-interactive: prompts see end-of-file
+        os.environ.clear()
+        os.environ.update(message.get("env") or {})
+        # `serving` does not survive exec: gitpush processes the job starts must not forward back to us
+        os.environ["GITPUSH_NO_DAEMON"] = "1"
+        os.chdir(message.get("cwd") or "/")
+        sys.argv = ["gitpush", *message.get("argv", [])]
+        trace.reset()
+
+        from gitpush.cli import run
+        try:
+            run(message.get("argv", []))
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if not isinstance(e.code, (int, type(None))):
+                print(e.code, file=sys.stderr)
+        atexit._run_exitfuncs()   # --profile writes its report from an atexit hook
+    except BaseException as e:
+        print(f"❌ gitpush job failed: {e!r}", file=sys.stderr)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def serve_command(argv: List[str]) -> int:
+    """Entry point for `gitpush serve [--socket PATH] [--jobs N] [--status | --stop]`"""
+    import argparse
+    import importlib
+    import json
+    import signal
+    import socket
+
+    parser = argparse.ArgumentParser(prog="gitpush serve", description="Run gitpush as a daemon that bots send push requests to.")
+    parser.add_argument("--socket", metavar="PATH", help=f"Unix socket to listen on (default: $GITPUSH_SOCKET, else {socket_path()}).")
+    parser.add_argument("--jobs", type=int, default=8, help="Repositories pushed at the same time (default: 8).")
+    parser.add_argument("--status", action="store_true", help="Print the running daemon's status and exit.")
+    parser.add_argument("--stop", action="store_true", help="Ask the running daemon to shut down.")
+    args = parser.parse_args(argv)
+    path = args.socket or socket_path()
+
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        print("❌ gitpush serve needs Unix domain sockets and fork().", file=sys.stderr)
+        return 1
+
+    existing = _connect(path) if os.path.exists(path) else None
+    if args.status or args.stop:
+        if existing is None:
+            print(f"ℹ️ No gitpush daemon is listening on {path}.")
+            return 1
+        with existing:
+            _send(existing, {"op": "stop" if args.stop else "status"})
+            for reply in _messages(existing):
+                if "status" in reply:
+                    print(json.dumps(reply["status"], indent=2))
+        if args.stop:
+            print("🛑 Daemon stopped.")
+        return 0
+
+    if existing is not None:
+        existing.close()
+        print(f"❌ A gitpush daemon is already listening on {path}.", file=sys.stderr)
+        return 1
+    if os.path.exists(path):
+        os.remove(path)   # left behind by a daemon that did not shut down cleanly
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    global serving
+    serving = True
+    for module in PRELOAD:
+        importlib.import_module(module)
+    from gitpush.ghstatus import check_gh_installed, default_ttl
+
+    check_gh_installed(default_ttl())   # warms the on-disk gh status cache the jobs read
+
+    daemon = _Daemon(path, args.jobs)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: daemon.stop())
+    daemon.serve_forever()
+    return 0
@@ -0,0 +1,224 @@
+"""
+Resumable, checksum-verified downloads for the gh installer.
+
+Data is streamed in chunks into `<path>.part` files. When a connection drops,
+the next attempt resumes from the bytes already on disk with an HTTP Range
+request, falling back to a full restart if the server ignores ranges. Servers
+that advertise `Accept-Ranges: bytes` can be fetched over several connections
+at once, one byte range each; if one of them answers a range with the whole
+file after all, the download starts over on a single connection. The finished file is checked against a SHA-256
+(gh publishes `gh_<version>_checksums.txt` with every release) before it is
+moved into place.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from gitpush import retry, trace
+
+CHUNK_SIZE = 256 * 1024
+MIN_PART_SIZE = 4 * 1024 * 1024   # do not split files smaller than this per connection
+DEFAULT_CONNECTIONS = 4
+TIMEOUT = 30
+USER_AGENT = "gitpush"
+
+
+class DownloadError(Exception):
+    pass
+
+
+class RangesIgnored(DownloadError):
+    """The server answered a Range request for part of the file with something other than 206"""
+
+
+class _Progress:
+    """Single-line percentage shared by all connections of one download"""
+
+    def __init__(self, total: Optional[int], done: int = 0):
+        self.total = total
+        self.done = done
+        self._shown = -1
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.done += count
+            self._show()
+
+    def _show(self):
+        if self.total:
+            percent = min(100, self.done * 100 // self.total)
+            if percent != self._shown:
+                self._shown = percent
+                sys.stdout.write(f"\r      Downloading... {percent}%")
+                sys.stdout.flush()
+
+    def finish(self):
+        sys.stdout.write("\n" if self._shown == 100 else "\r      Downloading... 100%\n")
+        sys.stdout.flush()
+
+
+def _request(url: str, start: int = 0, end: Optional[int] = None, method: str = "GET"):
+    headers = {"User-Agent": USER_AGENT}
+    if start or end is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers, method=method), timeout=TIMEOUT)
+
+
+def probe(url: str) -> Tuple[Optional[int], bool]:
+    """(size, accepts byte ranges) from a HEAD request; (None, False) if the server does not say"""
+    try:
+        with _request(url, method="HEAD") as response:
+            length = response.headers.get("Content-Length")
+            ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return (int(length) if length and length.isdigit() else None), ranges
+    except (urllib.error.URLError, OSError, ValueError):
+        return None, False
+
+
+def _fetch_range(url: str, part_path: str, start: int, end: Optional[int], progress: _Progress):
+    """
+    Fill `part_path` with bytes start..end (inclusive; end None = to the end of the file),
+    resuming from whatever is already in it. Retries dropped connections with backoff.
+    Raises RangesIgnored if the server sends the whole file for a range that does not start at 0.
+    """
+    policy = retry.policy()
+    attempt = 0
+    while True:
+        have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if end is not None and start + have > end:
+            return
+        try:
+            with _request(url, start + have, end) as response:
+                ranged = start + have > 0 or end is not None
+                if ranged and response.status != 206:
+                    if start or end is not None:
+                        raise RangesIgnored(f"{url} ignored the range {start + have}-{'' if end is None else end}")
+                    # Resuming the whole file: the server is sending everything again
+                    progress.add(-have)
+                    have = 0
+                with open(part_path, "ab" if have else "wb") as f:
+                    while True:
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        progress.add(len(chunk))
+            received = os.path.getsize(part_path)
+            if end is not None and received < end - start + 1:
+                raise DownloadError(f"connection closed after {received} of {end - start + 1} bytes")
+            return
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and end is None and have:
+                return   # the part file already holds the whole remainder
+            if e.code < 500 or attempt >= policy.retries:
+                raise DownloadError(f"HTTP {e.code} for {url}") from e
+        except RangesIgnored:
+            raise
+        except (urllib.error.URLError, OSError, DownloadError) as e:
+            if attempt >= policy.retries:
+                raise DownloadError(str(e)) from e
+        attempt += 1
+        wait = policy.delay(attempt)
+        print(f"\n      ⚠️ Download interrupted; resuming in {wait:.1f}s (retry {attempt}/{policy.retries})...")
+        time.sleep(wait)
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download(url: str, path: str, sha256: Optional[str] = None, connections: int = DEFAULT_CONNECTIONS):
+    """
+    Download `url` to `path`, resuming earlier partial downloads of the same path and
+    verifying `sha256` when given. Raises DownloadError.
+    """
+    size, ranges = probe(url)
+    parts = 1
+    if size and ranges and connections > 1:
+        parts = max(1, min(connections, size // MIN_PART_SIZE))
+
+    if parts == 1:
+        part_paths = [path + ".part"]
+        bounds = [(0, None)]   # the total is checked below
+    else:
+        step = -(-size // parts)
+        part_paths = [f"{path}.part{i}" for i in range(parts)]
+        bounds = [(i * step, min(size, (i + 1) * step) - 1) for i in range(parts)]
+
+    resumed = sum(os.path.getsize(p) for p in part_paths if os.path.exists(p))
+    if resumed:
+        print(f"      Resuming from {resumed} bytes already downloaded.")
+    progress = _Progress(size, resumed)
+
+    with trace.span("download", url=url, bytes=size, connections=parts):
+        if parts > 1:
+            try:
+                with ThreadPoolExecutor(max_workers=parts) as pool:
+                    for future in [pool.submit(_fetch_range, url, p, s, e, progress) for p, (s, e) in zip(part_paths, bounds)]:
+                        future.result()
+            except RangesIgnored:
+                # Advertised Accept-Ranges but sent the whole file for a range: parts would be corrupt
+                print("\n      ⚠️ The server does not honour byte ranges; downloading over one connection.")
+                for part_path in part_paths:
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                parts, part_paths = 1, [path + ".part"]
+                progress = _Progress(size)
+        if parts == 1:
+            _fetch_range(url, part_paths[0], 0, None, progress)
+    progress.finish()
+
+    if parts > 1:
+        with open(part_paths[0], "ab") as out:
+            for part_path in part_paths[1:]:
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, out, 1024 * 1024)
+                os.remove(part_path)
+
+    received = os.path.getsize(part_paths[0])
+    if size is not None and received != size:
+        os.remove(part_paths[0])
+        raise DownloadError(f"expected {size} bytes, got {received}")
+    if sha256:
+        actual = sha256_file(part_paths[0])
+        if actual.lower() != sha256.lower():
+            # A corrupt partial file must not be resumed from next time
+            os.remove(part_paths[0])
+            raise DownloadError(f"checksum mismatch: expected {sha256}, got {actual}")
+    os.replace(part_paths[0], path)
+
+
+def parse_checksums(text: str) -> Dict[str, str]:
+    """`sha256sum` output ('<hex>  <file name>' per line) -> {file name: hex}"""
+    checksums = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and len(fields[0]) == 64:
+            checksums[fields[1].lstrip("*")] = fields[0].lower()
+    return checksums
+
+
+def release_checksum(assets: List[dict], asset_name: str) -> Optional[str]:
+    """SHA-256 of `asset_name` from the release's *_checksums.txt asset, None if there is none"""
+    listing = next((a for a in assets if a.get("name", "").endswith("checksums.txt")), None)
+    if not listing:
+        return None
+    try:
+        with _request(listing["browser_download_url"]) as response:
+            return parse_checksums(response.read().decode("utf-8", errors="replace")).get(asset_name)
+    except (urllib.error.URLError, OSError) as e:
+        print(f"   ⚠️ Could not fetch release checksums: {str(e)}")
+        return None
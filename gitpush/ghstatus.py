@@ -0,0 +1,115 @@
+"""
+Cached GitHub CLI availability and authentication checks.
+
+`gh --version` and `gh auth status` (which may hit the network) cost hundreds of
+milliseconds, so successful results are remembered for a TTL. Entries are keyed
+by the resolved gh binary path and its mtime, so upgrading or replacing gh
+invalidates them, and auth entries are also keyed by host. Failures are never
+cached, and an auth error from any later gh call drops the host's entry.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from typing import Optional
+
+from gitpush import cache, trace
+
+CACHE_FILE = "gh-status.json"
+DEFAULT_TTL = 600.0
+
+AUTH_ERROR_MARKERS = (
+    "gh auth login", "authentication", "not logged in", "bad credentials",
+    "http 401", "requires authentication", "invalid token",
+)
+
+
+def default_ttl() -> float:
+    try:
+        return float(os.environ.get("GITPUSH_GH_CACHE_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _binary_key() -> Optional[str]:
+    binary = shutil.which("gh")
+    if not binary:
+        return None
+    binary = os.path.realpath(binary)
+    try:
+        return f"{binary}@{os.stat(binary).st_mtime_ns}"
+    except OSError:
+        return None
+
+
+def _entries(path: str) -> dict:
+    entries = cache.read_json(path, {})
+    return entries if isinstance(entries, dict) else {}   # a corrupted or hand-edited cache is a miss
+
+
+def _lookup(key: str, ttl: float) -> bool:
+    if ttl <= 0:
+        return False
+    checked = _entries(cache.cache_path(CACHE_FILE)).get(key)
+    return isinstance(checked, (int, float)) and 0 <= time.time() - checked < ttl
+
+
+def _remember(key: str):
+    path = cache.cache_path(CACHE_FILE)
+    entries = _entries(path)
+    now = time.time()
+    # Drop entries for old gh binaries while we are here
+    entries = {k: v for k, v in entries.items() if isinstance(v, (int, float)) and now - v < 30 * 86400}
+    entries[key] = now
+    cache.write_json(path, entries)
+
+
+def forget_auth(host: str = "github.com"):
+    """Invalidate the cached auth status for `host` (call after gh reports an auth error)"""
+    binary = _binary_key()
+    if binary is None:
+        return
+    path = cache.cache_path(CACHE_FILE)
+    entries = _entries(path)
+    if entries.pop(f"auth:{host}:{binary}", None) is not None:
+        cache.write_json(path, entries)
+
+
+def is_auth_error(message: str) -> bool:
+    message = message.lower()
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+def check_gh_installed(ttl: float = 0) -> bool:
+    """Check if GitHub CLI is installed with proper verification (cached for `ttl` seconds)"""
+    binary = _binary_key()
+    if binary is None:
+        return False
+    key = f"installed:{binary}"
+    if _lookup(key, ttl):
+        return True
+    try:
+        # Verify gh is actually working
+        trace.run(["gh", "--version"], check=True, capture_output=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # Found but not working - might be a PATH issue or broken install
+        return False
+    _remember(key)
+    return True
+
+
+def check_gh_authenticated(host: str = "github.com", ttl: float = 0) -> bool:
+    """`gh auth status -h HOST` exit code, cached for `ttl` seconds when it succeeds"""
+    binary = _binary_key()
+    if binary is None:
+        return False
+    key = f"auth:{host}:{binary}"
+    if _lookup(key, ttl):
+        return True
+    try:
+        trace.run(["gh", "auth", "status", "-h", host], check=True, capture_output=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+    _remember(key)
+    return True
@@ -0,0 +1,262 @@
+"""
+In-process GitHub REST client, an alternative to spawning gh (--api).
+
+The token comes from $GH_TOKEN / $GITHUB_TOKEN, then from gh's hosts.yml, then
+from `gh auth token` (for tokens gh keeps in the system keyring). All requests
+of a run share one persistent HTTP/1.1 connection, so the TLS handshake is paid
+once; a connection the server closed while idle is reopened transparently.
+Responses are parsed as JSON and failures raise typed errors: AuthError,
+NotFoundError, ValidationError (AlreadyExistsError), RateLimitError.
+
+$GITPUSH_GITHUB_API overrides the API base URL, e.g. for a local stub server
+(plain http:// is accepted there).
+"""
+
+import http.client
+import json
+import os
+import select
+import shutil
+import sys
+import time
+import urllib.parse
+from typing import List, Optional
+
+from gitpush import trace
+
+DEFAULT_API = "https://api.github.com"
+API_VERSION = "2022-11-28"
+TIMEOUT = 30
+USER_AGENT = "gitpush"
+_RECONNECT_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError)
+
+
+class GitHubError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(f"{message} (HTTP {status})" if status else message)
+        self.status = status
+
+
+class AuthError(GitHubError):
+    pass
+
+
+class NotFoundError(GitHubError):
+    pass
+
+
+class ValidationError(GitHubError):
+    def __init__(self, message: str, status: Optional[int] = None, errors: Optional[List[dict]] = None):
+        super().__init__(message, status)
+        self.errors = errors or []
+
+
+class AlreadyExistsError(ValidationError):
+    pass
+
+
+class RateLimitError(GitHubError):
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message, status)
+        self.retry_after = retry_after
+
+
+def api_base() -> str:
+    return (os.environ.get("GITPUSH_GITHUB_API") or DEFAULT_API).rstrip("/")
+
+
+def _gh_config_dir() -> str:
+    if os.environ.get("GH_CONFIG_DIR"):
+        return os.environ["GH_CONFIG_DIR"]
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        return os.path.join(os.environ["APPDATA"], "GitHub CLI")
+    return os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "gh")
+
+
+def _hosts_file_token(host: str) -> Optional[str]:
+    """The active oauth_token of `host` in gh's hosts.yml (read without a YAML parser)"""
+    try:
+        with open(os.path.join(_gh_config_dir(), "hosts.yml"), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    best, best_indent, inside = None, None, False
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            inside = line.rstrip().rstrip(":").strip("'\"") == host
+            continue
+        key, _, value = line.strip().partition(":")
+        # Newer gh also lists every account's token under `users:`; the active one sits directly under the host
+        if inside and key == "oauth_token" and value.strip() and (best_indent is None or indent < best_indent):
+            best, best_indent = value.strip().strip("'\""), indent
+    return best
+
+
+def find_token(host: str = "github.com") -> Optional[str]:
+    """The token gh itself would use for `host`, or None"""
+    names = ("GH_TOKEN", "GITHUB_TOKEN") if host == "github.com" else ("GH_ENTERPRISE_TOKEN", "GITHUB_ENTERPRISE_TOKEN")
+    for name in names:
+        if os.environ.get(name):
+            return os.environ[name]
+    token = _hosts_file_token(host)
+    if token:
+        return token
+    if shutil.which("gh"):
+        result = trace.run(["gh", "auth", "token", "-h", host], capture_output=True, text=True)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    return None
+
+
+class GitHubClient:
+    """JSON requests over one kept-alive connection to the API host"""
+
+    def __init__(self, token: str, base_url: Optional[str] = None, timeout: float = TIMEOUT):
+        parts = urllib.parse.urlsplit(base_url or api_base())
+        self.token = token
+        self.secure = parts.scheme != "http"
+        self.host = parts.hostname or "api.github.com"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.connections = 0
+        self.requests = 0
+        self._conn = None
+        self._used = False
+        self._login: Optional[str] = None
+
+    def _connection(self):
+        if self._conn is not None and self._conn.sock is not None:
+            # A kept-alive socket that is readable before we sent anything was closed by the server
+            readable, _, _ = select.select([self._conn.sock], [], [], 0)
+            if readable:
+                self.close()
+        if self._conn is None:
+            connection_class = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+            self._conn = connection_class(self.host, self.port, timeout=self.timeout)
+            self._used = False
+            self.connections += 1
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def request(self, method: str, path: str, body: Optional[dict] = None):
+        """Send one request and return the decoded JSON (None for an empty body). Raises GitHubError."""
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+            "User-Agent": USER_AGENT,
+            "X-GitHub-Api-Version": API_VERSION,
+        }
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+
+        while True:
+            conn = self._connection()
+            reused = self._used
+            sent = False
+            with trace.span("github api", method=method, path=path, connection=self.connections, reused=reused):
+                try:
+                    conn.request(method, self.prefix + path, body=payload, headers=headers)
+                    sent = True
+                    response = conn.getresponse()
+                    data = response.read()
+                except _RECONNECT_ERRORS as e:
+                    self.close()
+                    # The server dropped an idle kept-alive connection. Resend unless a non-idempotent
+                    # request may already have reached it (a repeated POST could create twice).
+                    if reused and (not sent or method == "GET"):
+                        continue
+                    raise GitHubError(f"connection to {self.host} lost: {str(e)}") from e
+                except (OSError, http.client.HTTPException) as e:
+                    self.close()
+                    raise GitHubError(f"cannot reach {self.host}: {str(e)}") from e
+            self._used = True
+            self.requests += 1
+            if response.will_close:
+                self.close()
+            return _parse(response, data)
+
+    def current_user(self) -> dict:
+        """GET /user: the account the token belongs to (the cheapest way to check a token)"""
+        user = self.request("GET", "/user")
+        if isinstance(user, dict) and user.get("login"):
+            self._login = user["login"]
+        return user
+
+    def login(self) -> Optional[str]:
+        """The signed-in account's login, from the /user request already made if there was one"""
+        if self._login is None:
+            self.current_user()
+        return self._login
+
+    def create_repository(self, name: str, private: bool = False, description: str = "") -> dict:
+        """Create `name`, `your-login/name` or `org/name` and return the repository object (html_url, clone_url, ...)"""
+        owner, _, repo = name.rpartition("/")
+        body = {"name": repo, "private": private}
+        if description:
+            body["description"] = description
+        # Like gh, accept the user's own login as the owner; only organizations have /orgs/{org}/repos
+        if owner and owner.lower() != (self.login() or "").lower():
+            path = f"/orgs/{urllib.parse.quote(owner)}/repos"
+        else:
+            path = "/user/repos"
+        return self.request("POST", path, body)
+
+
+def _parse(response, data: bytes):
+    try:
+        decoded = json.loads(data.decode("utf-8")) if data.strip() else None
+    except ValueError:
+        decoded = None
+        if 200 <= response.status < 300:
+            raise GitHubError("invalid JSON in the API response", response.status)
+    if 200 <= response.status < 300:
+        return decoded
+
+    details = decoded if isinstance(decoded, dict) else {}
+    message = details.get("message") or response.reason or "request failed"
+    errors = [e for e in details.get("errors") or [] if isinstance(e, dict)]
+    if errors:
+        message = message.rstrip(".") + ": " + "; ".join(e.get("message") or f"{e.get('field')} {e.get('code')}" for e in errors)
+
+    status = response.status
+    if status in (403, 429) and (response.getheader("X-RateLimit-Remaining") == "0" or "rate limit" in message.lower()):
+        retry_after = response.getheader("Retry-After")
+        reset = response.getheader("X-RateLimit-Reset")
+        if retry_after and retry_after.isdigit():
+            wait = float(retry_after)
+        elif reset and reset.isdigit():
+            wait = max(0.0, int(reset) - time.time())
+        else:
+            wait = None
+        raise RateLimitError(f"GitHub API rate limit exceeded: {message}", status, wait)
+    if status == 401:
+        raise AuthError(message, status)
+    if status == 404:
+        raise NotFoundError(message, status)
+    if status == 422:
+        exists = "already exists" in message.lower() or any(e.get("code") == "already_exists" for e in errors)
+        raise (AlreadyExistsError if exists else ValidationError)(message, status, errors)
+    raise GitHubError(message, status)
+
+
+_client: Optional[GitHubClient] = None
+
+
+def client(host: str = "github.com") -> GitHubClient:
+    """The shared client of this process. Raises AuthError if no token can be found."""
+    global _client
+    if _client is None:
+        token = find_token(host)
+        if not token:
+            raise AuthError("no GitHub token found in $GH_TOKEN, $GITHUB_TOKEN or gh's configuration")
+        _client = GitHubClient(token)
+    return _client
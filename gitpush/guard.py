@@ -0,0 +1,152 @@
+"""
+Pre-push large-object guard.
+
+Before anything is uploaded, list the objects the push would send
+(`git rev-list --objects` for the commits the remote does not have), look up
+their sizes with `git cat-file --batch-check`, and stop with a per-path table
+if any blob is over the limit. Object ids already checked against the limit
+are remembered in the git directory, so repeated pushes only look at new objects.
+"""
+
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional
+
+from gitpush import cache, trace
+from gitpush.refs import config_value, find_git_dir
+
+DEFAULT_LIMIT = 100 * 1024 * 1024   # GitHub rejects blobs over 100 MiB
+CHECKED_FILE = os.path.join("gitpush", "checked-objects")
+MAX_CHECKED = 500000
+_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+class LargeObject(NamedTuple):
+    oid: str
+    path: str
+    size: int
+
+
+def parse_size(text: str) -> int:
+    """Parse '100M', '512k', '2g' or a byte count. 0, 'off' and 'none' disable the guard."""
+    text = text.strip().lower()
+    if text in ("off", "none", "false", ""):
+        return 0
+    number = text.rstrip("kmgib") or "0"
+    unit = text[len(number):].replace("i", "").rstrip("b")
+    if unit not in _UNITS:
+        raise ValueError(f"invalid size: {text!r}")
+    return int(float(number) * _UNITS[unit])
+
+
+def size_limit(requested: Optional[str] = None) -> int:
+    """--max-object-size, else the repository's gitpush.maxObjectSize, else 100 MiB"""
+    if requested is None:
+        git_dir = find_git_dir()
+        requested = config_value(git_dir, "gitpush.maxObjectSize") if git_dir else None
+    try:
+        return DEFAULT_LIMIT if requested is None else parse_size(requested)
+    except ValueError:
+        print(f"⚠️ Ignoring invalid object size limit {requested!r}; using 100M.", file=sys.stderr)
+        return DEFAULT_LIMIT
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _load_checked(git_dir: str, limit: int) -> List[str]:
+    """Object ids known to be under `limit` (entries recorded under a larger limit are not trusted)"""
+    if not cache.enabled():
+        return []
+    try:
+        with open(os.path.join(git_dir, CHECKED_FILE), "r", encoding="ascii") as f:
+            header = f.readline().split()
+            if len(header) != 2 or header[0] != "limit" or int(header[1]) > limit:
+                return []
+            return f.read().split()
+    except (OSError, ValueError):
+        return []
+
+
+def _store_checked(git_dir: str, limit: int, oids: List[str]):
+    if not cache.enabled():
+        return
+    path = os.path.join(git_dir, CHECKED_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="ascii") as f:
+            f.write(f"limit {limit}\n")
+            f.write("\n".join(oids[-MAX_CHECKED:]))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def find_large_objects(revs: List[str], exclude: List[str], limit: int) -> List[LargeObject]:
+    """Blobs over `limit` reachable from `revs` but not from `exclude` (rev-list arguments)"""
+    git_dir = find_git_dir()
+    listing = trace.run(["git", "rev-list", "--objects", *revs, "--not", *exclude, "--"],
+                        capture_output=True, check=True)
+
+    checked = _load_checked(git_dir, limit) if git_dir else []
+    known = set(checked)
+    candidates = []
+    for line in listing.stdout.decode("utf-8", errors="surrogateescape").splitlines():
+        oid, sep, path = line.partition(" ")
+        # Commits have no path; only trees and blobs need a size lookup
+        if sep and oid not in known:
+            candidates.append(line)
+    if not candidates:
+        return []
+
+    sizes = trace.run(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objecttype) %(objectsize) %(rest)"],
+        input="\n".join(candidates).encode("utf-8", errors="surrogateescape") + b"\n",
+        capture_output=True, check=True
+    )
+    large, fine = [], []
+    for line in sizes.stdout.decode("utf-8", errors="surrogateescape").splitlines():
+        parts = line.split(" ", 3)
+        if len(parts) < 3 or parts[1] == "missing":
+            continue
+        oid, kind, size = parts[0], parts[1], int(parts[2])
+        if kind == "blob" and size > limit:
+            large.append(LargeObject(oid, parts[3] if len(parts) > 3 else "", size))
+        else:
+            fine.append(oid)
+
+    if git_dir and fine:
+        _store_checked(git_dir, limit, checked + fine)
+    return sorted(large, key=lambda obj: -obj.size)
+
+
+def check_push_size(revs: List[str], exclude: List[str], limit: int) -> bool:
+    """Return False (after printing a size table) if the push would upload an oversized blob"""
+    if limit <= 0:
+        return True
+    try:
+        with trace.span("large object check"):
+            large = find_large_objects(revs, exclude, limit)
+    except subprocess.CalledProcessError as e:
+        # Not being able to list objects must not block the push; the server still enforces its limit
+        error_output = e.stderr.decode(errors="ignore").strip() if e.stderr else str(e)
+        print(f"⚠️ Skipping large object check: {error_output}", file=sys.stderr)
+        return True
+    if not large:
+        return True
+
+    print(f"\n❌ Push blocked: {len(large)} file(s) exceed the {format_size(limit)} object size limit:", file=sys.stderr)
+    width = max(len(obj.path) for obj in large)
+    for obj in large:
+        print(f"   {obj.path:<{width}}  {format_size(obj.size):>10}  {obj.oid[:12]}", file=sys.stderr)
+    print("➡️  Track these files with Git LFS or remove them from history "
+          "(e.g. 'git rm --cached <file>' and amend the commit).", file=sys.stderr)
+    print("   Use --max-object-size to change the limit, or --max-object-size off to skip this check.", file=sys.stderr)
+    return False
@@ -0,0 +1,362 @@
+"""
+GitHub CLI (gh) installer.
+
+Only needed when gh is missing, so it is imported on demand and keeps
+urllib, json, tempfile and platform off the common push path.
+"""
+
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Optional
+
+from gitpush import cache, trace
+from gitpush.download import DownloadError, download, release_checksum
+from gitpush.ghstatus import check_gh_installed
+from gitpush.releases import ReleaseInfoError, latest_gh_release
+
+# Release asset suffixes for platform.machine() values on Linux
+LINUX_ARCHES = {
+    "x86_64": "amd64", "amd64": "amd64",
+    "aarch64": "arm64", "arm64": "arm64",
+    "armv7l": "armv6", "armv6l": "armv6",
+    "i386": "386", "i686": "386",
+}
+
+
+def install_gh_cli() -> bool:
+    """Main installation function with comprehensive error handling"""
+    system = platform.system()
+    machine = platform.machine().lower()
+    
+    print("\n🔧 Installing GitHub CLI...")
+    print(f"📋 System: {system}, Architecture: {machine}")
+    
+    try:
+        if system == "Windows":
+            return install_gh_cli_windows()
+        elif system == "Darwin":
+            return install_gh_cli_mac()
+        elif system == "Linux":
+            return install_gh_cli_linux()
+        else:
+            print(f"❌ Unsupported OS: {system}")
+            return False
+    except Exception as e:
+        print(f"❌ Installation failed: {str(e)}")
+        return False
+
+def install_gh_cli_windows() -> bool:
+    """Windows installation with multiple fallback methods and PATH management"""
+    methods = [
+        try_winget_install,
+        try_scoop_install,
+        try_choco_install,
+        try_direct_msi_install,
+        try_direct_zip_install
+    ]
+    
+    for method in methods:
+        if method():
+            if verify_gh_installation():
+                return True
+        print("   ⚠️ Trying next installation method...")
+    
+    print("❌ All Windows installation methods failed.")
+    return False
+
+def try_winget_install() -> bool:
+    """Attempt installation via winget"""
+    if not shutil.which("winget"):
+        return False
+    
+    print("\n   🔄 Attempting winget installation...")
+    try:
+        trace.run(
+            ["winget", "install", "--id", "GitHub.cli", "--silent", "--accept-package-agreements", "--accept-source-agreements"],
+            check=True,
+            capture_output=True
+        )
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️ winget failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
+        return False
+
+def try_scoop_install() -> bool:
+    """Attempt installation via scoop"""
+    if not shutil.which("scoop"):
+        return False
+    
+    print("\n   🔄 Attempting scoop installation...")
+    try:
+        trace.run(["scoop", "install", "gh"], check=True, capture_output=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️ scoop failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
+        return False
+
+def try_choco_install() -> bool:
+    """Attempt installation via chocolatey"""
+    if not shutil.which("choco"):
+        return False
+    
+    print("\n   🔄 Attempting chocolatey installation...")
+    try:
+        trace.run(["choco", "install", "gh", "-y"], check=True, capture_output=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️ chocolatey failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
+        return False
+
+def try_direct_msi_install() -> bool:
+    """Direct MSI installation with proper PATH handling"""
+    print("\n   🔄 Attempting direct MSI installation...")
+    try:
+        release_info = get_github_release_info()
+        if not release_info: return False
+        
+        msi_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('_windows_amd64.msi')), None)
+        if not msi_asset:
+            print("   ❌ Could not find Windows MSI installer.")
+            return False
+            
+        msi_path = download_asset(msi_asset, release_info.get('assets', []))
+        if not msi_path: return False
+        
+        print("   🛠 Installing (this may require administrator privileges)...")
+        trace.run(["msiexec", "/i", msi_path, "/quiet", "/norestart"], check=True)
+        
+        os.remove(msi_path)
+        
+        program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
+        gh_path = os.path.join(program_files, "GitHub CLI", "gh.exe")
+        if os.path.exists(gh_path): add_to_path(os.path.dirname(gh_path))
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ MSI installation failed: {str(e)}")
+        return False
+
+def try_direct_zip_install() -> bool:
+    """Fallback ZIP installation for Windows"""
+    print("\n   🔄 Attempting direct ZIP installation...")
+    temp_dir = ""
+    try:
+        release_info = get_github_release_info()
+        if not release_info: return False
+        
+        zip_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith('windows_amd64.zip')), None)
+        if not zip_asset:
+            print("   ❌ Could not find Windows ZIP package.")
+            return False
+            
+        zip_path = download_asset(zip_asset, release_info.get('assets', []))
+        if not zip_path: return False
+        
+        print("   📦 Extracting...")
+        temp_dir = tempfile.mkdtemp()
+        shutil.unpack_archive(zip_path, temp_dir)
+        os.remove(zip_path)
+        
+        bin_dir = next((root for root, _, files in os.walk(temp_dir) if "gh.exe" in files), None)
+        if not bin_dir:
+            print("   ❌ Could not find gh.exe in extracted files.")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+        
+        install_dir = os.path.join(os.environ.get("LOCALAPPDATA", ""), "GitHubCLI")
+        os.makedirs(install_dir, exist_ok=True)
+        
+        shutil.copytree(bin_dir, install_dir, dirs_exist_ok=True)
+        add_to_path(install_dir)
+        
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return True
+    except Exception as e:
+        print(f"   ❌ ZIP installation failed: {str(e)}")
+        if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
+        return False
+
+def install_gh_cli_mac() -> bool:
+    """macOS installation with multiple methods"""
+    if shutil.which("brew"):
+        print("\n   🔄 Attempting Homebrew installation...")
+        try:
+            trace.run(["brew", "install", "gh"], check=True, capture_output=True)
+            if verify_gh_installation(): return True
+        except subprocess.CalledProcessError as e:
+            print(f"   ⚠️ Homebrew failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
+    
+    print("❌ All macOS installation methods failed.")
+    return False
+
+def install_gh_cli_linux() -> bool:
+    """Linux installation with distro detection and multiple methods"""
+    package_managers = [
+        ("apt-get", "sudo apt-get update && sudo apt-get install -y gh"),
+        ("apt", "sudo apt update && sudo apt install -y gh"),
+        ("dnf", "sudo dnf install -y gh"),
+        ("yum", "sudo yum install -y gh"),
+        ("pacman", "sudo pacman -S --noconfirm github-cli"),
+        ("zypper", "sudo zypper install -y gh"),
+    ]
+    for pm, command in package_managers:
+        if shutil.which(pm):
+            print(f"\n   🔄 Attempting installation via {pm}...")
+            try:
+                trace.run(command, shell=True, check=True, capture_output=True)
+                if verify_gh_installation(): return True
+            except subprocess.CalledProcessError as e:
+                print(f"   ⚠️ {pm} failed: {e.stderr.decode(errors='ignore').strip() if e.stderr else 'Unknown error'}")
+
+    if try_direct_tarball_install():
+        return verify_gh_installation()
+
+    print("❌ All Linux package manager installations failed.")
+    return False
+
+def try_direct_tarball_install() -> bool:
+    """Install the release tarball into ~/.local/bin (no root needed)"""
+    arch = LINUX_ARCHES.get(platform.machine().lower())
+    if not arch:
+        return False
+
+    print("\n   🔄 Attempting direct tarball installation...")
+    temp_dir = ""
+    try:
+        release_info = get_github_release_info()
+        if not release_info: return False
+
+        tar_asset = next((a for a in release_info.get('assets', []) if a['name'].endswith(f'_linux_{arch}.tar.gz')), None)
+        if not tar_asset:
+            print(f"   ❌ Could not find a Linux {arch} tarball.")
+            return False
+
+        tar_path = download_asset(tar_asset, release_info.get('assets', []))
+        if not tar_path: return False
+
+        print("   📦 Extracting...")
+        temp_dir = tempfile.mkdtemp()
+        shutil.unpack_archive(tar_path, temp_dir)
+        os.remove(tar_path)
+
+        gh_binary = next((os.path.join(root, "gh") for root, _, files in os.walk(temp_dir) if "gh" in files), None)
+        if not gh_binary:
+            print("   ❌ Could not find gh in extracted files.")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        install_dir = os.path.expanduser("~/.local/bin")
+        os.makedirs(install_dir, exist_ok=True)
+        shutil.copy2(gh_binary, os.path.join(install_dir, "gh"))
+        if install_dir not in os.environ.get("PATH", "").split(os.pathsep):
+            add_to_path(install_dir)
+
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return True
+    except Exception as e:
+        print(f"   ❌ Tarball installation failed: {str(e)}")
+        if temp_dir: shutil.rmtree(temp_dir, ignore_errors=True)
+        return False
+
+def get_github_release_info() -> Optional[dict]:
+    """Get latest release info from GitHub API (revalidated against a cached copy, fetched once per run)"""
+    try:
+        return latest_gh_release()
+    except ReleaseInfoError as e:
+        print(f"   ❌ Failed to get release info from GitHub API: {str(e)}")
+        return None
+
+def download_file(url: str, path: str, sha256: Optional[str] = None) -> bool:
+    """Download a file with progress reporting, resuming partial downloads and verifying `sha256` if given"""
+    try:
+        download(url, path, sha256)
+        return True
+    except (DownloadError, OSError) as e:
+        print(f"\n   ❌ Download failed: {str(e)}")
+        return False
+
+def download_asset(asset: dict, assets: list) -> Optional[str]:
+    """
+    Download a release asset into the cache directory, so an interrupted download is resumed
+    by the next attempt, and verify it against the release's checksums file. Returns its path.
+    """
+    path = os.path.join(cache.user_cache_dir(), "downloads", asset['name'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sha256 = release_checksum(assets, asset['name'])
+    if not sha256:
+        print(f"   ⚠️ No published checksum for {asset['name']}; it will not be verified.")
+    print(f"   ⬇️ Downloading {asset['name']}...")
+    if not download_file(asset['browser_download_url'], path, sha256):
+        return None
+    if sha256:
+        print("   🔒 Checksum verified.")
+    return path
+
+def add_to_path(directory: str):
+    """Add directory to PATH for the current session and try to make it permanent."""
+    print(f"   ✅ Adding {directory} to PATH...")
+    os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ['PATH']}"
+    
+    if platform.system() == "Windows":
+        try:
+            # This makes the PATH change permanent for the current user
+            trace.run(
+                f'setx PATH "%PATH%;{directory}"',
+                shell=True, check=True, capture_output=True
+            )
+        except Exception as e:
+            print(f"   ⚠️ Could not make PATH change permanent: {e}")
+            print("      You may need to add it manually.")
+    else: # macOS and Linux
+        # Suggest adding to shell profile
+        profile_file = ""
+        shell = os.environ.get("SHELL", "")
+        if "bash" in shell: profile_file = "~/.bashrc"
+        elif "zsh" in shell: profile_file = "~/.zshrc"
+        else: profile_file = "~/.profile"
+        print(f"   To make this change permanent, add the following to your {profile_file}:")
+        print(f'   export PATH="{directory}:$PATH"')
+
+def verify_gh_installation() -> bool:
+    """Verify gh is properly installed and in PATH"""
+    if not shutil.which("gh"):
+        return False
+    try:
+        result = trace.run(["gh", "--version"], check=True, capture_output=True, text=True)
+        print(f"✅ GitHub CLI successfully installed: {result.stdout.splitlines()[0]}")
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+def check_and_install_gh(ttl: float = 0) -> bool:
+    """Main function to check and install GitHub CLI, WITH USER PROMPT."""
+    if check_gh_installed(ttl):
+        return True
+    
+    # --- ADDED USER PROMPT ---
+    print("\n❓ GitHub CLI (gh) is required for this feature but is not installed.", file=sys.stderr)
+    try:
+        answer = input("   Would you like this tool to attempt an automatic installation? (y/n): ").lower().strip()
+        if answer != 'y':
+            print("\n❌ Installation cancelled by user. Please install gh manually from https://cli.github.com/")
+            return False
+    except (EOFError, KeyboardInterrupt):
+        print("\n❌ Installation cancelled by user.")
+        return False
+    
+    if not install_gh_cli():
+        print("\n❌ Failed to install GitHub CLI automatically. Please try manual installation:")
+        print("   Visit https://github.com/cli/cli#installation for instructions.")
+        return False
+    
+    # After installation, a PATH refresh might be needed
+    if not check_gh_installed():
+        print("\n‼️ IMPORTANT: Installation completed, but GitHub CLI is not yet available in this terminal session.")
+        print("   Please open a NEW terminal and run your command again.")
+        return False
+    
+    return True
@@ -0,0 +1,171 @@
+"""
+Git LFS routing for repository bootstrap (--init, --new-repo).
+
+Before the first commit, the files git would add are checked for size and
+extension: anything over the threshold (default 10 MiB, --lfs-threshold) or
+with a known binary extension (model weights, archives, media) is tracked with
+LFS, so the first push uploads small pointers through git and the content
+through the LFS endpoint, and later clones stay fast. Extensions become
+case-insensitive `*.[eE][xX][tT]` patterns (so Video.MP4 is caught too), other
+large files are tracked by path; the patterns are written to .gitattributes
+directly, as `git lfs track` would. Files an existing pattern already covers
+are left alone, and only files the new patterns match count as routed.
+
+$GITPUSH_LFS_URL sets lfs.url in the new repository, e.g. a local LFS test
+server or a file:// directory that git-lfs uses as a stand-in endpoint.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from gitpush import trace
+from gitpush.guard import format_size, parse_size
+
+DEFAULT_THRESHOLD = 10 * 1024 * 1024
+ATTRIBUTES = "filter=lfs diff=lfs merge=lfs -text"
+BINARY_EXTENSIONS = frozenset((
+    # model weights and checkpoints
+    ".bin", ".ckpt", ".gguf", ".h5", ".hdf5", ".keras", ".onnx", ".pb", ".pt", ".pth", ".safetensors", ".tflite",
+    # arrays and datasets
+    ".arrow", ".feather", ".npy", ".npz", ".parquet",
+    # archives, disk images and media
+    ".7z", ".bz2", ".dmg", ".gz", ".iso", ".rar", ".tar", ".tgz", ".xz", ".zip",
+    ".avi", ".flac", ".mkv", ".mov", ".mp3", ".mp4", ".psd", ".wav",
+))
+
+
+class LfsRouting(NamedTuple):
+    files: int
+    size: int              # bytes of working tree content handed to LFS
+    patterns: List[str]    # .gitattributes patterns added by this run
+
+
+def _pattern_for_path(path: str) -> str:
+    """Anchored .gitattributes pattern matching exactly `path` (spaces as git lfs track writes them)"""
+    escaped = re.sub(r"([*?\[\\])", r"\\\1", path)
+    return "/" + escaped.replace(" ", "[[:space:]]")
+
+
+def _pattern_for_extension(extension: str) -> str:
+    """`*.mp4` -> `*.[mM][pP]4`: .gitattributes patterns are case-sensitive"""
+    return "*" + "".join(f"[{c}{c.upper()}]" if c.isalpha() else c for c in extension)
+
+
+def lfs_tracked(paths: List[str], root: str = ".") -> List[str]:
+    """The subset of `paths` that .gitattributes sends through the LFS filter"""
+    if not paths:
+        return []
+    result = trace.run(["git", "check-attr", "-z", "--stdin", "filter"], cwd=root, capture_output=True,
+                       input="\0".join(paths).encode("utf-8", errors="surrogateescape"))
+    if result.returncode != 0:
+        return []
+    fields = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    # path NUL attribute NUL value NUL, per path
+    return [fields[i] for i in range(0, len(fields) - 2, 3) if fields[i + 2] == "lfs"]
+
+
+def find_candidates(root: str, threshold: int) -> Dict[str, int]:
+    """Paths (relative to `root`) git would add that belong in LFS, with their sizes"""
+    listing = trace.run(["git", "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+                        cwd=root, capture_output=True)
+    if listing.returncode != 0:
+        return {}
+    candidates = {}
+    for path in listing.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        full = os.path.join(root, path)
+        if not path or os.path.islink(full):
+            continue
+        try:
+            size = os.path.getsize(full)
+        except OSError:
+            continue
+        if size > threshold or os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS:
+            candidates[path] = size
+    return candidates
+
+
+def lfs_threshold(requested: Optional[str] = None) -> int:
+    """--lfs-threshold, else 10 MiB; 0 or 'off' disables LFS routing"""
+    if requested is None:
+        return DEFAULT_THRESHOLD
+    try:
+        return parse_size(requested)
+    except ValueError:
+        print(f"⚠️ Ignoring invalid LFS threshold {requested!r}; using 10M.", file=sys.stderr)
+        return DEFAULT_THRESHOLD
+
+
+def lfs_available() -> bool:
+    try:
+        return trace.run(["git", "lfs", "version"], capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+
+def _read_attributes(path: str) -> Tuple[List[str], str]:
+    """The LFS patterns already in a .gitattributes file, and its text"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return [], ""
+    return [line.split()[0] for line in text.splitlines() if line.strip() and "filter=lfs" in line], text
+
+
+def route_large_files(threshold: Optional[str] = None, root: str = ".") -> Optional[LfsRouting]:
+    """
+    Track the large and binary files of a repository about to get its first commit with LFS.
+    Returns what this run routed, or None if nothing was (no candidates, all of them already
+    tracked, git-lfs missing, or a failure).
+    """
+    threshold = lfs_threshold(threshold)
+    if threshold <= 0:
+        return None
+    with trace.span("lfs scan"):
+        candidates = find_candidates(root, threshold)
+    if candidates:
+        for path in lfs_tracked(sorted(candidates), root):
+            del candidates[path]   # an existing pattern already covers it
+    if not candidates:
+        return None
+    total = sum(candidates.values())
+    if not lfs_available():
+        print(f"⚠️ {len(candidates)} large or binary files ({format_size(total)}) would be better in Git LFS, "
+              "but git-lfs is not installed; committing them as regular files.", file=sys.stderr)
+        print("➡️  Install git-lfs (https://git-lfs.com) before bootstrapping repositories with model weights.",
+              file=sys.stderr)
+        return None
+
+    attributes_path = os.path.join(root, ".gitattributes")
+    existing, text = _read_attributes(attributes_path)
+    patterns = []
+    for path in sorted(candidates):
+        extension = os.path.splitext(path)[1].lower()
+        pattern = _pattern_for_extension(extension) if extension in BINARY_EXTENSIONS else _pattern_for_path(path)
+        if pattern not in existing and pattern not in patterns:
+            patterns.append(pattern)
+    try:
+        # --local keeps the filter and hooks in this repository instead of the user's global config
+        trace.run(["git", "lfs", "install", "--local"], cwd=root, check=True, capture_output=True)
+        lfs_url = os.environ.get("GITPUSH_LFS_URL")
+        if lfs_url:
+            trace.run(["git", "config", "lfs.url", lfs_url], cwd=root, check=True, capture_output=True)
+        if patterns:
+            with open(attributes_path, "a", encoding="utf-8") as f:
+                if text and not text.endswith("\n"):
+                    f.write("\n")
+                f.writelines(f"{pattern} {ATTRIBUTES}\n" for pattern in patterns)
+    except (OSError, subprocess.CalledProcessError) as e:
+        error_output = e.stderr.decode(errors="ignore").strip() if getattr(e, "stderr", None) else str(e)
+        print(f"⚠️ Could not set up Git LFS ({error_output}); committing large files as regular files.", file=sys.stderr)
+        return None
+
+    routed = lfs_tracked(sorted(candidates), root) if patterns else []
+    if not routed:
+        return None
+    total = sum(candidates[path] for path in routed)
+    print(f"🗄️ Tracking {len(routed)} files ({format_size(total)}) with Git LFS: {', '.join(patterns)}")
+    return LfsRouting(len(routed), total, patterns)
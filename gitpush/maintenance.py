@@ -0,0 +1,221 @@
+"""
+Repository maintenance before pushes.
+
+Long-lived checkouts pile up loose objects and small packs, and without a
+commit-graph every ahead/behind count and push walks raw commit objects. Before
+each sync the object directory is inspected without running git (loose objects
+are estimated from one fan-out directory, as `git gc --auto` does), and when a
+threshold is crossed the due tasks run: a geometric repack that folds loose
+objects and small packs together, a prune of old unreachable loose objects,
+and an incremental (split) commit-graph write. By default they run in a
+detached background process; `--maintenance foreground` runs them before the
+push instead.
+
+The time spent in `git status`, `git rev-list` and `git push` is recorded after
+every push, so the first push after a maintenance run can report how much it
+saved.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+from gitpush import cache, trace
+from gitpush.refs import common_dir, config_value
+
+MODES = ("background", "foreground", "off")
+LOOSE_LIMIT = 2000
+PACK_LIMIT = 20
+STATE_FILE = os.path.join("gitpush", "maintenance.json")
+TIMINGS_FILE = os.path.join("gitpush", "push-timings.json")
+LOCK_FILE = os.path.join("gitpush", "maintenance.lock")
+LOCK_STALE = 3600.0
+MEASURED = ("git status", "git rev-list", "git push")
+
+# Alternatives are tried in order; --geometric needs git 2.33+
+TASKS = {
+    "repack": [["repack", "-d", "-l", "--geometric=2"], ["repack", "-d", "-l"]],
+    "prune": [["prune", "--expire=2.weeks.ago"]],
+    "commit-graph": [["commit-graph", "write", "--reachable", "--split"]],
+}
+
+
+class Health(NamedTuple):
+    loose: int          # estimated number of loose objects
+    packs: int
+    commit_graph: bool
+
+
+def maintenance_mode(requested: Optional[str] = None, git_dir: Optional[str] = None) -> str:
+    """--maintenance, else the repository's gitpush.maintenance setting, else 'background'"""
+    if requested:
+        return requested
+    configured = (config_value(git_dir, "gitpush.maintenance") or "").lower() if git_dir else ""
+    return configured if configured in MODES else "background"
+
+
+def inspect(git_dir: str) -> Health:
+    """Object directory statistics from a few directory listings"""
+    objects = os.path.join(common_dir(git_dir), "objects")
+    try:
+        # Object names are uniformly distributed, so one of the 256 fan-out directories is a fair sample
+        loose = sum(1 for name in os.listdir(os.path.join(objects, "17")) if len(name) >= 38) * 256
+    except OSError:
+        loose = 0
+    try:
+        packs = sum(1 for name in os.listdir(os.path.join(objects, "pack")) if name.endswith(".pack"))
+    except OSError:
+        packs = 0
+    commit_graph = (os.path.exists(os.path.join(objects, "info", "commit-graph"))
+                    or os.path.exists(os.path.join(objects, "info", "commit-graphs", "commit-graph-chain")))
+    return Health(loose, packs, commit_graph)
+
+
+def due_tasks(health: Health) -> List[str]:
+    tasks = []
+    if health.loose > LOOSE_LIMIT or health.packs > PACK_LIMIT:
+        tasks.append("repack")
+    if health.loose > LOOSE_LIMIT:
+        tasks.append("prune")
+    # After a repack the new commits are worth adding to the graph as well. A missing graph only
+    # matters once there is packed history (young repositories have a few loose objects).
+    if tasks or (not health.commit_graph and health.packs):
+        tasks.append("commit-graph")
+    return tasks
+
+
+def _read(path: str) -> dict:
+    data = cache.read_json(path, {})
+    return data if isinstance(data, dict) else {}
+
+
+def is_running(git_dir: str) -> bool:
+    path = os.path.join(common_dir(git_dir), LOCK_FILE)
+    try:
+        return time.time() - os.path.getmtime(path) <= LOCK_STALE
+    except OSError:
+        return False
+
+
+def _lock(git_dir: str) -> bool:
+    path = os.path.join(common_dir(git_dir), LOCK_FILE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and not is_running(git_dir):
+            os.remove(path)   # left behind by a run that was killed
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except OSError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(str(os.getpid()))
+    return True
+
+
+def _unlock(git_dir: str):
+    try:
+        os.remove(os.path.join(common_dir(git_dir), LOCK_FILE))
+    except OSError:
+        pass
+
+
+def run_tasks(git_dir: str, tasks: List[str]) -> bool:
+    """Run the maintenance tasks under the repository's maintenance lock and record the run"""
+    if not _lock(git_dir):
+        return False
+    base = common_dir(git_dir)
+    started = time.time()
+    ok = True
+    try:
+        before = inspect(git_dir)
+        # Time the last push spent in the measured git calls, to compare with the next push
+        baseline = _read(os.path.join(base, TIMINGS_FILE)).get("seconds")
+        done = []
+        for task in tasks:
+            for args in TASKS[task]:
+                result = trace.run(["git", f"--git-dir={git_dir}", *args], phase=f"maintenance {task}",
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                if result.returncode == 0:
+                    done.append(task)
+                    break
+            else:
+                ok = False
+        state = _read(os.path.join(base, STATE_FILE))
+        state["last"] = {
+            "started": started,
+            "finished": time.time(),
+            "seconds": round(time.time() - started, 3),
+            "tasks": done,
+            "before": before._asdict(),
+            "after": inspect(git_dir)._asdict(),
+            "baseline": baseline,
+            "saved": None,
+        }
+        cache.write_json(os.path.join(base, STATE_FILE), state)
+    finally:
+        _unlock(git_dir)
+    return ok
+
+
+def before_push(git_dir: Optional[str], mode: str = "background"):
+    """Start the maintenance tasks that are due, in the background or right here"""
+    if mode == "off" or git_dir is None or is_running(git_dir):
+        return
+    health = inspect(git_dir)
+    tasks = due_tasks(health)
+    if not tasks:
+        return
+    reason = f"~{health.loose} loose objects, {health.packs} packs, commit-graph {'present' if health.commit_graph else 'missing'}"
+    if mode == "foreground":
+        print(f"🧹 Running repository maintenance ({', '.join(tasks)}; {reason})...")
+        with trace.span("maintenance", tasks=",".join(tasks)):
+            if not run_tasks(git_dir, tasks):
+                print("⚠️ Some maintenance tasks failed; continuing with the push.", file=sys.stderr)
+        return
+    try:
+        subprocess.Popen([sys.executable, "-m", "gitpush.maintenance", git_dir, *tasks],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                         start_new_session=True)
+        print(f"🧹 Started repository maintenance in the background ({', '.join(tasks)}; {reason}).")
+    except OSError as e:
+        print(f"⚠️ Could not start background maintenance: {str(e)}", file=sys.stderr)
+
+
+def after_push(git_dir: Optional[str]):
+    """Record this push's time in the measured git calls; report the saving of a maintenance run since the last push"""
+    if git_dir is None or not cache.enabled():
+        return
+    measured = [event for event in trace.events() if event["cat"] == "subprocess" and event["name"] in MEASURED]
+    seconds = sum(event["dur"] for event in measured) / 1e6
+    base = common_dir(git_dir)
+    cache.write_json(os.path.join(base, TIMINGS_FILE), {"seconds": round(seconds, 3), "time": time.time()})
+
+    if is_running(git_dir):
+        return
+    state = _read(os.path.join(base, STATE_FILE))
+    last = state.get("last")
+    if not isinstance(last, dict) or last.get("saved") is not None:
+        return
+    run_started = trace.origin_time()
+    if not isinstance(last.get("baseline"), (int, float)):
+        if (last.get("started") or 0) >= run_started and measured:
+            # This push started the background run before it had any timings; its own calls are the baseline
+            last["baseline"] = round(seconds, 3)
+            cache.write_json(os.path.join(base, STATE_FILE), state)
+        return
+    # Only a push whose git calls all ran after the maintenance finished is comparable
+    finished_us = ((last.get("finished") or 0) - run_started) * 1e6
+    if not measured or any(event["ts"] < finished_us for event in measured):
+        return
+    last["saved"] = round(last["baseline"] - seconds, 3)
+    last["measured"] = round(seconds, 3)
+    cache.write_json(os.path.join(base, STATE_FILE), state)
+    change = f"saved {last['saved']:.2f}s" if last["saved"] >= 0 else f"no saving ({-last['saved']:.2f}s slower)"
+    print(f"🧹 Maintenance ({', '.join(last.get('tasks') or ['nothing'])}, {last.get('seconds', 0):.1f}s) {change} "
+          f"in status/rev-list/push: {last['baseline']:.2f}s before, {seconds:.2f}s now.")
+
+
+if __name__ == "__main__":
+    # Background run started by before_push(): python -m gitpush.maintenance GIT_DIR TASK...
+    sys.exit(0 if run_tasks(sys.argv[1], [t for t in sys.argv[2:] if t in TASKS]) else 1)
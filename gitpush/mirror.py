@@ -0,0 +1,101 @@
+"""
+Mirror mode: push the same branch to several remotes at once.
+
+The commit is made once; only the `git push` step fans out, one thread per
+remote, with each push's output captured and printed as one block when it
+finishes. Pushes run with --progress like the primary push, so each block ends
+with its transfer summary and the stats land in the trace and transfer log.
+`best-effort` pushes everywhere and reports the remotes that failed;
+`all-or-nothing` first runs `git push --dry-run` against every remote in
+parallel and pushes nowhere unless all of them would accept the update.
+"""
+
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, NamedTuple
+
+from gitpush import retry
+from gitpush.guard import check_push_size
+
+
+class RemoteResult(NamedTuple):
+    remote: str
+    returncode: int
+    output: str
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def push_command(remote: str, branch: str, force: bool = False, tags: bool = False, dry_run: bool = False) -> List[str]:
+    cmd = ["git", "push", remote, branch]
+    if force:
+        cmd.append("--force-with-lease")
+    if tags:
+        cmd.append("--tags")
+    if dry_run:
+        cmd.append("--dry-run")
+    return cmd
+
+
+def push_remote(cmd: List[str], remote: str) -> RemoteResult:
+    """Run one push (with transient-error retries), capturing its output"""
+    start = time.monotonic()
+    try:
+        # No live meter: several pushes share the terminal, and only the main thread prints
+        process = retry.run([*cmd[:2], "--progress", *cmd[2:]],
+                            phase=f"{'check' if '--dry-run' in cmd else 'push'} {remote}",
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, echo=False,
+                            text=True, progress=True, live=False)
+        output = (process.stdout or "") + (process.stderr or "")
+        return RemoteResult(remote, process.returncode, output, time.monotonic() - start)
+    except OSError as e:
+        return RemoteResult(remote, 1, f"❌ Could not run git push: {str(e)}\n", time.monotonic() - start)
+
+
+def _run_all(remotes: List[str], branch: str, force: bool, tags: bool, dry_run: bool = False) -> List[RemoteResult]:
+    results = []
+    with ThreadPoolExecutor(max_workers=len(remotes)) as pool:
+        futures = [pool.submit(push_remote, push_command(r, branch, force, tags, dry_run), r) for r in remotes]
+        # Only this thread prints, so each remote's output stays in one piece
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not dry_run or not result.ok:
+                icon = "✅" if result.ok else "❌"
+                print(f"\n{icon} ── {result.remote} ──")
+                print(result.output.rstrip() or "(no output)")
+    return results
+
+
+def push_to_remotes(remotes: List[str], branch: str, force: bool = False, tags: bool = False,
+                    policy: str = "best-effort", size_limit: int = 0) -> bool:
+    """Push `branch` to every remote concurrently. Returns False if any remote failed (or, for all-or-nothing, would fail)."""
+    revs = [branch] + (["--tags"] if tags else [])
+    # What each remote is missing differs, so the size guard runs per remote; checked objects are cached
+    if not all(check_push_size(revs, [f"--remotes={r}"], size_limit) for r in remotes):
+        return False
+
+    if policy == "all-or-nothing":
+        print(f"🔍 Checking that all {len(remotes)} remotes accept the push...")
+        rejected = [r.remote for r in _run_all(remotes, branch, force, tags, dry_run=True) if not r.ok]
+        if rejected:
+            print(f"\n❌ Not pushing anywhere: {', '.join(rejected)} would reject the push (all-or-nothing).",
+                  file=sys.stderr)
+            return False
+
+    print(f"🚀 Pushing {branch} to {len(remotes)} remotes: {', '.join(remotes)}")
+    results = _run_all(remotes, branch, force, tags)
+
+    failed = [r for r in results if not r.ok]
+    print("\n📋 Remote summary:")
+    for result in sorted(results, key=lambda r: remotes.index(r.remote)):
+        status = "ok" if result.ok else f"failed (exit {result.returncode})"
+        print(f"   {'✅' if result.ok else '❌'} {result.remote}: {status} in {result.duration:.1f}s")
+    if failed and policy == "all-or-nothing":
+        print("⚠️ A remote failed after the dry run passed; the other remotes were already updated.", file=sys.stderr)
+    return not failed
@@ -0,0 +1,241 @@
+"""
+Repository bootstrap: git init, the first commit, and GitHub repository creation through gh
+(or, with --api, through the in-process REST client in github_api).
+
+Imported on demand for --init and --new-repo.
+"""
+
+import base64
+import os
+import subprocess
+import sys
+import urllib.parse
+
+from gitpush import retry, trace
+from gitpush.guard import check_push_size, format_size, size_limit
+from gitpush.ghstatus import check_gh_authenticated, forget_auth, is_auth_error
+from gitpush.refs import is_git_repository
+
+
+def gh_authenticated(ttl: float = 0) -> bool:
+    """
+    Check if user is authenticated with github.com using the recommended gh command.
+    This is the most reliable way to check, as it uses the exit code, not text parsing.
+    A successful check is reused for `ttl` seconds.
+    """
+    # `gh auth status -h github.com` exits with 0 if logged in to that host, 1 otherwise.
+    return check_gh_authenticated("github.com", ttl)
+
+
+def authenticate_with_gh() -> bool:
+    """
+    Authenticate user with GitHub CLI, ensuring correct permissions for creating repos.
+    """
+    print("\n🔑 GitHub authentication required.")
+    print("The tool will use the GitHub CLI (gh) to open a browser for secure login.")
+    print("You may be asked to grant permissions for this tool to create repositories.")
+    
+    try:
+        # We explicitly request the 'repo' scope to ensure we can create repositories.
+        # `gh` is smart and will just verify if the scope already exists on the token.
+        trace.run(
+            ["gh", "auth", "login", "--web", "-h", "github.com", "-s", "repo"], 
+            check=True
+        )
+        return True
+    except subprocess.CalledProcessError:
+        print("❌ Authentication failed. Please try running 'gh auth login -s repo' manually.", file=sys.stderr)
+        return False
+
+def initialize_git_repository():
+    """Initialize git repository if not already initialized"""
+    if is_git_repository():
+        return False
+        
+    print("🛠 Initializing git repository")
+    try:
+        trace.run(["git", "init"], check=True, capture_output=True)
+        trace.run(["git", "branch", "-M", "main"], check=True, capture_output=True)
+        
+        if not os.path.exists(".gitignore"):
+            with open(".gitignore", "w") as f:
+                f.write("""# Python
+__pycache__/
+*.py[cod]
+*.so
+.Python
+env/
+venv/
+.env
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+
+# System
+.DS_Store
+Thumbs.db
+
+# Project specific
+*.log
+*.tmp
+*.bak
+""")
+            print("📁 Created .gitignore file")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to initialize Git repository: {e.stderr.decode(errors='ignore').strip()}", file=sys.stderr)
+        return False
+
+def create_initial_commit(commit_message="Initial commit", lfs_threshold=None):
+    """Create initial commit if no commits exist, tracking large and binary files with Git LFS first"""
+    try:
+        result = trace.run(["git", "rev-list", "--count", "HEAD"], capture_output=True, text=True)
+        commit_count = int(result.stdout.strip()) if result.stdout.strip().isdigit() else 0
+        
+        if commit_count == 0:
+            from gitpush.lfs import route_large_files
+
+            routed = route_large_files(lfs_threshold)
+            print("📦 Creating initial commit")
+            trace.run(["git", "add", "."], check=True)
+            trace.run(["git", "commit", "-m", commit_message], check=True)
+            if routed is not None:
+                print(f"🗄️ {format_size(routed.size)} in {routed.files} files went to Git LFS; "
+                      "the commit holds only their pointers.")
+            return True
+        return False
+    except subprocess.CalledProcessError as e:
+        error_output = e.stderr.decode(errors='ignore').strip()
+        if "nothing to commit" in error_output:
+             print(f"❌ Failed to create initial commit: No files found to commit.", file=sys.stderr)
+             print("➡️  Add some files to your project directory before creating a repository.", file=sys.stderr)
+        else:
+             print(f"❌ Failed to create initial commit: {error_output}", file=sys.stderr)
+        return False
+
+def prepare_first_push(commit_message="Initial commit", max_object_size=None, lfs_threshold=None):
+    """Initialize the repository and make the first commit if needed, then check what the first push uploads"""
+    if not is_git_repository():
+        if not initialize_git_repository():
+            return False
+
+    if not create_initial_commit(commit_message, lfs_threshold):
+        if trace.run(["git", "status"], capture_output=True).returncode != 0:
+             return False
+        print("ℹ️ Using existing commits")
+
+    # The new repository starts empty, so everything reachable from HEAD gets uploaded
+    return check_push_size(["HEAD"], [], size_limit(max_object_size))
+
+def create_with_gh_cli(repo_name, private=False, description="", commit_message="Initial commit", max_object_size=None,
+                       lfs_threshold=None):
+    """Create and push to new repository using GitHub CLI"""
+    try:
+        if not prepare_first_push(commit_message, max_object_size, lfs_threshold):
+            return False
+
+        private_flag = "--private" if private else "--public"
+        cmd = ["gh", "repo", "create", repo_name, private_flag, "--source=.", "--remote=origin", "--push"]
+        if description: cmd.extend(["--description", description])
+        
+        print("🚀 Creating repository and pushing code...")
+        process = trace.run(cmd, check=True, capture_output=True, text=True)
+        
+        repo_url = process.stderr.strip()
+        print(f"✅ Successfully created repository: {repo_url}")
+        return True
+    except subprocess.CalledProcessError as e:
+        error_message = e.stderr.strip()
+        if "already exists" in error_message:
+            print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
+            print("➡️  Please choose a different repository name.", file=sys.stderr)
+        elif is_auth_error(error_message):
+            # The cached "logged in" result is stale; check again on the next run
+            forget_auth("github.com")
+            print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
+            print("➡️  Please run 'gh auth login -s repo' and try again.", file=sys.stderr)
+        else:
+            print(f"❌ Failed to create repository: {error_message}", file=sys.stderr)
+        return False
+    except Exception as e:
+        print(f"❌ An unexpected error occurred: {str(e)}", file=sys.stderr)
+        return False
+
+
+def api_authenticated() -> bool:
+    """Check the token the REST client will use (--api) with one request on its shared connection"""
+    from gitpush import github_api
+
+    try:
+        user = github_api.client().current_user()
+    except github_api.AuthError as e:
+        print(f"❌ GitHub API authentication failed: {str(e)}", file=sys.stderr)
+        print("➡️  Set GH_TOKEN to a token with the 'repo' scope, or run 'gh auth login -s repo'.", file=sys.stderr)
+        return False
+    except github_api.GitHubError as e:
+        print(f"❌ Could not check GitHub authentication: {str(e)}", file=sys.stderr)
+        return False
+    print(f"🔑 Authenticated to the GitHub API as {(user or {}).get('login', 'unknown user')}")
+    return True
+
+
+def _push_env(clone_url, token):
+    """Environment that hands `token` to git for the HTTPS push without putting it on the command line or in .git/config"""
+    env = dict(os.environ)
+    parts = urllib.parse.urlsplit(clone_url)
+    if parts.scheme not in ("http", "https"):
+        return env
+    # GIT_CONFIG_COUNT needs git 2.31+; older versions ignore it and fall back to the credential helper
+    index = int(env.get("GIT_CONFIG_COUNT", "0") or 0)
+    credentials = base64.b64encode(f"x-access-token:{token}".encode("utf-8")).decode("ascii")
+    env["GIT_CONFIG_COUNT"] = str(index + 1)
+    env[f"GIT_CONFIG_KEY_{index}"] = f"http.{parts.scheme}://{parts.netloc}/.extraheader"
+    env[f"GIT_CONFIG_VALUE_{index}"] = f"AUTHORIZATION: basic {credentials}"
+    return env
+
+
+def create_with_api(repo_name, private=False, description="", commit_message="Initial commit", max_object_size=None,
+                    lfs_threshold=None):
+    """Create the repository through the GitHub REST API, then add it as origin and push with git"""
+    from gitpush import github_api
+
+    try:
+        if not prepare_first_push(commit_message, max_object_size, lfs_threshold):
+            return False
+        # gh refuses to replace an existing origin as well; check before anything is created
+        if trace.run(["git", "remote", "get-url", "origin"], capture_output=True).returncode == 0:
+            print("❌ This repository already has a remote named 'origin'.", file=sys.stderr)
+            print("➡️  Remove it ('git remote remove origin') or push with plain 'gitpush'.", file=sys.stderr)
+            return False
+
+        print("🚀 Creating repository and pushing code...")
+        api = github_api.client()
+        repo = api.create_repository(repo_name, private=private, description=description)
+        clone_url = repo.get("clone_url") or repo.get("html_url")
+        trace.run(["git", "remote", "add", "origin", clone_url], check=True, capture_output=True, text=True)
+        try:
+            retry.run(["git", "push", "--set-upstream", "origin", "HEAD"], check=True,
+                      env=_push_env(clone_url, api.token))
+        except subprocess.CalledProcessError:
+            print(f"❌ Created {repo.get('html_url', repo_name)} but the first push failed.", file=sys.stderr)
+            print("➡️  Fix the problem above and run 'gitpush' to push.", file=sys.stderr)
+            return False
+        print(f"✅ Successfully created repository: {repo.get('html_url', clone_url)}")
+        return True
+    except github_api.AlreadyExistsError as e:
+        print(f"❌ Failed to create repository: {str(e)}", file=sys.stderr)
+        print("➡️  Please choose a different repository name.", file=sys.stderr)
+        return False
+    except github_api.AuthError as e:
+        print(f"❌ Failed to create repository: {str(e)}", file=sys.stderr)
+        print("➡️  Set GH_TOKEN to a token with the 'repo' scope, or run 'gh auth login -s repo'.", file=sys.stderr)
+        return False
+    except github_api.GitHubError as e:
+        print(f"❌ Failed to create repository: {str(e)}", file=sys.stderr)
+        return False
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to create repository: {(e.stderr or '').strip()}", file=sys.stderr)
+        return False
@@ -0,0 +1,98 @@
+"""
+Dry-run support (--plan / --dry-run): estimate what a push would upload.
+
+Committed work is measured with `git rev-list --objects` (everything reachable
+from the pushed refs but not from the remote's tracking refs) and the on-disk
+size `git cat-file --batch-check` reports for each object. That is compressed
+and, for packed objects, already deltified, so it approximates the pack git
+push builds. Changes not committed yet are estimated by compressing the files
+in memory; nothing is written to the object store.
+"""
+
+import os
+import zlib
+from typing import Iterable, List, NamedTuple, Sequence
+
+from gitpush import trace
+
+READ_SIZE = 1024 * 1024
+
+
+class UploadEstimate(NamedTuple):
+    commits: int
+    objects: int
+    size: int       # compressed bytes, the approximate pack size
+    raw_size: int   # uncompressed bytes
+
+
+class WorktreeEstimate(NamedTuple):
+    files: int
+    size: int       # compressed bytes
+    raw_size: int
+
+
+def estimate_upload(revs: List[str], exclude: List[str]) -> UploadEstimate:
+    """Commits and objects reachable from `revs` but not from `exclude` (rev-list arguments), and their size"""
+    listing = trace.run(["git", "rev-list", "--objects", *revs, "--not", *exclude, "--"],
+                        capture_output=True, check=True)
+    lines = [line for line in listing.stdout.decode("utf-8", errors="surrogateescape").splitlines() if line]
+    if not lines:
+        return UploadEstimate(0, 0, 0, 0)
+    # Commits are listed without a path
+    commits = sum(1 for line in lines if " " not in line)
+
+    sizes = trace.run(["git", "cat-file", "--batch-check=%(objectsize) %(objectsize:disk)"],
+                      input="\n".join(line.split(" ", 1)[0] for line in lines).encode("ascii") + b"\n",
+                      capture_output=True, check=True)
+    size = raw_size = 0
+    for line in sizes.stdout.decode("ascii", errors="replace").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+            raw_size += int(parts[0])
+            size += int(parts[1])
+    return UploadEstimate(commits, len(lines), size, raw_size)
+
+
+def _files(root: str, paths: Iterable[str]) -> Iterable[str]:
+    """Existing files among `paths`, expanding the 'dir/' entries git status uses for untracked directories"""
+    for path in paths:
+        full = os.path.join(root, path)
+        if os.path.isdir(full) and not os.path.islink(full):
+            for current, dirs, files in os.walk(full):
+                dirs[:] = [d for d in dirs if d != ".git"]
+                for name in files:
+                    yield os.path.join(current, name)
+        elif os.path.lexists(full):
+            yield full
+
+
+def _compressed_size(path: str) -> int:
+    if os.path.islink(path):
+        return len(os.readlink(path))
+    compressor = zlib.compressobj()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            size += len(compressor.compress(chunk))
+    return size + len(compressor.flush())
+
+
+def estimate_uncommitted(root: str, unstaged_paths: List[str], staged: bool,
+                         pathspecs: Sequence[str] = ()) -> WorktreeEstimate:
+    """Files the next commit would add or change, sized as git would store them (deleted files cost nothing)"""
+    paths = list(unstaged_paths)
+    if staged:
+        # Run where the (cwd-relative) pathspecs were given; the names printed are relative to `root` either way
+        result = trace.run(["git", "diff", "--cached", "--name-only", "-z", "--", *pathspecs], capture_output=True)
+        if result.returncode == 0:
+            paths += result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    files = size = raw_size = 0
+    for path in dict.fromkeys(_files(root, dict.fromkeys(p for p in paths if p))):
+        try:
+            raw_size += os.lstat(path).st_size
+            size += _compressed_size(path)
+            files += 1
+        except OSError:
+            continue
+    return WorktreeEstimate(files, size, raw_size)
+
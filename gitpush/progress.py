@@ -0,0 +1,298 @@
+"""
+Transfer progress for push, fetch and pull, parsed from git's --progress stream.
+
+git writes its progress meters ("Writing objects:  45% (450/1000), 1.20 MiB |
+2.00 MiB/s") to stderr, redrawing them with carriage returns. `run()` reads
+that stream as it arrives, keeps the latest numbers of every phase, and draws
+one compact line with throughput and an ETA on a terminal. Other lines (ref
+updates, remote messages, errors) are passed through and kept for the retry
+classifier. When the command ends, the numbers are recorded in the trace,
+appended to `<git dir>/gitpush/transfers.jsonl`, and summarized in one line.
+(git only draws a meter once a phase takes a moment, so small transfers may
+report no byte counts.)
+"""
+
+import codecs
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from gitpush import cache, trace
+from gitpush.refs import find_git_dir
+
+LOG_FILE = os.path.join("gitpush", "transfers.jsonl")
+MAX_LOG_BYTES = 256 * 1024
+_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+_PROGRESS = re.compile(
+    r"^(?P<remote>remote: )?(?P<phase>[A-Z][a-z]+(?: [a-z]+)*):\s+"
+    r"(?:(?P<percent>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:, (?P<bytes>[\d.]+ (?:bytes|[KMG]iB))(?: \| (?P<rate>[\d.]+ (?:bytes|[KMG]iB))/s)?)?"
+    r"(?P<finished>, done\.)?"
+)
+
+
+def _bytes(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    number, unit = text.split()
+    return int(float(number) * _UNITS[unit])
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class Phase:
+    """Latest numbers of one progress meter, e.g. 'Writing objects'"""
+
+    def __init__(self, name: str, remote: bool):
+        self.name = name
+        self.remote = remote
+        self.started = time.monotonic()
+        self.updated = self.started
+        self.done = 0
+        self.total: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.rate: Optional[int] = None   # bytes per second, as git reports it
+        self.finished = False
+
+    def eta(self) -> Optional[float]:
+        """Seconds left at the pace so far"""
+        if not self.total or not self.done or self.finished:
+            return None
+        return (self.updated - self.started) * (self.total - self.done) / self.done
+
+    def as_dict(self) -> dict:
+        return {"done": self.done, "total": self.total, "bytes": self.bytes, "rate": self.rate,
+                "seconds": round(self.updated - self.started, 3), "remote": self.remote}
+
+
+class TransferStats:
+    """Progress meters of one git command"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.phases: Dict[str, Phase] = {}
+
+    def feed(self, line: str) -> Optional[Phase]:
+        """Update from one stderr line; returns the phase if the line was a progress meter"""
+        match = _PROGRESS.match(line)
+        if not match:
+            return None
+        key = ("remote: " if match["remote"] else "") + match["phase"]
+        phase = self.phases.get(key)
+        if phase is None:
+            phase = self.phases[key] = Phase(match["phase"], bool(match["remote"]))
+            # git draws some meters only after a delay, so a phase starts when the previous one last moved
+            phase.started = max([p.updated for p in self.phases.values() if p is not phase] or [self.started])
+        phase.updated = time.monotonic()
+        phase.done = int(match["done"] or match["count"])
+        phase.total = int(match["total"]) if match["total"] else None
+        phase.bytes = _bytes(match["bytes"]) if match["bytes"] else phase.bytes
+        phase.rate = _bytes(match["rate"]) if match["rate"] else phase.rate
+        phase.finished = bool(match["finished"])
+        return phase
+
+    def transfer(self) -> Optional[Phase]:
+        """The phase that moved the data: 'Writing objects' for a push, 'Receiving'/'Unpacking objects' for a fetch"""
+        for name in ("Writing objects", "Receiving objects", "Unpacking objects"):
+            if name in self.phases:
+                return self.phases[name]
+        return None
+
+    def as_dict(self) -> dict:
+        transfer = self.transfer()
+        seconds = (transfer.updated - transfer.started) if transfer else 0.0
+        size = transfer.bytes if transfer else None
+        return {
+            "objects": transfer.done if transfer else 0,
+            "bytes": size,
+            "seconds": round(seconds, 3),
+            "bytes_per_second": round(size / seconds) if size and seconds > 0 else None,
+            "phases": {name: phase.as_dict() for name, phase in self.phases.items()},
+        }
+
+
+def _status_line(phase: Phase) -> str:
+    text = f"   {phase.name}: "
+    text += f"{phase.done * 100 // phase.total}% ({phase.done}/{phase.total})" if phase.total else str(phase.done)
+    if phase.bytes is not None:
+        text += f" · {format_bytes(phase.bytes)}"
+    if phase.rate:
+        text += f" · {format_bytes(phase.rate)}/s"
+    eta = phase.eta()
+    if eta is not None and eta >= 1:
+        text += f" · ETA {eta:.0f}s"
+    return text
+
+
+class _Display:
+    """One redrawn line on a terminal; nothing when stderr is redirected"""
+
+    def __init__(self, live: bool = True):
+        self.live = live and sys.stderr.isatty()
+        self.width = 0
+
+    def show(self, phase: Phase):
+        if self.live:
+            text = _status_line(phase)
+            sys.stderr.write("\r" + text.ljust(self.width))
+            sys.stderr.flush()
+            self.width = len(text)
+
+    def clear(self):
+        if self.live and self.width:
+            sys.stderr.write("\r" + " " * self.width + "\r")
+            sys.stderr.flush()
+            self.width = 0
+
+
+def _remote_of(cmd: List[str]) -> Optional[str]:
+    """'origin' in ['git', 'push', '--progress', 'origin', 'main']"""
+    words = [str(word) for word in cmd]
+    for word in words[2:]:
+        if not word.startswith("-"):
+            return word
+    return None
+
+
+def log_transfer(cmd: List[str], returncode: int, stats: TransferStats, cwd: Optional[str] = None):
+    """Append one JSON line per transfer to the repository's transfer log"""
+    if not cache.enabled() or not stats.phases:
+        return
+    git_dir = find_git_dir(cwd or ".")
+    if git_dir is None:
+        return
+    import socket
+
+    path = os.path.join(git_dir, LOG_FILE)
+    entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "command": str(cmd[1]) if len(cmd) > 1 else "",
+             "remote": _remote_of(cmd), "runner": socket.gethostname(), "exit": returncode}
+    entry.update(stats.as_dict())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_BYTES:
+            # Keep the newer half
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(lines[len(lines) // 2:])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+def summary(cmd: List[str], stats: TransferStats) -> Optional[str]:
+    transfer = stats.transfer()
+    if transfer is None or not transfer.done:
+        return None
+    verb = "Sent" if transfer.name == "Writing objects" else "Received"
+    seconds = transfer.updated - transfer.started
+    text = f"📈 {verb} {transfer.done} objects"
+    if transfer.bytes is not None:
+        text += f", {format_bytes(transfer.bytes)}"
+        if seconds >= 0.05:
+            text += f" in {seconds:.1f}s ({format_bytes(transfer.bytes / seconds)}/s)"
+    remote = _remote_of(cmd)
+    return text + (f" {'to' if verb == 'Sent' else 'from'} {remote}" if remote else "")
+
+
+def run(cmd: List[str], phase: Optional[str] = None, echo: bool = True, live: bool = True,
+        **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() for a git command started with --progress. Progress meters are parsed and
+    redrawn as one line; with `echo`, other stderr lines are copied to our stderr. stderr in the
+    result holds those lines plus each meter's final state. Without `live` (commands running in
+    parallel) nothing is drawn and the summary line goes into the result's stderr instead of stdout.
+    Accepts capture_output, text, cwd and env.
+    """
+    capture = kwargs.pop("capture_output", False)
+    text = kwargs.pop("text", False)
+    check = kwargs.pop("check", False)
+    kwargs.pop("stderr", None)
+    stdout_target = subprocess.PIPE if capture else kwargs.pop("stdout", None)
+    name = phase or trace.phase_name(cmd)
+    command = " ".join(str(c) for c in cmd)
+
+    stats = TransferStats()
+    display = _Display(live)
+    kept: List[str] = []
+    stdout_chunks: List[bytes] = []
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(cmd, stdout=stdout_target, stderr=subprocess.PIPE, **kwargs)
+    except OSError as e:
+        trace.record(name, start, time.perf_counter(), "subprocess", command=command, exit=None, error=str(e))
+        raise
+
+    reader = None
+    if process.stdout is not None:
+        reader = threading.Thread(target=lambda: stdout_chunks.append(process.stdout.read()))
+        reader.start()
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    last_draw = 0.0
+    while True:
+        data = os.read(process.stderr.fileno(), 65536)
+        buffer += decoder.decode(data, final=not data)
+        # Meters are redrawn with '\r'; everything else ends with '\n'
+        lines = re.split(r"[\r\n]", buffer)
+        buffer = lines.pop() if data else ""
+        for line in lines:
+            line = line.rstrip()   # git pads redrawn meters with spaces
+            if not line:
+                continue
+            updated = stats.feed(line)
+            if updated is None:
+                display.clear()
+                kept.append(line)
+                if echo:
+                    sys.stderr.write(line + "\n")
+                    sys.stderr.flush()
+            elif updated.finished:
+                kept.append(line)
+                display.show(updated)
+            elif time.monotonic() - last_draw >= 0.1:
+                display.show(updated)
+                last_draw = time.monotonic()
+        if not data:
+            break
+    process.stderr.close()
+    if reader is not None:
+        reader.join()
+        process.stdout.close()
+    returncode = process.wait()
+    display.clear()
+    end = time.perf_counter()
+
+    line = summary(cmd, stats) if returncode == 0 else None
+    if line and live:
+        print(line)
+    elif line:
+        kept.append(line)
+    stderr_text = "\n".join(kept) + ("\n" if kept else "")
+    stdout = b"".join(stdout_chunks) if process.stdout is not None else None
+    trace.record(name, start, end, "subprocess", command=command, exit=returncode,
+                 stdout_bytes=trace.output_size(stdout), stderr_bytes=trace.output_size(stderr_text),
+                 transfer=stats.as_dict())
+    log_transfer(cmd, returncode, stats, kwargs.get("cwd"))
+
+    result = subprocess.CompletedProcess(
+        cmd, returncode,
+        stdout.decode("utf-8", errors="replace") if text and stdout is not None else stdout,
+        stderr_text if text else stderr_text.encode("utf-8"),
+    )
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, result.stdout, result.stderr)
+    return result
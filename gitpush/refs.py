@@ -0,0 +1,231 @@
+"""
+In-process reader for HEAD, loose refs and packed-refs.
+
+Read-only lookups (current branch, branch tips, remote-tracking tips) are
+answered straight from the git directory. packed-refs is memory-mapped and
+searched with a binary search when git wrote it sorted, so lookups stay fast
+on repositories with tens of thousands of refs. Anything the reader cannot
+answer (reftable storage, unusual layouts) is handed to `git rev-parse`.
+"""
+
+import mmap
+import os
+from typing import Optional, Tuple
+
+from gitpush import trace
+
+_MAX_SYMREF_DEPTH = 5
+
+
+def find_git_dir(start: str = ".", search_parents: bool = True) -> Optional[str]:
+    """Locate the git directory for `start`, following `.git` files used by worktrees and submodules"""
+    path = os.path.abspath(start)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git, "r", encoding="utf-8") as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = os.path.normpath(os.path.join(path, content[len("gitdir:"):].strip()))
+                return git_dir if os.path.isdir(git_dir) else None
+            return None
+        parent = os.path.dirname(path)
+        if not search_parents or parent == path:
+            return None
+        path = parent
+
+
+def work_tree_root(start: str = ".") -> Optional[str]:
+    """Top directory of the working tree containing `start` (the directory holding `.git`)"""
+    path = os.path.abspath(start)
+    while not os.path.exists(os.path.join(path, ".git")):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return path
+
+
+def is_git_repository(path: str = ".") -> bool:
+    """True if `path` itself is the top of a repository, worktree or submodule"""
+    return find_git_dir(path, search_parents=False) is not None
+
+
+def common_dir(git_dir: str) -> str:
+    """Return the directory holding shared refs (differs from `git_dir` in linked worktrees)"""
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        return git_dir
+
+
+def _uses_reftable(git_dir: str) -> bool:
+    return os.path.isdir(os.path.join(common_dir(git_dir), "reftable"))
+
+
+class PackedRefs:
+    """Memory-mapped view of a packed-refs file"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        first_line = self._map[:self._map.find(b"\n") + 1] if size else b""
+        self.sorted = first_line.startswith(b"#") and b" sorted" in first_line
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _line_at(self, pos: int) -> Tuple[int, int]:
+        """Return (start, end) of the line containing byte offset `pos`"""
+        start = self._map.rfind(b"\n", 0, pos) + 1
+        end = self._map.find(b"\n", pos)
+        return start, len(self._map) if end == -1 else end
+
+    def lookup(self, refname: str) -> Optional[str]:
+        """Return the object id stored for `refname`, or None if it is not packed"""
+        target = refname.encode("utf-8")
+        if not self.sorted:
+            return self._scan(target)
+
+        lo, hi = 0, len(self._map)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = self._line_at(mid)
+            line = self._map[start:end]
+            # Header and peeled ("^<oid>") lines sort nowhere; step to the previous real ref line
+            while (line.startswith(b"#") or line.startswith(b"^")) and start > lo:
+                start, end = self._line_at(start - 1)
+                line = self._map[start:end]
+            if line.startswith(b"#") or line.startswith(b"^"):
+                lo = end + 1
+                continue
+            oid, _, name = line.partition(b" ")
+            if name == target:
+                return oid.decode("ascii")
+            if name < target:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+    def _scan(self, target: bytes) -> Optional[str]:
+        for line in bytes(self._map).splitlines():
+            if line.startswith(b"#") or line.startswith(b"^"):
+                continue
+            oid, _, name = line.partition(b" ")
+            if name == target:
+                return oid.decode("ascii")
+        return None
+
+
+def _read_loose(git_dir: str, refname: str) -> Optional[str]:
+    # Per-worktree refs (HEAD, refs/bisect, ...) live in the worktree's own git dir
+    for base in (git_dir, common_dir(git_dir)):
+        try:
+            with open(os.path.join(base, *refname.split("/")), "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            continue
+    return None
+
+
+def read_ref(git_dir: str, refname: str) -> Optional[str]:
+    """Resolve a full ref name (e.g. 'refs/remotes/origin/main') to an object id without running git"""
+    for _ in range(_MAX_SYMREF_DEPTH):
+        content = _read_loose(git_dir, refname)
+        if content is None:
+            packed = os.path.join(common_dir(git_dir), "packed-refs")
+            if not os.path.exists(packed):
+                return None
+            with PackedRefs(packed) as refs:
+                return refs.lookup(refname)
+        if content.startswith("ref:"):
+            refname = content[len("ref:"):].strip()
+            continue
+        return content or None
+    return None
+
+
+def read_head(git_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (branch, oid) for HEAD. branch is None when detached, oid is None before the first commit."""
+    content = _read_loose(git_dir, "HEAD") or ""
+    if content.startswith("ref:"):
+        refname = content[len("ref:"):].strip()
+        branch = refname[len("refs/heads/"):] if refname.startswith("refs/heads/") else None
+        return branch, read_ref(git_dir, refname)
+    return None, content or None
+
+
+def config_value(git_dir: str, name: str) -> Optional[str]:
+    """Read 'section.key' or 'section.subsection.key' from the repository's own config file (include directives are not followed)"""
+    section, _, key = name.rpartition(".")
+    head, dot, subsection = section.partition(".")
+    # Section and key names are case-insensitive, subsection names are not
+    section, key = head.lower() + dot + subsection, key.lower()
+    current, value = None, None
+    try:
+        with open(os.path.join(common_dir(git_dir), "config"), "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in "#;":
+                    continue
+                if line.startswith("["):
+                    header = line[1:line.index("]")].strip() if "]" in line else None
+                    if header and '"' in header:
+                        # [remote "origin"]
+                        head, _, subsection = header.partition('"')
+                        header = head.strip().lower() + "." + subsection.rstrip('"').replace('\\"', '"').replace("\\\\", "\\")
+                    elif header:
+                        header = header.lower()
+                    current = header
+                    continue
+                k, sep, v = line.partition("=")
+                if current == section and k.strip().lower() == key:
+                    # The last assignment wins, as in git; a bare key means "true"
+                    value = v.split("#", 1)[0].split(";", 1)[0].strip().strip('"') if sep else "true"
+    except (OSError, UnicodeDecodeError):
+        return None
+    return value
+
+
+def _rev_parse(*args: str) -> Optional[str]:
+    result = trace.run(["git", "rev-parse", "--verify", "--quiet", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def current_branch(git_dir: Optional[str] = None) -> Optional[str]:
+    """Name of the checked-out branch, or None when HEAD is detached or outside a repository"""
+    git_dir = git_dir or find_git_dir()
+    if git_dir is None:
+        return None
+    if _uses_reftable(git_dir):
+        branch = _rev_parse("--abbrev-ref", "HEAD")
+        return None if branch == "HEAD" else branch
+    return read_head(git_dir)[0]
+
+
+def resolve(refname: str, git_dir: Optional[str] = None) -> Optional[str]:
+    """Resolve HEAD or a full ref name to an object id. Returns None if the ref does not exist."""
+    git_dir = git_dir or find_git_dir()
+    if git_dir is None:
+        return None
+    if _uses_reftable(git_dir):
+        return _rev_parse(refname)
+    return read_head(git_dir)[1] if refname == "HEAD" else read_ref(git_dir, refname)
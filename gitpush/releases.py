@@ -0,0 +1,120 @@
+"""
+Cached GitHub release metadata for the gh installer.
+
+The latest-release JSON is kept in the user cache directory together with the
+ETag and Last-Modified headers it came with. Later runs revalidate it with a
+conditional request (a 304 answer does not count against the unauthenticated
+rate limit), every installer method in one run shares a single in-memory copy,
+and offline mode (or an unreachable API) falls back to the cached copy.
+
+$GITPUSH_GITHUB_API overrides the API base URL, e.g. for a local stub server.
+"""
+
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+from gitpush import cache, trace
+from gitpush.github_api import api_base
+
+LATEST_RELEASE = "/repos/cli/cli/releases/latest"
+CACHE_FILE = "gh-release.json"
+TIMEOUT = 30
+
+_memory: Dict[str, dict] = {}
+_offline = False
+
+
+class ReleaseInfoError(Exception):
+    pass
+
+
+def go_offline():
+    """Never contact the API; only the cached copy is used"""
+    global _offline
+    _offline = True
+
+
+def is_offline() -> bool:
+    return _offline or os.environ.get("GITPUSH_OFFLINE", "") not in ("", "0")
+
+
+def api_url(path: str) -> str:
+    return api_base() + path
+
+
+def _conditional_get(url: str, cached: Optional[dict]):
+    """(status, body bytes or None, headers); 304 means the cached copy is still current"""
+    headers = {"Accept": "application/vnd.github+json", "User-Agent": "gitpush"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    request = urllib.request.Request(url, headers=headers)
+    with trace.span("release metadata", url=url, conditional=bool(cached)):
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                return response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, None, e.headers
+            raise
+
+
+def fetch_json(path: str) -> dict:
+    """GET an API path through the cache. Raises ReleaseInfoError if neither the API nor the cache has it."""
+    url = api_url(path)
+    if url in _memory:
+        return _memory[url]
+
+    cache_file = cache.cache_path(CACHE_FILE)
+    entries = cache.read_json(cache_file, {})
+    if not isinstance(entries, dict):
+        entries = {}   # a corrupted or hand-edited cache is a miss
+    cached = entries.get(url) if isinstance(entries.get(url), dict) else None
+
+    if is_offline():
+        if not cached:
+            raise ReleaseInfoError("offline and no cached release information")
+        print(f"   ℹ️ Offline: using release information cached {_age(cached)}.")
+        _memory[url] = cached["body"]
+        return cached["body"]
+
+    try:
+        status, body, headers = _conditional_get(url, cached)
+    except (urllib.error.URLError, OSError) as e:
+        if not cached:
+            raise ReleaseInfoError(str(e)) from e
+        # Rate limited or no network: a slightly stale release is still installable
+        print(f"   ⚠️ GitHub API unavailable ({str(e)}); using release information cached {_age(cached)}.")
+        _memory[url] = cached["body"]
+        return cached["body"]
+
+    if status == 304:
+        cached["checked"] = time.time()
+    else:
+        try:
+            cached = {"body": json.loads(body.decode("utf-8"))}
+        except ValueError as e:
+            raise ReleaseInfoError(f"invalid JSON from {url}") from e
+        cached.update(etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"), checked=time.time())
+    entries[url] = cached
+    cache.write_json(cache_file, entries)
+    _memory[url] = cached["body"]
+    return cached["body"]
+
+
+def latest_gh_release() -> dict:
+    return fetch_json(LATEST_RELEASE)
+
+
+def _age(entry: dict) -> str:
+    checked = entry.get("checked")
+    if not isinstance(checked, (int, float)):
+        return "earlier"
+    minutes = max(0, int((time.time() - checked) / 60))
+    return f"{minutes // 60}h {minutes % 60}m ago" if minutes >= 60 else f"{minutes}m ago"
@@ -0,0 +1,137 @@
+"""
+Bounded retries for git commands that talk to a remote.
+
+Fetch, pull and push failures are classified from git's stderr: network hiccups
+(HTTP 5xx, connection resets, `early EOF`, timeouts) are retried with
+exponential backoff and full jitter, a rejected non-fast-forward push is
+reported as "rejected" so the caller can rebase and retry just the push, and
+everything else (auth, missing repository, hooks) fails immediately.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import NamedTuple, Optional
+
+from gitpush import trace
+
+DEFAULT_RETRIES = 2
+
+TRANSIENT_MARKERS = (
+    "early eof", "unexpected disconnect", "connection reset", "timed out", "connection refused",
+    "couldn't connect to server", "failed to connect to", "operation timed out",
+    "could not resolve host", "temporary failure in name resolution", "network is unreachable", "broken pipe",
+    "the remote end hung up unexpectedly", "rpc failed", "gnutls_handshake",
+    "ssl_error_syscall", "ssl_read", "http/2 stream", "curl 18", "curl 56",
+    "error: 500", "error: 502", "error: 503", "error: 504",
+    "returned error: 500", "returned error: 502", "returned error: 503", "returned error: 504",
+    "internal server error", "bad gateway", "service unavailable", "gateway timeout",
+    "index-pack failed", "fetch-pack: invalid index-pack output",
+)
+REJECTED_MARKERS = (
+    "non-fast-forward", "[rejected]", "fetch first", "updates were rejected",
+)
+# Checked first: these never get better by trying again
+FATAL_MARKERS = (
+    # ("Could not read from remote repository" is appended to every ssh failure, so it is not listed)
+    "authentication failed", "permission denied", "repository not found",
+    "does not appear to be a git repository",
+    "pre-receive hook declined", "hook declined", "gh001", "file size limit",
+    "invalid username or password", "protected branch", "stale info",
+    # Bad credentials over HTTPS ("error: RPC failed; HTTP 401 curl 22 ...") are not transient RPC failures
+    "http 401", "http 403", "error: 401", "error: 403",
+)
+
+
+class RetryPolicy(NamedTuple):
+    retries: int = DEFAULT_RETRIES   # extra attempts after the first one
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+        import random
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+_policy: Optional[RetryPolicy] = None
+
+
+def configure(retries: Optional[int] = None, base_delay: Optional[float] = None):
+    """Set the process-wide policy (--retries); unset values come from $GITPUSH_RETRIES / $GITPUSH_RETRY_DELAY"""
+    global _policy
+    defaults = policy()
+    _policy = RetryPolicy(
+        defaults.retries if retries is None else max(0, retries),
+        defaults.base_delay if base_delay is None else max(0.0, base_delay),
+        defaults.max_delay,
+    )
+
+
+def policy() -> RetryPolicy:
+    if _policy is not None:
+        return _policy
+    try:
+        retries = max(0, int(os.environ.get("GITPUSH_RETRIES", DEFAULT_RETRIES)))
+        base_delay = max(0.0, float(os.environ.get("GITPUSH_RETRY_DELAY", 1.0)))
+    except ValueError:
+        return RetryPolicy()
+    return RetryPolicy(retries, base_delay)
+
+
+def classify(error_output) -> str:
+    """'transient', 'rejected' or 'fatal' for the stderr of a failed git command"""
+    if isinstance(error_output, bytes):
+        error_output = error_output.decode(errors="ignore")
+    message = (error_output or "").lower()
+    if any(marker in message for marker in FATAL_MARKERS):
+        return "fatal"
+    if any(marker in message for marker in REJECTED_MARKERS):
+        return "rejected"
+    if any(marker in message for marker in TRANSIENT_MARKERS):
+        return "transient"
+    return "fatal"
+
+
+def run(cmd, retry_policy: Optional[RetryPolicy] = None, echo: bool = True, progress: bool = False,
+        **kwargs) -> subprocess.CompletedProcess:
+    """
+    trace.run() that retries transient failures. stderr is captured for the classifier
+    (and echoed after each attempt when `echo` is set); `check=True` raises only after
+    the last attempt, or immediately for rejected and fatal errors. With `progress`, the
+    command (which should include --progress) runs through progress.run() instead.
+    """
+    retry_policy = retry_policy or policy()
+    check = kwargs.pop("check", False)
+    if not kwargs.get("capture_output") and "stderr" not in kwargs:
+        kwargs["stderr"] = subprocess.PIPE
+    else:
+        echo = False   # the caller wants the output itself
+    if progress:
+        from gitpush.progress import run as progress_run
+
+    attempt = 0
+    while True:
+        if progress:
+            # Streams stderr as it arrives, so there is nothing left to echo afterwards
+            result = progress_run(cmd, echo=echo, **kwargs)
+        else:
+            result = trace.run(cmd, **kwargs)
+        if echo and result.stderr and not progress:
+            stderr = result.stderr if isinstance(result.stderr, str) else result.stderr.decode(errors="replace")
+            sys.stderr.write(stderr)
+            sys.stderr.flush()
+        if result.returncode == 0 or attempt >= retry_policy.retries or classify(result.stderr) != "transient":
+            break
+        attempt += 1
+        wait = retry_policy.delay(attempt)
+        print(f"⚠️ Transient network error; retrying in {wait:.1f}s (retry {attempt}/{retry_policy.retries})...",
+              file=sys.stderr)
+        with trace.span("retry backoff", attempt=attempt, seconds=round(wait, 3)):
+            time.sleep(wait)
+
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    return result
@@ -0,0 +1,113 @@
+"""
+Incremental staging: hand `git add` only the paths git status reported as changed.
+
+`git add .` walks and hashes the whole working tree. The push flow already has
+a `git status` snapshot (which honours core.untrackedCache and core.fsmonitor
+when the repository enables them), so the changed paths are known and can be
+staged directly, in batches, through --pathspec-from-file.
+
+Opt in per repository with `git config gitpush.staging changed`, or per run
+with `--stage changed`.
+
+`--path`/`--paths-from` scope a run to some pathspecs (e.g. one subproject of a
+monorepo): status, `git add` and `git commit` are all given the pathspecs, so
+git only looks at those parts of the tree (and a sparse index stays sparse),
+and changes outside them are neither staged nor committed. A pathspec with no
+changes is reported and left out, since `git add` and `git commit` would fail on it.
+"""
+
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional, Sequence
+
+from gitpush import trace
+from gitpush.refs import config_value, find_git_dir, work_tree_root
+
+MODES = ("all", "changed")
+BATCH_SIZE = 20000
+
+
+class StageResult(NamedTuple):
+    examined: int   # paths git status reported
+    staged: int     # paths handed to git add
+
+
+def staging_mode(requested: Optional[str] = None) -> str:
+    """The --stage choice, else the repository's gitpush.staging setting, else 'all'"""
+    if requested:
+        return requested
+    git_dir = find_git_dir()
+    configured = (config_value(git_dir, "gitpush.staging") or "").lower() if git_dir else ""
+    return configured if configured in MODES else "all"
+
+
+def read_pathspecs(paths: Sequence[str] = (), paths_from: Optional[str] = None) -> List[str]:
+    """--path values plus the lines of the --paths-from file ('-' for stdin; blank lines and '#' comments skipped)"""
+    pathspecs = list(paths)
+    if paths_from:
+        if paths_from == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(paths_from, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        pathspecs += [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(pathspecs))
+
+
+def _pathspec_input(pathspecs: Sequence[str]) -> bytes:
+    return "\0".join(pathspecs).encode("utf-8", errors="surrogateescape")
+
+
+def unmatched_pathspecs(pathspecs: Sequence[str]) -> List[str]:
+    """The pathspecs git status reports no changes for (ignored, unchanged or missing paths)"""
+    unmatched = []
+    for pathspec in pathspecs:
+        result = trace.run(["git", "status", "--porcelain", "-z", "--untracked-files=all", "--", pathspec],
+                           capture_output=True)
+        if result.returncode != 0 or not result.stdout:
+            unmatched.append(pathspec)
+    return unmatched
+
+
+def stage_pathspecs(pathspecs: Sequence[str]):
+    """`git add --all` limited to `pathspecs` (relative to the current directory)"""
+    trace.run(["git", "add", "--all", "--pathspec-from-file=-", "--pathspec-file-nul"],
+              input=_pathspec_input(pathspecs), check=True, capture_output=True)
+
+
+def staged_in_scope(pathspecs: Sequence[str]) -> List[str]:
+    """Paths with staged changes that match `pathspecs`"""
+    result = trace.run(["git", "diff", "--cached", "--name-only", "-z", "--", *pathspecs], capture_output=True, check=True)
+    return [path for path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if path]
+
+
+def commit_pathspecs(message: str, pathspecs: Sequence[str]):
+    """Commit only the changes under `pathspecs`; whatever else is staged stays staged"""
+    trace.run(["git", "commit", "-m", message, "--allow-empty-message", "--pathspec-from-file=-", "--pathspec-file-nul"],
+              input=_pathspec_input(pathspecs), check=True)
+
+
+def stage_paths(paths: List[str], root: str):
+    """Stage exactly `paths` (relative to `root`), including deletions, in batches"""
+    for i in range(0, len(paths), BATCH_SIZE):
+        batch = paths[i:i + BATCH_SIZE]
+        trace.run(
+            ["git", "--literal-pathspecs", "add", "--all", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            input="\0".join(batch).encode("utf-8", errors="surrogateescape"),
+            cwd=root, check=True, capture_output=True
+        )
+
+
+def stage_changes(state) -> Optional[StageResult]:
+    """Stage the paths in a RepoState snapshot. Returns None if the caller should fall back to `git add .`"""
+    root = work_tree_root()
+    if root is None:
+        return None
+    try:
+        stage_paths(state.unstaged_paths, root)
+    except subprocess.CalledProcessError as e:
+        error_output = e.stderr.decode(errors="ignore").strip() if e.stderr else str(e)
+        print(f"⚠️ Incremental staging failed ({error_output.splitlines()[0] if error_output else 'unknown error'}); "
+              "falling back to 'git add .'", file=sys.stderr)
+        return None
+    return StageResult(state.changed_paths, len(state.unstaged_paths))
@@ -0,0 +1,200 @@
+"""
+Repository state snapshot shared by the push flow.
+
+One `git status --porcelain=v2 --branch -z` call gives the branch, its upstream
+and the working tree changes, so the rest of the flow does not have to ask git
+for each of them separately. It runs with --no-ahead-behind, which skips the
+history walk; ahead/behind counts come from the tip-pair cache in aheadbehind.
+
+Fetching before the snapshot is scoped to the one branch being synced: the
+remote tip is looked up with `git ls-remote`, the fetch is skipped when the
+tracking ref already matches it, and otherwise only that branch is fetched,
+without tags.
+"""
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from gitpush import aheadbehind, retry, trace
+from gitpush.refs import config_value, current_branch, find_git_dir, resolve
+
+
+def _error_output(result) -> str:
+    stderr = result.stderr if isinstance(result.stderr, str) else (result.stderr or b"").decode(errors="replace")
+    lines = [line.strip() for line in stderr.splitlines() if line.strip()]
+    return "\n".join(lines) or f"exit code {result.returncode}"
+
+
+def fetch_branch(remote: str, branch: Optional[str], git_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Bring refs/remotes/<remote>/<branch> up to date with as little transfer as possible.
+    Falls back to a plain `git fetch <remote>` for URLs, unconfigured remotes and a detached HEAD.
+    Returns None on success, else git's error output.
+    """
+    git_dir = git_dir or find_git_dir()
+    if not branch or git_dir is None or config_value(git_dir, f"remote.{remote}.url") is None:
+        fetch = retry.run(["git", "fetch", "--progress", remote], capture_output=True, text=True, progress=True)
+        return None if fetch.returncode == 0 else _error_output(fetch)
+
+    ref = f"refs/heads/{branch}"
+    tracking = f"refs/remotes/{remote}/{branch}"
+    listing = retry.run(["git", "ls-remote", "--heads", remote, ref], capture_output=True, text=True)
+    if listing.returncode != 0:
+        return _error_output(listing)
+    remote_tip = next((line.split("\t")[0] for line in listing.stdout.splitlines()
+                       if line.split("\t")[-1] == ref), None)
+    if remote_tip is None:
+        return None   # the branch does not exist on the remote (yet): nothing to fetch
+    if remote_tip == resolve(tracking, git_dir):
+        return None
+    fetch = retry.run(["git", "fetch", "--progress", "--no-tags", remote, f"+{ref}:{tracking}"],
+                      capture_output=True, text=True, progress=True)
+    return None if fetch.returncode == 0 else _error_output(fetch)
+
+
+class RepoState:
+    """Branch, upstream, ahead/behind and working tree counts from a single `git status` call"""
+
+    def __init__(self, pathspecs: Sequence[str] = ()):
+        self.pathspecs = list(pathspecs)   # limit the working tree part of the snapshot
+        self.fetched_from: Optional[str] = None
+        self.fetched_branch: Optional[str] = None   # the branch the last fetch covered, None for all of them
+        # (remote, branch) of the last fetch, whether or not it worked, and its error if it failed
+        self.fetch_attempt: Optional[Tuple[str, Optional[str]]] = None
+        self.fetch_error: Optional[str] = None
+        self._reset()
+
+    def _reset(self):
+        self.branch: Optional[str] = None      # None when HEAD is detached
+        self.head_oid: Optional[str] = None    # None before the first commit
+        self.upstream: Optional[str] = None    # e.g. "origin/main"
+        self.ahead: Optional[int] = None       # relative to upstream, None if unknown or not counted
+        self.behind: Optional[int] = None
+        self.staged = 0
+        self.unstaged = 0
+        self.untracked = 0
+        self.conflicted = 0
+        self.merging = False
+        self.rebasing = False
+        self.git_dir: Optional[str] = None
+        self.changed_paths = 0                 # entries reported by git status
+        self.unstaged_paths: List[str] = []   # repository-relative paths `git add` would pick up
+        self._counts = {}  # (remote, branch) -> [behind, ahead] looked up in the ahead/behind cache
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.staged or self.unstaged or self.untracked or self.conflicted)
+
+    @classmethod
+    def load(cls, fetch_from: Optional[str] = None, branch: Optional[str] = None,
+             pathspecs: Sequence[str] = ()) -> Optional["RepoState"]:
+        """
+        Snapshot the current repository, first fetching `branch` (default: the current one)
+        from `fetch_from`. With `pathspecs`, only changes matching them are reported.
+        Returns None outside a repository.
+        """
+        state = cls(pathspecs)
+        return state if state.refresh(fetch_from, branch) else None
+
+    def refresh(self, fetch_from: Optional[str] = None, branch: Optional[str] = None) -> bool:
+        """Re-read the snapshot in place (after a fetch, pull or rebase)"""
+        if fetch_from:
+            branch = branch or current_branch(self.git_dir)
+            self.fetch_error = fetch_branch(fetch_from, branch, self.git_dir)
+            self.fetch_attempt = (fetch_from, branch)
+            fetched = self.fetch_error is None
+            self.fetched_from = fetch_from if fetched else None
+            self.fetched_branch = branch if fetched else None
+
+        result = trace.run(
+            ["git", "status", "--porcelain=v2", "--branch", "--no-ahead-behind", "-z",
+             *(["--", *self.pathspecs] if self.pathspecs else [])],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            return False
+
+        self._reset()
+        self._parse(result.stdout.decode("utf-8", errors="surrogateescape"))
+
+        self.git_dir = find_git_dir()
+        if self.git_dir:
+            self.merging = os.path.exists(os.path.join(self.git_dir, "MERGE_HEAD"))
+            self.rebasing = (os.path.isdir(os.path.join(self.git_dir, "rebase-merge"))
+                             or os.path.isdir(os.path.join(self.git_dir, "rebase-apply")))
+        return True
+
+    def _parse(self, output: str):
+        records = output.split("\0")
+        i = 0
+        while i < len(records):
+            record = records[i]
+            i += 1
+            if not record:
+                continue
+            if record.startswith("# "):
+                key, _, value = record[2:].partition(" ")
+                if key == "branch.oid":
+                    self.head_oid = None if value == "(initial)" else value
+                elif key == "branch.head":
+                    self.branch = None if value == "(detached)" else value
+                elif key == "branch.upstream":
+                    self.upstream = value
+                elif key == "branch.ab":
+                    # With --no-ahead-behind git only tells equal tips ("+0 -0") from different ones ("+? -?")
+                    ahead, behind = value.split()
+                    if ahead != "+?" and behind != "-?":
+                        self.ahead, self.behind = int(ahead), -int(behind)
+            elif record[0] in "12":
+                self.changed_paths += 1
+                xy = record[2:4]
+                if xy[0] != ".":
+                    self.staged += 1
+                if xy[1] != ".":
+                    self.unstaged += 1
+                    self.unstaged_paths.append(record.split(" ", 8 if record[0] == "1" else 9)[-1])
+                if record[0] == "2":
+                    # renames carry the original path as an extra record
+                    if xy[1] == "R":
+                        self.unstaged_paths.append(records[i])
+                    i += 1
+            elif record[0] == "u":
+                self.changed_paths += 1
+                self.conflicted += 1
+                self.unstaged_paths.append(record.split(" ", 10)[-1])
+            elif record[0] == "?":
+                self.changed_paths += 1
+                self.untracked += 1
+                self.unstaged_paths.append(record[2:])
+
+    def ahead_behind(self, remote: str, branch: str) -> Optional[Tuple[int, int]]:
+        """Return (behind, ahead) of `branch` against `remote/branch`, or None if it cannot be determined"""
+        if (self.branch == branch and self.upstream == f"{remote}/{branch}"
+                and self.ahead is not None):
+            return self.behind, self.ahead
+        if (remote, branch) in self._counts:
+            return tuple(self._counts[(remote, branch)])
+
+        # Identical tips need no history walk, and a missing tracking ref cannot be compared
+        local_tip = resolve(f"refs/heads/{branch}", self.git_dir)
+        remote_tip = resolve(f"refs/remotes/{remote}/{branch}", self.git_dir)
+        if remote_tip is None:
+            return None
+        if local_tip == remote_tip:
+            self._counts[(remote, branch)] = [0, 0]
+            return 0, 0
+
+        behind_ahead = aheadbehind.counts(self.git_dir, local_tip, remote_tip) if local_tip else None
+        if behind_ahead is None:
+            return None
+        self._counts[(remote, branch)] = list(behind_ahead)
+        return behind_ahead
+
+    def record_commit(self):
+        """Account for a commit made on top of this snapshot without asking git again"""
+        if self.ahead is not None:
+            self.ahead += 1
+        for counts in self._counts.values():
+            counts[1] += 1
+        self.staged = self.unstaged = self.untracked = 0
+        self.unstaged_paths = []
@@ -0,0 +1,139 @@
+"""
+Instrumented subprocess runner and per-phase timing trace.
+
+Every external command gitpush starts goes through `run()`, which records the
+wall time, exit status and captured output size of the call. `--profile FILE`
+writes the recorded spans as a Chrome trace (load it in chrome://tracing or
+Perfetto) and prints a summary table per phase.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+_origin = time.perf_counter()
+_events: List[dict] = []
+_lock = threading.Lock()
+
+
+def phase_name(cmd) -> str:
+    words = cmd.split() if isinstance(cmd, str) else [str(c) for c in cmd]
+    # "git -c key=value fetch origin" -> "git fetch"
+    name = [os.path.basename(words[0])] if words else ["?"]
+    args = iter(words[1:])
+    for word in args:
+        if word == "-c":
+            next(args, None)
+        elif not word.startswith("-"):
+            name.append(word)
+            break
+    return " ".join(name)
+
+
+def output_size(output) -> Optional[int]:
+    if output is None:
+        return None
+    return len(output.encode("utf-8", errors="replace")) if isinstance(output, str) else len(output)
+
+
+def record(name: str, start: float, end: float, category: str = "phase", **details):
+    """Store one completed span (times from time.perf_counter())"""
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": round((start - _origin) * 1e6),
+        "dur": round((end - start) * 1e6),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": details,
+    }
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, **details):
+    """Time an in-process phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter(), **details)
+
+
+def run(cmd, phase: Optional[str] = None, **kwargs) -> subprocess.CompletedProcess:
+    """Drop-in replacement for subprocess.run that records the call in the trace"""
+    name = phase or phase_name(cmd)
+    command = cmd if isinstance(cmd, str) else " ".join(str(c) for c in cmd)
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, **kwargs)
+    except subprocess.CalledProcessError as e:
+        record(name, start, time.perf_counter(), "subprocess", command=command, exit=e.returncode,
+               stdout_bytes=output_size(e.stdout), stderr_bytes=output_size(e.stderr))
+        raise
+    except OSError as e:
+        record(name, start, time.perf_counter(), "subprocess", command=command, exit=None, error=str(e))
+        raise
+    record(name, start, time.perf_counter(), "subprocess", command=command, exit=result.returncode,
+           stdout_bytes=output_size(result.stdout), stderr_bytes=output_size(result.stderr))
+    return result
+
+
+def reset():
+    """Start a fresh trace (used by forked daemon jobs; the lock may have been held at fork time)"""
+    global _origin, _lock
+    _origin = time.perf_counter()
+    _lock = threading.Lock()
+    _events.clear()
+
+
+def origin_time() -> float:
+    """Wall-clock time (time.time()) at which the trace started; event timestamps are relative to it"""
+    return time.time() - (time.perf_counter() - _origin)
+
+
+def events() -> List[dict]:
+    with _lock:
+        return list(_events)
+
+
+def summary() -> str:
+    """Per-phase table of call counts, total time and output volume"""
+    rows = {}
+    for event in events():
+        row = rows.setdefault(event["name"], {"calls": 0, "us": 0, "bytes": 0, "failed": 0})
+        row["calls"] += 1
+        row["us"] += event["dur"]
+        args = event["args"]
+        row["bytes"] += (args.get("stdout_bytes") or 0) + (args.get("stderr_bytes") or 0)
+        if event["cat"] == "subprocess" and args.get("exit") != 0:
+            row["failed"] += 1
+
+    wall_us = max(round((time.perf_counter() - _origin) * 1e6), 1)
+    lines = [f"{'phase':<24} {'calls':>5} {'total ms':>10} {'% wall':>7} {'output':>10} {'failed':>6}"]
+    for name, row in sorted(rows.items(), key=lambda item: -item[1]["us"]):
+        lines.append(f"{name[:24]:<24} {row['calls']:>5} {row['us'] / 1000:>10.1f} "
+                     f"{100 * row['us'] / wall_us:>6.1f}% {row['bytes']:>9}B {row['failed']:>6}")
+    return "\n".join(lines)
+
+
+def write_profile(path: str):
+    """Write the Chrome trace file and print the summary table"""
+    import json
+
+    end = time.perf_counter()
+    record("gitpush", _origin, end, "run", argv=sys.argv[1:])
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events(), "displayTimeUnit": "ms"}, f, indent=1)
+    except OSError as e:
+        print(f"⚠️ Could not write profile to {path}: {str(e)}", file=sys.stderr)
+        return
+    print(f"\n⏱  Profile written to {path}")
+    print(summary())
@@ -0,0 +1,275 @@
+"""
+Watch mode: turn bursts of file changes into batched commits and pushes.
+
+On Linux the working tree is watched with inotify (through ctypes, one watch
+per directory); elsewhere, or when inotify is unavailable or out of watches,
+it is polled. `.git` is never watched, and changed paths that git ignores are
+dropped (`git check-ignore`), as are directories it ignores. The ignored
+directories are found with one walk and one `git check-ignore` call; polling
+reuses them until a .gitignore or .git/info/exclude changes. Once no relevant
+event has arrived for the debounce period, the changes are committed and
+pushed through `standard_git_push`, at most once per minimum push interval.
+"""
+
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from gitpush import trace
+from gitpush.refs import common_dir, find_git_dir, work_tree_root
+from gitpush.state import RepoState
+
+DEFAULT_DEBOUNCE = 2.0
+DEFAULT_MIN_INTERVAL = 30.0
+POLL_INTERVAL = 1.0
+
+# inotify(7) constants
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF = 0x400, 0x800
+IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+IN_ONLYDIR, IN_DONTFOLLOW, IN_EXCL_UNLINK = 0x01000000, 0x02000000, 0x04000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONTFOLLOW | IN_EXCL_UNLINK)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def ignored_paths(root: str, paths: Iterable[str]) -> Set[str]:
+    """The subset of `paths` (relative to `root`) that git ignores; tracked files never are"""
+    paths = [p for p in paths if p]
+    if not paths:
+        return set()
+    result = trace.run(["git", "check-ignore", "-z", "--stdin"], cwd=root,
+                       input="\0".join(paths).encode("utf-8", errors="surrogateescape"),
+                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return {p for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p}
+
+
+def ignored_dirs(root: str) -> Set[str]:
+    """Directories below `root` that git ignores, as relative paths ending in '/'"""
+    candidates = []
+    for current, dirs, _ in os.walk(root):
+        rel = os.path.relpath(current, root)
+        rel = "" if rel == "." else rel
+        dirs[:] = [d for d in dirs if d != ".git"]
+        candidates += [os.path.join(rel, d) + "/" for d in dirs]
+    return ignored_paths(root, candidates)
+
+
+def _walk_dirs(root: str, ignored: Optional[Set[str]] = None) -> Iterable[str]:
+    """Directories below `root` (relative paths, '' for root) that git does not ignore"""
+    if ignored is None:
+        ignored = ignored_dirs(root)
+    for current, dirs, _ in os.walk(root):
+        rel = os.path.relpath(current, root)
+        rel = "" if rel == "." else rel
+        dirs[:] = [d for d in dirs if d != ".git" and os.path.join(rel, d) + "/" not in ignored]
+        yield rel
+
+
+class PollingWatcher:
+    """Portable fallback: compare (mtime, size) snapshots of the tree"""
+
+    def __init__(self, root: str):
+        self.root = root
+        git_dir = find_git_dir(root)
+        self.exclude_file = os.path.join(common_dir(git_dir), "info", "exclude") if git_dir else None
+        self.ignored = ignored_dirs(root)
+        self.snapshot = self._walk()
+        self.rules = self._ignore_rules(self.snapshot)
+
+    def _ignore_rules(self, snapshot: Dict[str, Tuple[int, int]]) -> tuple:
+        """What the ignored directories depend on: the .gitignore files in the tree and .git/info/exclude"""
+        try:
+            st = os.stat(self.exclude_file) if self.exclude_file else None
+            exclude = (st.st_mtime_ns, st.st_size) if st else None
+        except OSError:
+            exclude = None
+        return exclude, sorted((p, sig) for p, sig in snapshot.items() if os.path.basename(p) == ".gitignore")
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = self._walk()
+        rules = self._ignore_rules(snapshot)
+        if rules != self.rules:
+            self.ignored = ignored_dirs(self.root)
+            snapshot = self._walk()
+            self.rules = self._ignore_rules(snapshot)
+        return snapshot
+
+    def _walk(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for rel in _walk_dirs(self.root, self.ignored):
+            try:
+                entries = list(os.scandir(os.path.join(self.root, rel)))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name == ".git":
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                        st = entry.stat(follow_symlinks=False)
+                        snapshot[os.path.join(rel, entry.name)] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        time.sleep(POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL))
+        current = self._scan()
+        changed = [p for p, sig in current.items() if self.snapshot.get(p) != sig]
+        changed += [p for p in self.snapshot if p not in current]
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes, one watch per non-ignored directory"""
+
+    def __init__(self, root: str):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.ctypes = ctypes
+        self.root = root
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, str] = {}   # watch descriptor -> relative directory
+        try:
+            for rel in _walk_dirs(root):
+                self._add(rel)
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, rel: str):
+        path = os.path.join(self.root, rel).encode("utf-8", errors="surrogateescape")
+        wd = self.libc.inotify_add_watch(self.fd, path, WATCH_MASK)
+        if wd < 0:
+            errno = self.ctypes.get_errno()
+            # ENOSPC: out of watches (fs.inotify.max_user_watches); the caller falls back to polling
+            if errno == 28:
+                raise OSError(errno, "inotify watch limit reached")
+            return   # the directory vanished meanwhile
+        self.dirs[wd] = rel
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        changed, new_dirs = [], []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                changed.append("")   # events were lost; the status call will find everything
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            parent = self.dirs.get(wd)
+            if parent is None or not name:
+                continue
+            rel = os.path.join(parent, name.decode("utf-8", errors="surrogateescape"))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    new_dirs.append(rel)
+                continue
+            changed.append(rel)
+
+        for rel in new_dirs:
+            if rel.split(os.sep)[-1] == ".git" or rel + "/" in ignored_paths(self.root, [rel + "/"]):
+                continue
+            # Watch the new subtree and count the files that were created before the watch existed
+            for sub in _walk_dirs(os.path.join(self.root, rel)):
+                sub_rel = os.path.normpath(os.path.join(rel, sub))
+                self._add(sub_rel)
+                try:
+                    changed += [os.path.join(sub_rel, f) for f in os.listdir(os.path.join(self.root, sub_rel))
+                                if os.path.isfile(os.path.join(self.root, sub_rel, f))]
+                except OSError:
+                    pass
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(root: str, polling: bool = False):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({str(e)}); polling the working tree instead.", file=sys.stderr)
+    return PollingWatcher(root)
+
+
+def watch_and_push(push, debounce: float = DEFAULT_DEBOUNCE, min_interval: float = DEFAULT_MIN_INTERVAL,
+                   polling: bool = False, pathspecs: Sequence[str] = ()) -> bool:
+    """
+    Watch the working tree until interrupted. `push(state)` is called with a fresh
+    RepoState (limited to `pathspecs`) once changes have settled, and returns False if the push failed.
+    """
+    root = work_tree_root()
+    if root is None:
+        print("❌ Not a git repository. Run 'gitpush --init' first.", file=sys.stderr)
+        return False
+
+    watcher = open_watcher(root, polling)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"👀 Watching {root} ({kind}; quiet period {debounce:g}s, at most one push every {min_interval:g}s). "
+          "Press Ctrl+C to stop.")
+
+    events, paths = 0, set()
+    last_event = last_push = 0.0
+    ok = True
+    try:
+        while True:
+            now = time.monotonic()
+            timeout = None
+            if events:
+                timeout = max(0.0, debounce - (now - last_event), min_interval - (now - last_push))
+            changed = watcher.wait(timeout)
+            if changed:
+                relevant = [p for p in changed if p]
+                skip = ignored_paths(root, relevant)
+                relevant = [p for p in relevant if p not in skip]
+                if relevant or "" in changed:
+                    events += len(relevant) or 1
+                    paths.update(relevant)
+                    last_event = time.monotonic()
+                continue
+
+            now = time.monotonic()
+            if not events or now - last_event < debounce or now - last_push < min_interval:
+                continue
+
+            state = RepoState.load(pathspecs=pathspecs)
+            if state is None or not state.dirty:
+                # e.g. a file was written back unchanged
+                events, paths = 0, set()
+                continue
+            print(f"\n📦 Coalesced {events} filesystem event(s) on {len(paths)} path(s) into one push.")
+            with trace.span("watch push", events=events, paths=len(paths)):
+                ok = push(state) and ok
+            events, paths = 0, set()
+            last_push = time.monotonic()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        watcher.close()
+    return ok
@@ -0,0 +1,115 @@
+"""
+Workspace mode: run the standard sync-and-push flow over many repositories at once.
+
+Each repository is pushed by a separate `gitpush` process started in that
+repository, so working directories never clash and every repository's output is
+captured whole and printed as one block.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, NamedTuple
+
+from gitpush import trace
+
+
+class RepoResult(NamedTuple):
+    repo: str
+    returncode: int
+    output: str
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def read_manifest(path: str) -> List[str]:
+    """Read repository paths from a manifest file (one per line, '#' starts a comment)"""
+    base = os.path.dirname(os.path.abspath(path))
+    repos = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = line.split("#", 1)[0].strip()
+            if entry:
+                repos.append(os.path.normpath(os.path.join(base, os.path.expanduser(entry))))
+    return repos
+
+
+def discover_repositories(target: str, max_depth: int = 3) -> List[str]:
+    """Find git repositories below a workspace directory, or list the ones named in a manifest file"""
+    if os.path.isfile(target):
+        return read_manifest(target)
+
+    root_depth = os.path.abspath(target).rstrip(os.sep).count(os.sep)
+    repos = []
+    for root, dirs, files in os.walk(os.path.abspath(target)):
+        # `.git` is a directory in normal clones and a file in worktrees and submodules
+        if ".git" in dirs or ".git" in files:
+            repos.append(root)
+            dirs[:] = []
+            continue
+        if root.count(os.sep) - root_depth >= max_depth:
+            dirs[:] = []
+            continue
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+    return sorted(repos)
+
+
+def push_repository(repo: str, cli_args: List[str]) -> RepoResult:
+    """Run gitpush inside one repository, capturing its combined output"""
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    start = time.monotonic()
+    try:
+        # In-process: a workspace run forwarded to the daemon holds one of its slots until every child is done
+        process = trace.run(
+            [sys.executable, "-m", "gitpush.cli", "--no-daemon", *cli_args], phase=f"push {os.path.basename(repo)}",
+            cwd=repo, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace"
+        )
+        return RepoResult(repo, process.returncode, process.stdout, time.monotonic() - start)
+    except OSError as e:
+        return RepoResult(repo, 1, f"❌ Could not run gitpush: {str(e)}\n", time.monotonic() - start)
+
+
+def run_workspace(target: str, cli_args: List[str], jobs: int = 8) -> bool:
+    """Push every repository in the workspace on a bounded worker pool. Returns False if any repository failed."""
+    if not os.path.exists(target):
+        print(f"❌ Workspace not found: {target}", file=sys.stderr)
+        return False
+
+    try:
+        repos = discover_repositories(target)
+    except OSError as e:
+        print(f"❌ Could not read workspace {target}: {str(e)}", file=sys.stderr)
+        return False
+
+    if not repos:
+        print(f"ℹ️ No git repositories found in {target}.")
+        return True
+
+    jobs = max(1, min(jobs, len(repos)))
+    print(f"🗂  Pushing {len(repos)} repositories with {jobs} parallel jobs...")
+
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(push_repository, repo, cli_args) for repo in repos]
+        # Only this thread prints, so each repository's output stays in one piece
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            icon = "✅" if result.ok else "❌"
+            print(f"\n{icon} ── {result.repo} ──")
+            print(result.output.rstrip() or "(no output)")
+
+    failed = [r for r in results if not r.ok]
+    print("\n📋 Workspace summary:")
+    for result in sorted(results, key=lambda r: r.repo):
+        status = "ok" if result.ok else f"failed (exit {result.returncode})"
+        print(f"   {'✅' if result.ok else '❌'} {result.repo}: {status} in {result.duration:.1f}s")
+    print(f"\n{len(results) - len(failed)} succeeded, {len(failed)} failed.")
+    return not failed
@@ -7,7 +7,7 @@ long_description = (Path(__file__).parent / "LONG_DESCRIPTION.md").read_text(enc
 setup(
     name="gitpush-tool",
     version="0.3.6",
-    packages=find_packages(),
+    packages=find_packages(exclude=("tests", "tests.*")),
     install_requires=[],
     entry_points={
         "console_scripts": [
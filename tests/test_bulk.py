@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+from gitpush import bulk
+
+
+def test_manifest_entry_with_surplus_fields_is_reported_by_index(tmp_path):
+    manifest = tmp_path / "repos.csv"
+    manifest.write_text("name,visibility\n# comment\nok,public\nbad,private,extra\n")
+
+    with pytest.raises(ValueError, match="entry 2 has 1 more fields than the header"):
+        bulk.read_manifest(str(manifest))
+    assert not bulk.create_from_manifest(str(manifest), [])
+
+
+def test_results_entries_that_are_not_objects_count_as_not_created(tmp_path):
+    results = tmp_path / "repos.csv.results.json"
+    results.write_text(json.dumps({"a": "created", "b": {"status": "created"}, "c": None}))
+
+    assert bulk.load_results(str(results)) == {"b": {"status": "created"}}
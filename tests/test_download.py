@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from gitpush import download
+
+PAYLOAD = bytes(range(256)) * 64   # 16 KiB
+
+
+class FileStub(BaseHTTPRequestHandler):
+    """Serves PAYLOAD with byte ranges, or ignoring them like a misconfigured proxy"""
+
+    def send_payload(self, head):
+        data, status = self.server.payload, 200
+        requested = self.headers.get("Range")
+        self.server.ranges.append(requested)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", requested or "")
+        if match and self.server.honour_ranges:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status, data = 206, data[start:end + 1]
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        self.send_payload(head=True)
+
+    def do_GET(self):
+        self.send_payload(head=False)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(serve):
+    server, url = serve(FileStub)
+    server.payload = PAYLOAD
+    server.ranges = []
+    server.honour_ranges = True
+    return server, url + "/tool.tar.gz"
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_single_stream_download_verifies_checksum(stub, tmp_path):
+    server, url = stub
+    target = str(tmp_path / "tool.tar.gz")
+
+    download.download(url, target, sha256(PAYLOAD), connections=1)
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert server.ranges[-1] is None
+    assert not os.path.exists(target + ".part")
+
+
+def test_existing_part_file_is_resumed(stub, tmp_path):
+    server, url = stub
+    target = str(tmp_path / "tool.tar.gz")
+    with open(target + ".part", "wb") as f:
+        f.write(PAYLOAD[:5000])
+
+    download.download(url, target, sha256(PAYLOAD), connections=1)
+
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert server.ranges[-1] == "bytes=5000-"
+
+
+def test_resume_restarts_when_the_server_ignores_ranges(stub, tmp_path):
+    server, url = stub
+    server.honour_ranges = False
+    target = str(tmp_path / "tool.tar.gz")
+    with open(target + ".part", "wb") as f:
+        f.write(PAYLOAD[:5000])
+
+    download.download(url, target, sha256(PAYLOAD), connections=1)
+
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+
+
+def test_parallel_ranges_are_merged(stub, tmp_path, monkeypatch):
+    server, url = stub
+    monkeypatch.setattr(download, "MIN_PART_SIZE", 4096)
+    target = str(tmp_path / "tool.tar.gz")
+
+    download.download(url, target, sha256(PAYLOAD), connections=4)
+
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert sorted(r for r in server.ranges if r) == [
+        "bytes=0-4095", "bytes=12288-16383", "bytes=4096-8191", "bytes=8192-12287"]
+    assert not [name for name in os.listdir(tmp_path) if ".part" in name]
+
+
+def test_parallel_download_falls_back_to_one_stream_on_200(stub, tmp_path, monkeypatch, capsys):
+    server, url = stub
+    server.honour_ranges = False   # still advertises Accept-Ranges
+    monkeypatch.setattr(download, "MIN_PART_SIZE", 4096)
+    target = str(tmp_path / "tool.tar.gz")
+
+    download.download(url, target, sha256(PAYLOAD), connections=4)
+
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert server.ranges[-1] is None
+    assert "downloading over one connection" in capsys.readouterr().out
+    assert not [name for name in os.listdir(tmp_path) if ".part" in name]
+
+
+def test_checksum_mismatch_removes_the_download(stub, tmp_path):
+    server, url = stub
+    target = str(tmp_path / "tool.tar.gz")
+
+    with pytest.raises(download.DownloadError, match="checksum mismatch"):
+        download.download(url, target, sha256(b"something else"), connections=1)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,184 @@
+import json
+import os
+import subprocess
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from gitpush import github_api, newrepo
+from tests.conftest import git
+
+TOKEN = "test-token"
+
+
+class GitHubStub(BaseHTTPRequestHandler):
+    """/user, /user/repos and /orgs/{org}/repos with the error responses the client has to map"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        self.server.connections += 1
+        super().setup()
+
+    def reply(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        # Close a kept-alive connection without telling the client, as servers do when it sits idle
+        self.close_connection = self.server.drop_connections
+
+    def authorized(self):
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            self.reply(401, {"message": "Bad credentials"})
+            return False
+        return True
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, None))
+        if not self.authorized():
+            return
+        if self.path == "/user":
+            self.reply(200, {"login": "octocat"})
+        else:
+            self.reply(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(("POST", self.path, body))
+        if not self.authorized():
+            return
+        owner = "octocat" if self.path == "/user/repos" else self.path.split("/")[2]
+        if self.path != "/user/repos" and owner != "acme":
+            self.reply(404, {"message": "Not Found"})
+        elif body["name"] == "taken":
+            self.reply(422, {"message": "Repository creation failed.", "errors": [
+                {"resource": "Repository", "code": "custom", "field": "name",
+                 "message": "name already exists on this account"}]})
+        elif body["name"] == "busy":
+            self.reply(403, {"message": "You have exceeded a secondary rate limit."}, [("Retry-After", "60")])
+        else:
+            clone_url = os.path.join(self.server.root, f"{owner}-{body['name']}.git")
+            subprocess.run(["git", "init", "-q", "--bare", clone_url], check=True)
+            self.reply(201, {"name": body["name"], "full_name": f"{owner}/{body['name']}",
+                             "private": body["private"], "clone_url": clone_url,
+                             "html_url": f"https://github.example/{owner}/{body['name']}"})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(serve, tmp_path):
+    server, url = serve(GitHubStub)
+    server.root = str(tmp_path / "remote")
+    server.connections = 0
+    server.requests = []
+    server.drop_connections = False
+    os.makedirs(server.root)
+    return server, url
+
+
+def test_current_user_and_repository_creation_share_one_connection(stub):
+    server, url = stub
+    client = github_api.GitHubClient(TOKEN, url)
+
+    assert client.current_user()["login"] == "octocat"
+    created = client.create_repository("demo", private=True, description="d")
+    org_repo = client.create_repository("acme/tools")
+
+    assert created["full_name"] == "octocat/demo"
+    assert org_repo["full_name"] == "acme/tools"
+    assert [(method, path) for method, path, _ in server.requests] == [
+        ("GET", "/user"), ("POST", "/user/repos"), ("POST", "/orgs/acme/repos")]
+    assert server.requests[1][2] == {"name": "demo", "private": True, "description": "d"}
+    assert client.connections == server.connections == 1
+
+
+def test_own_login_as_owner_creates_a_user_repository(stub):
+    server, url = stub
+    client = github_api.GitHubClient(TOKEN, url)
+
+    assert client.create_repository("OctoCat/mine")["full_name"] == "octocat/mine"
+    assert [(method, path) for method, path, _ in server.requests] == [("GET", "/user"), ("POST", "/user/repos")]
+
+
+def test_bad_token_raises_auth_error(stub):
+    _, url = stub
+    with pytest.raises(github_api.AuthError) as error:
+        github_api.GitHubClient("wrong", url).current_user()
+    assert error.value.status == 401
+    assert "Bad credentials" in str(error.value)
+
+
+def test_unknown_organization_raises_not_found(stub):
+    _, url = stub
+    with pytest.raises(github_api.NotFoundError) as error:
+        github_api.GitHubClient(TOKEN, url).create_repository("nobody-org/tools")
+    assert error.value.status == 404
+
+
+def test_existing_name_raises_already_exists_with_the_field_message(stub):
+    _, url = stub
+    with pytest.raises(github_api.AlreadyExistsError) as error:
+        github_api.GitHubClient(TOKEN, url).create_repository("taken")
+    assert str(error.value) == "Repository creation failed: name already exists on this account (HTTP 422)"
+    assert error.value.errors[0]["field"] == "name"
+
+
+def test_secondary_rate_limit_raises_rate_limit_error_with_retry_after(stub):
+    _, url = stub
+    with pytest.raises(github_api.RateLimitError) as error:
+        github_api.GitHubClient(TOKEN, url).create_repository("busy")
+    assert error.value.status == 403
+    assert error.value.retry_after == 60
+
+
+def test_connection_dropped_by_the_server_is_reopened(stub):
+    server, url = stub
+    server.drop_connections = True
+    client = github_api.GitHubClient(TOKEN, url)
+
+    client.current_user()
+    time.sleep(0.1)   # let the server's FIN arrive
+    assert client.create_repository("after-drop")["name"] == "after-drop"
+    assert client.connections == server.connections == 2
+    assert [path for _, path, _ in server.requests].count("/user/repos") == 1
+
+
+def test_create_with_api_creates_and_pushes(stub, tmp_path, monkeypatch, capsys):
+    server, url = stub
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "README.md").write_text("hello\n")
+    monkeypatch.chdir(project)
+    monkeypatch.setenv("GH_TOKEN", TOKEN)
+    monkeypatch.setenv("GITPUSH_GITHUB_API", url)
+    monkeypatch.setattr(github_api, "_client", None)
+
+    assert newrepo.create_with_api("demo", commit_message="first")
+
+    remote = os.path.join(server.root, "octocat-demo.git")
+    assert git("log", "--format=%s", "main", cwd=remote).strip() == "first"
+    assert git("remote", "get-url", "origin").strip() == remote
+    assert "Successfully created repository: https://github.example/octocat/demo" in capsys.readouterr().out
+
+
+def test_create_with_api_reports_an_existing_name(stub, tmp_path, monkeypatch, capsys):
+    _, url = stub
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "README.md").write_text("hello\n")
+    monkeypatch.chdir(project)
+    monkeypatch.setenv("GH_TOKEN", TOKEN)
+    monkeypatch.setenv("GITPUSH_GITHUB_API", url)
+    monkeypatch.setattr(github_api, "_client", None)
+
+    assert not newrepo.create_with_api("taken")
+    assert "choose a different repository name" in capsys.readouterr().err
+    assert subprocess.run(["git", "remote", "get-url", "origin"], capture_output=True).returncode != 0
@@ -0,0 +1,26 @@
+import importlib.util
+import os
+
+import pytest
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "import_time.py")
+
+
+@pytest.fixture(scope="module")
+def import_time():
+    spec = importlib.util.spec_from_file_location("import_time", BENCHMARK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cli_import_stays_within_budget_and_off_heavy_modules(import_time):
+    timings, imported = [], set()
+    for _ in range(3):
+        cumulative, modules = import_time.measure("gitpush.cli")
+        timings.append(cumulative)
+        imported |= modules
+
+    assert "gitpush.cli" in imported
+    assert sorted(name for name in import_time.FORBIDDEN if name in imported) == []
+    assert min(timings) / 1000 <= 60.0
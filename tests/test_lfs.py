@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+from gitpush import lfs, newrepo
+from tests.conftest import git
+
+# Enough of git-lfs for a first commit: `install --local` registers a clean filter that
+# stores the content under lfs.url (a file:// directory) and hands git a pointer instead.
+GIT_LFS = f"""#!{sys.executable}
+import hashlib, os, subprocess, sys
+
+command = sys.argv[1]
+if command == "version":
+    print("git-lfs/3.4.0 (stand-in)")
+elif command == "install":
+    for key, value in (("filter.lfs.clean", "git-lfs clean -- %f"), ("filter.lfs.smudge", "cat"),
+                       ("filter.lfs.required", "true")):
+        subprocess.run(["git", "config", key, value], check=True)
+elif command == "clean":
+    data = sys.stdin.buffer.read()
+    oid = hashlib.sha256(data).hexdigest()
+    store = subprocess.run(["git", "config", "lfs.url"], capture_output=True, text=True).stdout.strip()
+    with open(os.path.join(store[len("file://"):], oid), "wb") as f:
+        f.write(data)
+    sys.stdout.write(f"version https://git-lfs.github.com/spec/v1\\noid sha256:{{oid}}\\nsize {{len(data)}}\\n")
+else:
+    sys.exit(f"git-lfs stand-in: unsupported command {{command}}")
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "git-lfs").write_text(GIT_LFS)
+    (bin_dir / "git-lfs").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    store = tmp_path / "lfs-store"
+    store.mkdir()
+    monkeypatch.setenv("GITPUSH_LFS_URL", f"file://{store}")
+
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "README.md").write_text("hello\n")
+    monkeypatch.chdir(root)
+    return root, store
+
+
+def pushed(root, tmp_path):
+    remote = tmp_path / "remote.git"
+    git("init", "-q", "--bare", str(remote))
+    git("remote", "add", "origin", f"file://{remote}", cwd=root)
+    git("push", "-q", "origin", "HEAD:main", cwd=root)
+    return remote
+
+
+def is_pointer(remote, path):
+    return git("show", f"main:{path}", cwd=remote).startswith("version https://git-lfs.github.com/spec/v1")
+
+
+def test_first_push_sends_pointers_for_mixed_case_and_large_files(project, tmp_path, capsys):
+    root, store = project
+    (root / "Video.MP4").write_bytes(b"\0" * 100)
+    (root / "clip.mp4").write_bytes(b"\1" * 100)
+    (root / "data.raw").write_bytes(b"\2" * 4096)
+
+    assert newrepo.prepare_first_push("first", lfs_threshold="1K")
+    remote = pushed(root, tmp_path)
+
+    assert (root / ".gitattributes").read_text() == (
+        f"*.[mM][pP]4 {lfs.ATTRIBUTES}\n/data.raw {lfs.ATTRIBUTES}\n")
+    assert is_pointer(remote, "Video.MP4") and is_pointer(remote, "clip.mp4") and is_pointer(remote, "data.raw")
+    assert git("show", "main:README.md", cwd=remote) == "hello\n"
+    assert len(os.listdir(store)) == 3
+    assert "4.2 KiB in 3 files went to Git LFS" in capsys.readouterr().out
+
+
+def test_files_an_existing_pattern_covers_are_not_counted(project, capsys):
+    root, _ = project
+    git("init", "-q", cwd=root)
+    (root / ".gitattributes").write_text(f"*.mp4 {lfs.ATTRIBUTES}\n")
+    (root / "clip.mp4").write_bytes(b"\1" * 100)
+
+    assert lfs.route_large_files("1K", str(root)) is None
+    assert (root / ".gitattributes").read_text() == f"*.mp4 {lfs.ATTRIBUTES}\n"
+
+    (root / "Other.MP4").write_bytes(b"\1" * 100)
+    routing = lfs.route_large_files("1K", str(root))
+
+    assert routing == lfs.LfsRouting(1, 100, ["*.[mM][pP]4"])
+    assert "Tracking 1 files" in capsys.readouterr().out
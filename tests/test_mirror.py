@@ -0,0 +1,28 @@
+import json
+import os
+
+from gitpush import mirror
+from tests.conftest import git
+
+
+def test_mirror_pushes_report_and_log_their_transfers(tmp_path, monkeypatch, capsys):
+    root = tmp_path / "work"
+    git("init", "-q", "-b", "main", str(root))
+    for name in ("origin", "backup"):
+        git("init", "-q", "--bare", str(tmp_path / f"{name}.git"))
+        git("remote", "add", name, str(tmp_path / f"{name}.git"), cwd=root)
+    (root / "data").write_bytes(os.urandom(64 * 1024))
+    git("add", ".", cwd=root)
+    git("commit", "-q", "-m", "first", cwd=root)
+    monkeypatch.chdir(root)
+
+    assert mirror.push_to_remotes(["origin", "backup"], "main")
+
+    out = capsys.readouterr().out
+    for name in ("origin", "backup"):
+        assert git("rev-parse", "main", cwd=tmp_path / f"{name}.git") == git("rev-parse", "main", cwd=root)
+        assert any(line.startswith("📈 Sent") and line.endswith(f"to {name}") for line in out.splitlines())
+    with open(root / ".git" / "gitpush" / "transfers.jsonl", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert sorted(entry["remote"] for entry in entries) == ["backup", "origin"]
+    assert all(entry["command"] == "push" and entry["exit"] == 0 and entry["objects"] for entry in entries)
@@ -0,0 +1,131 @@
+import json
+import os
+import socket
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from gitpush import cache, releases
+
+RELEASE = {"tag_name": "v2.40.0", "assets": []}
+
+
+class ReleasesStub(BaseHTTPRequestHandler):
+    """The latest-release endpoint with ETag revalidation, or rate limited"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.server.rate_limited:
+            data = b'{"message": "API rate limit exceeded"}'
+            self.send_response(403)
+            self.send_header("X-RateLimit-Remaining", "0")
+        elif self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        else:
+            data = json.dumps(self.server.release).encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory(monkeypatch):
+    monkeypatch.setattr(releases, "_memory", {})
+    monkeypatch.setattr(releases, "_offline", False)
+    monkeypatch.delenv("GITPUSH_OFFLINE", raising=False)
+
+
+@pytest.fixture
+def stub(serve, monkeypatch):
+    server, url = serve(ReleasesStub)
+    server.requests = []
+    server.rate_limited = False
+    server.release = RELEASE
+    monkeypatch.setenv("GITPUSH_GITHUB_API", url)
+    return server, url
+
+
+def cache_entries():
+    with open(cache.cache_path(releases.CACHE_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def seed_cache(url, body, etag='"v1"'):
+    entries = {url + releases.LATEST_RELEASE: {"body": body, "etag": etag, "last_modified": None, "checked": 0}}
+    cache.write_json(cache.cache_path(releases.CACHE_FILE), entries)
+
+
+def test_200_stores_the_body_and_etag(stub):
+    server, url = stub
+
+    assert releases.latest_gh_release() == RELEASE
+    entry = cache_entries()[url + releases.LATEST_RELEASE]
+    assert entry["body"] == RELEASE
+    assert entry["etag"] == '"v1"'
+    assert server.requests == [(releases.LATEST_RELEASE, None)]
+
+
+def test_304_serves_the_cached_copy(stub):
+    server, url = stub
+    seed_cache(url, {"tag_name": "v2.39.0"})
+
+    assert releases.latest_gh_release() == {"tag_name": "v2.39.0"}
+    assert server.requests == [(releases.LATEST_RELEASE, '"v1"')]
+    assert cache_entries()[url + releases.LATEST_RELEASE]["checked"] > 0
+
+
+def test_one_run_asks_the_api_once(stub):
+    server, _ = stub
+
+    releases.latest_gh_release()
+    releases.latest_gh_release()
+    assert len(server.requests) == 1
+
+
+def test_unreachable_api_falls_back_to_the_cache(monkeypatch, capsys):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}"   # nothing listens once closed
+    monkeypatch.setenv("GITPUSH_GITHUB_API", url)
+    seed_cache(url, RELEASE)
+
+    assert releases.latest_gh_release() == RELEASE
+    assert "GitHub API unavailable" in capsys.readouterr().out
+
+
+def test_rate_limited_api_falls_back_to_the_cache(stub, capsys):
+    server, url = stub
+    server.rate_limited = True
+    seed_cache(url, RELEASE, etag='"old"')
+
+    assert releases.latest_gh_release() == RELEASE
+    assert "HTTP Error 403" in capsys.readouterr().out
+
+
+def test_rate_limited_api_without_a_cache_raises(stub):
+    server, _ = stub
+    server.rate_limited = True
+
+    with pytest.raises(releases.ReleaseInfoError):
+        releases.latest_gh_release()
+
+
+@pytest.mark.parametrize("contents", ["[1, 2]", '"text"', "not json"])
+def test_non_object_cache_file_is_a_miss(stub, contents):
+    server, url = stub
+    path = cache.cache_path(releases.CACHE_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(contents)
+
+    assert releases.latest_gh_release() == RELEASE
+    assert server.requests == [(releases.LATEST_RELEASE, None)]
+    assert list(cache_entries()) == [url + releases.LATEST_RELEASE]
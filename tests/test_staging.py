@@ -0,0 +1,50 @@
+from gitpush import staging
+from gitpush.cli import standard_git_push
+from tests.conftest import git
+
+
+def make_repo(tmp_path, monkeypatch):
+    remote = tmp_path / "remote.git"
+    git("init", "-q", "--bare", "-b", "main", str(remote))
+    root = tmp_path / "work"
+    git("clone", "-q", str(remote), str(root))
+    for name in ("a", "b"):
+        (root / name).mkdir()
+        (root / name / "f").write_text("1\n")
+    (root / ".gitignore").write_text("*.log\n")
+    git("add", ".", cwd=root)
+    git("commit", "-q", "-m", "first", cwd=root)
+    git("push", "-q", "origin", "HEAD:main", cwd=root)
+    monkeypatch.chdir(root)
+    return root, remote
+
+
+def test_unmatched_pathspecs_are_the_ones_without_changes(tmp_path, monkeypatch):
+    root, _ = make_repo(tmp_path, monkeypatch)
+    (root / "a" / "f").write_text("2\n")
+    (root / "a" / "debug.log").write_text("ignored\n")
+
+    assert staging.unmatched_pathspecs(["a", "b", "missing", "a/debug.log", "*.log"]) == [
+        "b", "missing", "a/debug.log", "*.log"]
+
+
+def test_push_leaves_out_pathspecs_that_match_nothing(tmp_path, monkeypatch, capsys):
+    root, remote = make_repo(tmp_path, monkeypatch)
+    (root / "a" / "f").write_text("2\n")
+    (root / "b" / "f").write_text("2\n")
+
+    assert standard_git_push("scoped", "main", "origin", pathspecs=["a", "missing"])
+
+    assert git("diff", "--name-only", "main~1", "main", cwd=remote).split() == ["a/f"]
+    assert "Pathspec 'missing' matched no changes" in capsys.readouterr().err
+    assert git("status", "--porcelain", cwd=root).split() == ["M", "b/f"]
+
+
+def test_push_with_only_unmatched_pathspecs_commits_nothing(tmp_path, monkeypatch, capsys):
+    root, _ = make_repo(tmp_path, monkeypatch)
+    (root / "b" / "f").write_text("2\n")
+
+    assert standard_git_push("scoped", "main", "origin", pathspecs=["missing"])
+
+    assert git("rev-list", "--count", "HEAD", cwd=root).strip() == "1"
+    assert "No changes to commit." in capsys.readouterr().out